@@ -13,6 +13,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from src.data_store import build_market_data_context
 from src.utils.config import load_settings
 from src.pipelines import (
     run_active_pool_refresh,
@@ -38,22 +39,24 @@ settings = load_settings()
 TaskFn = Callable[[], None]
 
 def run_backfill_with_indicators() -> None:
-    run_backfill_daily(settings)
-    run_indicator_batch(settings)
+    data = build_market_data_context(settings)
+    run_backfill_daily(settings, data=data)
+    run_indicator_batch(settings, data=data)
 
 def run_watchlist_tasks() -> None:
     run_watchlist_pipeline(settings)
 
 
 def run_daily_routine() -> None:
+    data = build_market_data_context(settings)  # stages share one in-memory copy of each file
     _set_task_message("daily_routine", "Incremental daily bars + indicators")
-    run_incremental_daily(settings)
+    run_incremental_daily(settings, data=data)
     _set_task_message("daily_routine", "Refreshing active universe + indicators")
-    run_active_pool_refresh(settings)
+    run_active_pool_refresh(settings, data=data)
     _set_task_message("daily_routine", "Updating market regime snapshot")
-    run_market_regime_detection(settings)
+    run_market_regime_detection(settings, data=data)
     _set_task_message("daily_routine", "Generating latest watchlist")
-    run_watchlist_pipeline(settings)
+    run_watchlist_pipeline(settings, data=data)
 
 TASK_FUNCTIONS: Dict[str, TaskFn] = {
     "full_pool": lambda: run_full_pool_refresh(settings),
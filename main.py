@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 
+from src.data_store import build_market_data_context
 from src.pipelines import run_full_pool_refresh, run_active_pool_refresh
 from src.pipelines.indicator_batch import run_indicator_batch
 from src.scheduler import run_intraday_pipeline, run_nightly_pipeline
@@ -17,6 +18,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--nightly", action="store_true", help="Run nightly pipeline.")
     parser.add_argument("--intraday", action="store_true", help="Run intraday pipeline.")
     parser.add_argument("--indicators", action="store_true", help="Recompute indicators for cached daily data.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --indicators, append only new trade dates using the saved indicator state.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --indicators (default: settings indicator_batch.workers or 1).",
+    )
     parser.add_argument("--watchlist", action="store_true", help="Generate watchlist from indicators.")
     parser.add_argument(
         "--backfill-daily",
@@ -38,6 +50,21 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Generate minute-level execution plan for active watchlist entries.",
     )
+    parser.add_argument(
+        "--migrate-daily-store",
+        action="store_true",
+        help="One-shot migration of data/daily CSVs into the columnar daily store.",
+    )
+    parser.add_argument(
+        "--export-daily-csv",
+        action="store_true",
+        help="Export the columnar daily store back to data/daily CSV files.",
+    )
+    parser.add_argument(
+        "--show-changes",
+        action="store_true",
+        help="Print the change journal: symbols each stage would recompute on its next run.",
+    )
     parser.add_argument(
         "--auto",
         action="store_true",
@@ -49,33 +76,46 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     settings = load_settings()
+    data = build_market_data_context(settings)  # shared by the stages selected below
+
+    if args.migrate_daily_store:
+        from src.pipelines import run_daily_store_migration
 
+        run_daily_store_migration(settings)
     if args.full_pool:
-        run_full_pool_refresh(settings)
+        run_full_pool_refresh(settings, data=data)
     if args.active_pool:
-        run_active_pool_refresh(settings)
+        run_active_pool_refresh(settings, data=data)
     if args.indicators:
-        run_indicator_batch(settings)
+        run_indicator_batch(settings, workers=args.workers, incremental=args.incremental, data=data)
     if args.watchlist:
         from src.pipelines import run_watchlist_pipeline
 
-        run_watchlist_pipeline(settings)
+        run_watchlist_pipeline(settings, data=data)
     if args.backfill_daily:
         from src.pipelines import run_backfill_daily
 
-        run_backfill_daily(settings)
+        run_backfill_daily(settings, data=data)
     if args.backtest_watchlist:
         from src.backtester import run_watchlist_backtest
 
-        run_watchlist_backtest(settings)
+        run_watchlist_backtest(settings, data=data)
     if args.market_regime:
         from src.pipelines import run_market_regime_detection
 
-        run_market_regime_detection(settings)
+        run_market_regime_detection(settings, data=data)
     if args.execution:
         from src.pipelines import run_execution_pipeline
 
         run_execution_pipeline(settings)
+    if args.export_daily_csv:
+        from src.pipelines import run_daily_csv_export
+
+        run_daily_csv_export(settings)
+    if args.show_changes:
+        from src.data_store import build_change_journal, describe_pending
+
+        print(describe_pending(build_change_journal(settings)))
     if args.auto:
         from src.pipelines import run_auto_pipeline
 
@@ -94,6 +134,9 @@ def main() -> None:
             args.backfill_daily,
             args.market_regime,
             args.execution,
+            args.migrate_daily_store,
+            args.export_daily_csv,
+            args.show_changes,
             args.auto,
             args.nightly,
             args.intraday,
@@ -101,7 +144,8 @@ def main() -> None:
     ):
         print(
             "Specify --full-pool/--active-pool/--indicators/--watchlist/"
-            "--backtest-watchlist/--backfill-daily/--market-regime/--auto/--nightly/--intraday to run a pipeline."
+            "--backtest-watchlist/--backfill-daily/--market-regime/--migrate-daily-store/--export-daily-csv/"
+            "--show-changes/--auto/--nightly/--intraday to run a pipeline."
         )
 
 
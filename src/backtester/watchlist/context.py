@@ -8,11 +8,13 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 
+from src.data_store import DailyStore, MarketDataContext, build_daily_store
+
 
 @dataclass
 class WatchlistBacktestContext:
     indicators_dir: Path
-    daily_dir: Path
+    daily_store: DailyStore
     universe_path: Optional[Path]
     signals_path: Path
     trades_path: Path
@@ -22,6 +24,7 @@ class WatchlistBacktestContext:
     max_hold_days: int
     regime_path: Optional[Path]
     position_config: Dict
+    cache_path: Path  # per-symbol signals/trades reused for symbols the change journal marks clean
 
 
 def build_watchlist_backtest_context(settings: Dict) -> WatchlistBacktestContext:
@@ -36,7 +39,7 @@ def build_watchlist_backtest_context(settings: Dict) -> WatchlistBacktestContext
 
     return WatchlistBacktestContext(
         indicators_dir=Path(data_cfg.get("indicators_dir", "data/indicators")),
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
+        daily_store=build_daily_store(settings),
         universe_path=Path(universe_path) if universe_path else None,
         signals_path=Path(backtest_cfg.get("signals_path", "data/backtests/watchlist_signals.csv")),
         trades_path=Path(backtest_cfg.get("trades_path", "data/backtests/watchlist_trades.csv")),
@@ -46,6 +49,7 @@ def build_watchlist_backtest_context(settings: Dict) -> WatchlistBacktestContext
         max_hold_days=int(backtest_cfg.get("max_hold_days", 5)),
         regime_path=Path(regime_path) if regime_path else None,
         position_config=settings.get("positions", {}),
+        cache_path=Path(backtest_cfg.get("cache_path", "data/backtests/_symbol_results.json")),
     )
 
 
@@ -57,7 +61,10 @@ def load_symbols(ctx: WatchlistBacktestContext) -> List[str]:
     return [file.stem for file in ctx.indicators_dir.glob("*.csv") if file.stem]
 
 
-def load_market_regime(path: Optional[Path]) -> Dict[str, str]:
+def load_market_regime(path: Optional[Path], data: Optional[MarketDataContext] = None) -> Dict[str, str]:
+    if data is not None and path == data.regime_path:
+        df = data.regime()
+        return dict(zip(df["date"].astype(str), df["regime"])) if not df.empty else {}
     if path and path.exists():
         df = pd.read_csv(path)
         return dict(zip(df["date"].astype(str), df["regime"]))
@@ -2,28 +2,39 @@
 
 from __future__ import annotations
 
-from typing import Dict
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from src.data_store import (
+    MarketDataContext,
+    SymbolCache,
+    acknowledge_changes,
+    build_change_journal,
+    config_digest,
+    file_stamp,
+)
 from src.logging import get_logger
 from src.signal_generator import strategy_router
 
 from .analytics import summarize_by_regime, summarize_trades
 from .context import WatchlistBacktestContext, build_watchlist_backtest_context, load_market_regime, load_symbols
-from .signals import build_signal_dataset
+from .signals import build_symbol_signals
 from .trades import simulate_trades
 
 LOGGER = get_logger("backtester.watchlist")
+JOURNAL_CONSUMER = "backtest"
 
 
-def run_watchlist_backtest(settings: Dict) -> None:
+def run_watchlist_backtest(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     ctx = build_watchlist_backtest_context(settings)
     ctx.signals_path.parent.mkdir(parents=True, exist_ok=True)
     ctx.trades_path.parent.mkdir(parents=True, exist_ok=True)
     ctx.summary_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if not ctx.indicators_dir.exists() or not ctx.daily_dir.exists():
+    if not ctx.indicators_dir.exists() or not ctx.daily_store.exists():
         LOGGER.error("Daily or indicator directory missing; run data pipelines first.")
         return
 
@@ -33,15 +44,16 @@ def run_watchlist_backtest(settings: Dict) -> None:
         return
 
     strategy_router.configure_strategies(settings)
-    regime_map = load_market_regime(ctx.regime_path)
-    signals_df, symbol_inputs, buy_map = build_signal_dataset(ctx, symbols, regime_map)
-    if signals_df.empty:
+    regime_map = load_market_regime(ctx.regime_path, data)
+    signal_rows, trades = _symbol_results(settings, ctx, symbols, regime_map, data)
+    if not signal_rows:
         LOGGER.warning("No signals generated for backtest.")
         return
 
+    signals_df = pd.DataFrame(signal_rows)
+    signals_df.sort_values(["trade_date", "ts_code"], inplace=True)
     signals_df.to_csv(ctx.signals_path, index=False, float_format="%.6f")
 
-    trades = simulate_trades(ctx, symbol_inputs, buy_map, regime_map)
     if not trades:
         LOGGER.warning("No trades simulated; check sell rules or filters.")
         return
@@ -62,3 +74,44 @@ def run_watchlist_backtest(settings: Dict) -> None:
         len(trades_df),
         ctx.trades_path,
     )
+
+
+def _symbol_results(
+    settings: Dict,
+    ctx: WatchlistBacktestContext,
+    symbols: List[str],
+    regime_map: Dict[str, str],
+    data: Optional[MarketDataContext],
+) -> Tuple[List[Dict], List[Dict]]:
+    """Signal rows and trades in symbol order; symbols clean in the change journal come from the cache."""
+    journal = build_change_journal(settings)
+    dirty = journal.pending(JOURNAL_CONSUMER)
+    regime_digest = hashlib.sha1(json.dumps(sorted(regime_map.items())).encode()).hexdigest()
+    fingerprint = config_digest(settings, "watchlist_backtest", "strategies", "positions", "indicator_batch")
+    cache = SymbolCache.load(ctx.cache_path, f"{fingerprint}:{regime_digest}")
+
+    signal_rows: List[Dict] = []
+    trades: List[Dict] = []
+    reused = 0
+    for symbol in symbols:
+        stamp = file_stamp(ctx.indicators_dir / f"{symbol}.csv")  # written by a stage the journal does not track
+        entry = cache.get(symbol, stamp) if dirty is not None and symbol not in dirty else None
+        if entry is not None:
+            reused += 1
+        else:
+            result = build_symbol_signals(ctx, symbol, regime_map, data)
+            if result is None:
+                entry = {"signals": [], "trades": []}
+            else:
+                rows, inputs, buys = result
+                entry = {"signals": rows, "trades": simulate_trades(ctx, {symbol: inputs}, {symbol: buys}, regime_map)}
+            cache.put(symbol, stamp, **entry)
+        signal_rows.extend(entry["signals"])
+        trades.extend(entry["trades"])
+    if dirty is not None:
+        LOGGER.info("Change journal: reused %s of %s symbols; %s changed.", reused, len(symbols), len(dirty))
+
+    cache.retain(symbols)
+    cache.save()
+    acknowledge_changes(journal.path, JOURNAL_CONSUMER, journal.head)
+    return signal_rows, trades
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from src.data_store import MarketDataContext, load_symbol_daily
 from src.signal_generator.strategy_router import generate_historical_signals
 
 from .context import WatchlistBacktestContext
@@ -16,26 +17,19 @@ def build_signal_dataset(
     ctx: WatchlistBacktestContext,
     symbols: List[str],
     regime_map: Dict[str, str],
+    data: Optional[MarketDataContext] = None,
 ) -> Tuple[pd.DataFrame, Dict[str, Tuple[pd.DataFrame, pd.DataFrame]], Dict[str, pd.DataFrame]]:
-    """Generate historical buy signals and attach forward returns."""
+    """Generate historical buy signals and attach forward returns (inputs read via ``data`` when given)."""
     signal_rows: List[Dict] = []
     symbol_inputs: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
     buy_map: Dict[str, pd.DataFrame] = {}
 
     for symbol in symbols:
-        ind_file = ctx.indicators_dir / f"{symbol}.csv"
-        daily_file = ctx.daily_dir / f"{symbol}.csv"
-        if not ind_file.exists() or not daily_file.exists():
+        result = build_symbol_signals(ctx, symbol, regime_map, data)
+        if result is None:
             continue
-        ind_df = pd.read_csv(ind_file)
-        daily_df = pd.read_csv(daily_file)
-        historical = generate_historical_signals(symbol, ind_df, daily_df, regime_map=regime_map)
-        if historical.empty:
-            continue
-        enriched = _attach_forward_returns(historical, daily_df, ctx.horizons)
+        enriched, symbol_inputs[symbol], buy_map[symbol] = result
         signal_rows.extend(enriched)
-        symbol_inputs[symbol] = (ind_df, daily_df)
-        buy_map[symbol] = historical
 
     if not signal_rows:
         return pd.DataFrame(), {}, {}
@@ -45,6 +39,26 @@ def build_signal_dataset(
     return signals_df, symbol_inputs, buy_map
 
 
+def build_symbol_signals(
+    ctx: WatchlistBacktestContext,
+    symbol: str,
+    regime_map: Dict[str, str],
+    data: Optional[MarketDataContext] = None,
+) -> Optional[Tuple[List[Dict], Tuple[pd.DataFrame, pd.DataFrame], pd.DataFrame]]:
+    """One symbol's signal rows, its ``(indicators, daily)`` inputs and buy signals; ``None`` without any."""
+    ind_file = ctx.indicators_dir / f"{symbol}.csv"
+    if not ind_file.exists() or not ctx.daily_store.has_symbol(symbol):
+        return None
+    if data is not None:
+        ind_df, daily_df = data.indicators(symbol), data.daily(symbol)
+    else:
+        ind_df, daily_df = pd.read_csv(ind_file), load_symbol_daily(symbol, store=ctx.daily_store)
+    historical = generate_historical_signals(symbol, ind_df, daily_df, regime_map=regime_map)
+    if historical.empty:
+        return None
+    return _attach_forward_returns(historical, daily_df, ctx.horizons), (ind_df, daily_df), historical
+
+
 def _attach_forward_returns(signals: pd.DataFrame, daily_df: pd.DataFrame, horizons: List[int]) -> List[Dict]:
     if signals.empty:
         return []
@@ -1,17 +1,32 @@
-"""Trade simulation using sell rules."""
+"""Trade simulation using sell rules.
+
+Each symbol is laid out once as arrays aligned to its sorted indicator rows:
+trade dates, the daily close used for fills, whether a daily bar exists, the
+regime of each day and, per regime, the sell action of every day. Walking the
+buy signals is then a loop over integer positions: the first sell trigger after
+an entry is read from a precomputed "next trigger" index instead of evaluating
+the holding window day by day.
+"""
 
 from __future__ import annotations
 
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from src.signal_generator.sell_rules import SellSignalResult, evaluate_sell_signal, prepare_daily_features
+from src.signal_generator.sell_rules import (
+    SellSignalPath,
+    SellSignalResult,
+    evaluate_sell_path,
+    prepare_daily_features,
+    prepare_sell_path,
+)
 from src.strategy_etf.position_manager import recommend_weight
 
 from .context import WatchlistBacktestContext
-from .utils import normalize_date
+from .utils import normalize_dates
 
 
 def simulate_trades(
@@ -25,107 +40,137 @@ def simulate_trades(
         buy_df = buy_map.get(symbol)
         if buy_df is None or buy_df.empty:
             continue
-
-        ind_sorted = ind_df.sort_values("trade_date").reset_index(drop=True)
-        ind_sorted["trade_date"] = ind_sorted["trade_date"].apply(normalize_date)
-        idx_map = {row["trade_date"]: idx for idx, row in ind_sorted.iterrows()}
-
-        daily_feat = prepare_daily_features(daily_df)
-        daily_map = {row["trade_date"]: row for _, row in daily_feat.iterrows()}
-
-        buy_df = buy_df.sort_values("trade_date").reset_index(drop=True)
-        buy_df["trade_date"] = buy_df["trade_date"].apply(normalize_date)
-
-        last_exit_idx = -1
-        for _, buy_row in buy_df.iterrows():
-            entry_date = buy_row["trade_date"]
-            buy_idx = idx_map.get(entry_date)
-            if buy_idx is None or buy_idx <= last_exit_idx:
-                continue
-
-            daily_entry = daily_map.get(entry_date)
-            if daily_entry is None:
-                continue
-            entry_price = _price_from_daily(daily_entry)
-            if entry_price is None:
-                continue
-
-            entry_regime = regime_map.get(entry_date, "bull")
-
-            exit_idx, exit_result = _find_exit(
-                ind_sorted,
-                buy_idx,
-                daily_map,
-                ctx.max_hold_days,
-                regime_map,
-                entry_regime,
-            )
-            exit_date = ind_sorted.iloc[exit_idx]["trade_date"]
-            daily_exit = daily_map.get(exit_date)
-            if daily_exit is None:
-                continue
-            exit_price = _price_from_daily(daily_exit)
-            if exit_price is None:
-                continue
-
-            hold_days = exit_idx - buy_idx
-            trade_return = (exit_price / entry_price) - 1
-            last_exit_idx = exit_idx
-
-            core_hits = {k: bool(v) for k, v in exit_result.core_hits.items()}
-            aux_hits = {k: bool(v) for k, v in exit_result.aux_hits.items()}
-            weight = recommend_weight(ctx.position_config, entry_regime, buy_row.get("tier", "C"))
-            trades.append(
-                {
-                    "ts_code": symbol,
-                    "tier": buy_row.get("tier"),
-                    "entry_date": entry_date,
-                    "exit_date": exit_date,
-                    "entry_price": round(entry_price, 6),
-                    "exit_price": round(exit_price, 6),
-                    "return": round(trade_return, 6),
-                    "hold_days": hold_days,
-                    "exit_reason": exit_result.reason,
-                    "sell_score": round(exit_result.score, 4),
-                    "exit_action": exit_result.action,
-                    "core_hits": json.dumps(core_hits),
-                    "aux_hits": json.dumps(aux_hits),
-                    "entry_regime": entry_regime,
-                    "position_weight": round(weight, 4),
-                }
-            )
+        trades.extend(_simulate_symbol(ctx, symbol, ind_df, daily_df, buy_df, regime_map))
     return trades
 
 
-def _find_exit(
-    indicators: pd.DataFrame,
-    start_idx: int,
-    daily_map: Dict[str, pd.Series],
-    max_hold: int,
+class _TradePath:
+    """One symbol's indicator rows as aligned arrays, with sell actions computed per regime on demand."""
+
+    def __init__(self, ind_df: pd.DataFrame, daily_df: pd.DataFrame, regime_map: Dict[str, str]) -> None:
+        indicators = ind_df.sort_values("trade_date").reset_index(drop=True)
+        indicators["trade_date"] = normalize_dates(indicators["trade_date"])
+        daily = prepare_daily_features(daily_df)
+        self.dates = indicators["trade_date"].to_numpy(dtype=object)
+        self.sell_path = prepare_sell_path(indicators, daily)
+        self.has_daily = self.sell_path["has_daily"].to_numpy()
+        self.price = _fill_prices(self.dates, daily)
+        self.regimes = indicators["trade_date"].map(regime_map).to_numpy(dtype=object)
+        self.known = pd.notna(self.regimes)
+        self._evaluations: Dict[str, SellSignalPath] = {}
+        self._next_exit: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def positions(self, dates: np.ndarray) -> np.ndarray:
+        """Row of each date (its last occurrence, like a date -> row dict), ``-1`` when absent."""
+        last = ~pd.Index(self.dates).duplicated(keep="last")
+        found = pd.Index(self.dates[last]).get_indexer(dates)
+        return np.where(found >= 0, np.flatnonzero(last)[found], -1)
+
+    def evaluate(self, regime: str) -> SellSignalPath:
+        if regime not in self._evaluations:
+            self._evaluations[regime] = evaluate_sell_path(self.sell_path, regime)
+        return self._evaluations[regime]
+
+    def next_exit(self, entry_regime: str) -> List[int]:
+        """``next[i]``: first row ``>= i`` with a daily bar whose sell rules trigger (``len`` if none).
+
+        Days missing from the regime map are judged under ``entry_regime``.
+        """
+        if entry_regime not in self._next_exit:
+            regimes = np.where(self.known, self.regimes, entry_regime)
+            triggered = np.zeros(len(self), dtype=bool)
+            for regime in pd.unique(regimes):
+                rows = regimes == regime
+                triggered[rows] = self.evaluate(regime).triggered[rows]
+            hit_rows = np.where(triggered & self.has_daily, np.arange(len(self)), len(self))
+            self._next_exit[entry_regime] = np.r_[np.minimum.accumulate(hit_rows[::-1])[::-1], len(self)].tolist()
+        return self._next_exit[entry_regime]
+
+    def exit_result(self, idx: int, entry_regime: str) -> SellSignalResult:
+        return self.evaluate(self.regimes[idx] if self.known[idx] else entry_regime).result(idx)
+
+
+def _simulate_symbol(
+    ctx: WatchlistBacktestContext,
+    symbol: str,
+    ind_df: pd.DataFrame,
+    daily_df: pd.DataFrame,
+    buy_df: pd.DataFrame,
     regime_map: Dict[str, str],
-    default_regime: str,
-) -> Tuple[int, SellSignalResult]:
-    for offset in range(1, max_hold + 1):
-        idx = start_idx + offset
-        if idx >= len(indicators):
-            break
-        trade_date = indicators.iloc[idx]["trade_date"]
-        daily_row = daily_map.get(trade_date)
-        if daily_row is None:
-            continue
-        prev_row = indicators.iloc[idx - 1]
-        prev_daily = daily_map.get(prev_row["trade_date"])
-        regime = regime_map.get(trade_date, default_regime)
-        result = evaluate_sell_signal(indicators, idx, daily_row, prev_row, prev_daily, regime)
-        if result.triggered:
-            return idx, result
-    exit_idx = min(start_idx + max_hold, len(indicators) - 1)
+) -> List[Dict]:
+    path = _TradePath(ind_df, daily_df, regime_map)
+    buy_df = buy_df.sort_values("trade_date").reset_index(drop=True)
+    entry_dates = normalize_dates(buy_df["trade_date"]).to_numpy(dtype=object)
+    buy_rows = path.positions(entry_dates)
+    tiers = buy_df["tier"].to_numpy(dtype=object) if "tier" in buy_df.columns else None
     placeholder = SellSignalResult(False, "time", {}, {}, 0.0, "time")
-    return exit_idx, placeholder
+    # plain lists: scalar reads in the loop below are much cheaper than on numpy arrays
+    fillable = (path.has_daily & ~np.isnan(path.price)).tolist()
+    prices = path.price.tolist()
+    last_row = len(path) - 1
+
+    trades: List[Dict] = []
+    last_exit_idx = -1
+    for signal, buy_idx in enumerate(buy_rows.tolist()):
+        # no overlapping positions: entries at or before the previous exit are ignored
+        if buy_idx < 0 or buy_idx <= last_exit_idx or not fillable[buy_idx]:
+            continue
+        entry_date = entry_dates[signal]
+        entry_price = prices[buy_idx]
+        entry_regime = regime_map.get(entry_date, "bull")
+
+        exit_idx = min(buy_idx + ctx.max_hold_days, last_row)
+        triggered = path.next_exit(entry_regime)[buy_idx + 1]
+        if triggered <= exit_idx:
+            exit_idx = triggered
+            exit_result = path.exit_result(exit_idx, entry_regime)
+        else:
+            exit_result = placeholder
+        if not fillable[exit_idx]:
+            continue
+        exit_price = prices[exit_idx]
+
+        hold_days = exit_idx - buy_idx
+        trade_return = (exit_price / entry_price) - 1
+        last_exit_idx = exit_idx
+
+        tier = tiers[signal] if tiers is not None else None
+        core_hits = {k: bool(v) for k, v in exit_result.core_hits.items()}
+        aux_hits = {k: bool(v) for k, v in exit_result.aux_hits.items()}
+        weight = recommend_weight(ctx.position_config, entry_regime, tier if tiers is not None else "C")
+        trades.append(
+            {
+                "ts_code": symbol,
+                "tier": tier,
+                "entry_date": entry_date,
+                "exit_date": path.dates[exit_idx],
+                "entry_price": round(entry_price, 6),
+                "exit_price": round(exit_price, 6),
+                "return": round(trade_return, 6),
+                "hold_days": hold_days,
+                "exit_reason": exit_result.reason,
+                "sell_score": round(exit_result.score, 4),
+                "exit_action": exit_result.action,
+                "core_hits": json.dumps(core_hits),
+                "aux_hits": json.dumps(aux_hits),
+                "entry_regime": entry_regime,
+                "position_weight": round(weight, 4),
+            }
+        )
+    return trades
 
 
-def _price_from_daily(daily_row: pd.Series) -> Optional[float]:
-    price = daily_row.get("close_front_adj")
-    if price is None or pd.isna(price):
-        price = daily_row.get("close")
-    return float(price) if price is not None and not pd.isna(price) else None
+def _fill_prices(dates: np.ndarray, daily: pd.DataFrame) -> np.ndarray:
+    """Fill price of each row's daily bar: ``close_front_adj``, else ``close``; NaN without a bar."""
+    if daily.empty or "trade_date" not in daily.columns:
+        return np.full(len(dates), np.nan)
+    aligned = daily.drop_duplicates("trade_date", keep="last").set_index("trade_date").reindex(dates)
+    price = np.full(len(dates), np.nan)
+    for column in ("close", "close_front_adj"):  # later columns take precedence
+        if column in aligned.columns:
+            values = pd.to_numeric(aligned[column], errors="coerce").to_numpy(dtype=float)
+            price = np.where(np.isnan(values), price, values)
+    return price
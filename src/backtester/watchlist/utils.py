@@ -15,3 +15,10 @@ def normalize_date(value: Any) -> str:
         return str(int(float(value)))
     except (ValueError, TypeError):
         return str(value)
+
+
+def normalize_dates(values: pd.Series) -> pd.Series:
+    """Vectorised :func:`normalize_date` for a whole column."""
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return values.map(str)  # same as astype(str) for ints, several times faster
+    return values.map(normalize_date)
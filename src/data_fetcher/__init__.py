@@ -1,13 +1,18 @@
 """Data acquisition layer for ETF Quant system."""
 
 from .chinadata_client import build_chinadata_client
-from .daily import fetch_daily_bars
+from .daily import FetchOptions, build_fetch_options, fetch_daily_bars
 from .minute import fetch_minute_bars
+from .trade_date import fetch_daily_by_trade_date, fetch_trade_calendar
 from .tushare_client import build_tushare_client
 
 __all__ = [
+    "FetchOptions",
     "build_chinadata_client",
+    "build_fetch_options",
     "build_tushare_client",
     "fetch_daily_bars",
+    "fetch_daily_by_trade_date",
     "fetch_minute_bars",
+    "fetch_trade_calendar",
 ]
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Dict
 
-from src.utils.config import load_tokens
+from src.data_fetcher.response_cache import build_response_cache, wrap_pro
+from src.utils.config import load_settings, load_tokens
 
 try:
     import chinadata.ca_data as cd  # type: ignore
@@ -25,12 +26,19 @@ class ChinaDataClient:
         return self._pro
 
 
-def build_chinadata_client(tokens_path: str | None = None) -> ChinaDataClient:
+def build_chinadata_client(tokens_path: str | None = None, settings: Dict | None = None) -> ChinaDataClient:
+    """Client whose ``pro`` goes through the ``api_cache`` response cache when enabled.
+
+    In ``api_cache.mode = "replay"`` no token is needed and nothing reaches the network.
+    """
+    cache = build_response_cache(settings if settings is not None else load_settings())
     tokens = load_tokens(tokens_path)
     entry = tokens.get("chinadata", {})
     token = entry.get("token")
+    if cache.mode == "replay":
+        return ChinaDataClient(token=token or "", _pro=wrap_pro(None, cache, "chinadata"))
     if not token:
         raise RuntimeError("Missing chinadata token. Update config/tokens.json.")
     cd.set_token(token)
     pro = cd.pro_api()
-    return ChinaDataClient(token=token, _pro=pro)
+    return ChinaDataClient(token=token, _pro=wrap_pro(pro, cache, "chinadata"))
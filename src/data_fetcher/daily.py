@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Dict, Iterable, List, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import pandas as pd
 
 from src.data_fetcher.chinadata_client import ChinaDataClient, build_chinadata_client
+from src.data_fetcher.throttle import NO_RETRY, RetryPolicy, TokenBucket, call_api
+from src.data_store.adj_store import PRICE_COLUMNS, adjust_prices
+from src.logging import get_logger
+
+LOGGER = get_logger("data_fetcher.daily")
 
 DEFAULT_FIELDS: Sequence[str] = (
     "ts_code",
@@ -21,7 +28,29 @@ DEFAULT_FIELDS: Sequence[str] = (
     "pre_close",
     "pct_chg",
 )
-PRICE_COLUMNS: Sequence[str] = ("open", "high", "low", "close", "pre_close")
+
+
+@dataclass
+class FetchOptions:
+    """Concurrency/rate settings; reuse one instance so its limiter spans every call."""
+
+    workers: int = 1
+    limiter: Optional[TokenBucket] = None
+    retry: RetryPolicy = field(default_factory=lambda: NO_RETRY)
+
+
+def build_fetch_options(settings: Dict) -> FetchOptions:
+    cfg = settings.get("daily_fetch", {})
+    calls_per_minute = cfg.get("calls_per_minute")
+    return FetchOptions(
+        workers=max(1, int(cfg.get("workers", 1))),
+        limiter=TokenBucket(float(calls_per_minute)) if calls_per_minute else None,
+        retry=RetryPolicy(
+            max_retries=int(cfg.get("max_retries", 0)),
+            backoff_seconds=float(cfg.get("backoff_seconds", 1.0)),
+            max_backoff_seconds=float(cfg.get("max_backoff_seconds", 30.0)),
+        ),
+    )
 
 
 def fetch_daily_bars(
@@ -31,34 +60,45 @@ def fetch_daily_bars(
     client: ChinaDataClient | None = None,
     fields: Sequence[str] | None = None,
     limit: int = 2000,
+    options: FetchOptions | None = None,
 ) -> Dict[str, pd.DataFrame]:
-    """Fetch daily bars from chinadata for a list of symbols."""
+    """Fetch daily bars from chinadata for a list of symbols.
+
+    With ``options.workers > 1`` symbols are fetched on a thread pool (the calls
+    are network-bound); results keep the input order either way.
+    """
     _client = client or build_chinadata_client()
+    options = options or FetchOptions()
     start_str = _to_datestr(start)
     end_str = _to_datestr(end)
-    selected_fields = ",".join(fields or DEFAULT_FIELDS)
-    result: Dict[str, pd.DataFrame] = {}
-    for symbol in symbols:
+    columns = fields or DEFAULT_FIELDS
+
+    def fetch(symbol: str) -> pd.DataFrame:
         params = {
             "ts_code": symbol,
             "start_date": start_str,
             "end_date": end_str,
             "limit": limit,
-            "fields": selected_fields,
+            "fields": ",".join(columns),
         }
         params = {key: value for key, value in params.items() if value}
         try:
-            frame = _client.pro.fund_daily(**params)
-        except Exception as exc:  # pragma: no cover - API failure
-            result[symbol] = _empty_frame(fields or DEFAULT_FIELDS)
-            continue
+            frame = call_api(_client.pro.fund_daily, params, options.limiter, options.retry)
+        except Exception as exc:  # API failure after retries
+            LOGGER.warning("fund_daily failed for %s: %s", symbol, exc)
+            return _empty_frame(columns)
         if frame is None or frame.empty:
-            result[symbol] = _empty_frame(fields or DEFAULT_FIELDS)
-            continue
+            return _empty_frame(columns)
         frame = frame.sort_values("trade_date")
-        frame = _attach_adjustments(symbol, frame, _client, start_str, end_str)
-        result[symbol] = frame
-    return result
+        return _attach_adjustments(symbol, frame, _client, start_str, end_str, options)
+
+    targets = list(symbols)
+    if options.workers <= 1 or len(targets) <= 1:
+        frames = [fetch(symbol) for symbol in targets]
+    else:
+        with ThreadPoolExecutor(max_workers=min(options.workers, len(targets))) as pool:
+            frames = list(pool.map(fetch, targets))
+    return dict(zip(targets, frames))
 
 
 def _to_datestr(value: date | str | None) -> str | None:
@@ -85,26 +125,25 @@ def _attach_adjustments(
     client: ChinaDataClient,
     start_date: str | None,
     end_date: str | None,
+    options: FetchOptions | None = None,
 ) -> pd.DataFrame:
-    adj = _fetch_adj_factors(symbol, client, start_date, end_date)
+    adj = _fetch_adj_factors(symbol, client, start_date, end_date, options)
+    return apply_adjustments(frame, adj)
+
+
+def apply_adjustments(frame: pd.DataFrame, adj: pd.DataFrame) -> pd.DataFrame:
+    """Merge ``trade_date/adj_factor`` rows into one symbol's bars and derive front/back-adjusted prices.
+
+    Gaps between known factors are carried over; with no factor at all (``fund_adj``
+    failed or skipped the symbol) ``adj_factor`` stays NaN rather than a made-up 1.0,
+    so the factor store never mistakes it for a real one.
+    """
     if not adj.empty:
         frame = frame.merge(adj, on="trade_date", how="left")
     else:
-        frame["adj_factor"] = 1.0
-    frame["adj_factor"] = (
-        frame["adj_factor"]
-        .fillna(method="ffill")
-        .fillna(method="bfill")
-        .fillna(1.0)
-        .astype(float)
-    )
-    latest_factor = frame["adj_factor"].iloc[-1] or 1.0
-    first_factor = frame["adj_factor"].iloc[0] or 1.0
-    for col in PRICE_COLUMNS:
-        if col in frame.columns:
-            frame[f"{col}_front_adj"] = frame[col] * frame["adj_factor"] / latest_factor
-            frame[f"{col}_back_adj"] = frame[col] * frame["adj_factor"] / first_factor
-    return frame
+        frame["adj_factor"] = float("nan")
+    frame["adj_factor"] = pd.to_numeric(frame["adj_factor"], errors="coerce").ffill().bfill().astype(float)
+    return adjust_prices(frame)
 
 
 def _fetch_adj_factors(
@@ -112,7 +151,9 @@ def _fetch_adj_factors(
     client: ChinaDataClient,
     start_date: str | None,
     end_date: str | None,
+    options: FetchOptions | None = None,
 ) -> pd.DataFrame:
+    options = options or FetchOptions()
     params = {
         "ts_code": symbol,
         "start_date": start_date,
@@ -121,8 +162,9 @@ def _fetch_adj_factors(
     }
     params = {k: v for k, v in params.items() if v}
     try:
-        df = client.pro.fund_adj(**params)
-    except Exception:  # pragma: no cover
+        df = call_api(client.pro.fund_adj, params, options.limiter, options.retry)
+    except Exception as exc:
+        LOGGER.warning("fund_adj failed for %s: %s", symbol, exc)
         return pd.DataFrame(columns=["trade_date", "adj_factor"])
     if df is None or df.empty:
         return pd.DataFrame(columns=["trade_date", "adj_factor"])
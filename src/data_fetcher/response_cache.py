@@ -0,0 +1,181 @@
+"""Disk cache for provider API responses.
+
+:class:`CachedPro` stands in for a client's ``pro`` object: every endpoint call
+is keyed by endpoint + params and answered from ``{root}/{namespace}/`` while
+the entry is younger than the endpoint's TTL. Modes:
+
+- ``"off"``: pass straight through;
+- ``"readwrite"``: serve fresh hits, store misses (interrupted runs resume cheaply);
+- ``"replay"``: serve any stored entry regardless of age and never touch the
+  network; a miss raises :class:`CacheMiss`. Works without tokens.
+
+Empty responses are not stored, and neither are responses whose date range
+reaches today (``end_date``/``trade_date`` on or after today, or a
+``start_date`` with no end): today's bar may not exist yet before the close.
+The cache is bounded by ``max_mb``; the least recently used entries go first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.data_fetcher.throttle import PermanentError
+from src.logging import get_logger
+
+LOGGER = get_logger("data_fetcher.cache")
+
+MODES = ("off", "readwrite", "replay")
+SUFFIX = ".pkl"
+_MISSING = object()
+
+
+class CacheMiss(PermanentError):
+    """Replay mode has no stored response for this call."""
+
+
+@dataclass
+class ResponseCache:
+    root: Path
+    mode: str = "off"
+    default_ttl: float = 12 * 3600
+    ttls: Dict[str, float] = field(default_factory=dict)
+    max_bytes: int = 512 * 1024 * 1024
+    clock: Callable[[], float] = time.time
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"Unsupported api_cache.mode {self.mode!r}; expected one of {', '.join(MODES)}")
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def path_for(self, namespace: str, endpoint: str, params: Dict[str, Any]) -> Path:
+        payload = json.dumps({"endpoint": endpoint, "params": params}, sort_keys=True, default=str)
+        digest = hashlib.sha1(payload.encode()).hexdigest()
+        return self.root / namespace / f"{endpoint}-{digest}{SUFFIX}"
+
+    def get(self, namespace: str, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Stored response, or ``_MISSING`` when absent/expired (expiry ignored in replay mode)."""
+        path = self.path_for(namespace, endpoint, params)
+        try:
+            age = self.clock() - path.stat().st_mtime
+        except FileNotFoundError:
+            return _MISSING
+        if self.mode != "replay" and age > self.ttls.get(endpoint, self.default_ttl):
+            return _MISSING
+        try:
+            with path.open("rb") as handle:
+                value = pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return _MISSING
+        os.utime(path, (self.clock(), path.stat().st_mtime))  # atime drives LRU eviction
+        return value
+
+    def put(self, namespace: str, endpoint: str, params: Dict[str, Any], value: Any) -> None:
+        if self.mode != "readwrite" or self.ttls.get(endpoint, self.default_ttl) <= 0:
+            return
+        if value is None or getattr(value, "empty", False) or self._reaches_today(params):
+            return  # "no data yet" (e.g. today's bars before the close) must not stick
+        path = self.path_for(namespace, endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with tmp.open("wb") as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        now = self.clock()
+        os.utime(path, (now, now))
+        with self._lock:
+            self._size = (self._current_size() if self._size is None else self._size) + path.stat().st_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _reaches_today(self, params: Dict[str, Any]) -> bool:
+        end = params.get("end_date") or params.get("trade_date")
+        if end is None:
+            return "start_date" in params  # open-ended range: runs up to the latest bar
+        today = time.strftime("%Y%m%d", time.localtime(self.clock()))
+        return str(end).replace("-", "") >= today
+
+    def _current_size(self) -> int:
+        return sum(path.stat().st_size for path in self.root.rglob(f"*{SUFFIX}"))
+
+    def _evict(self) -> None:
+        entries = sorted(self.root.rglob(f"*{SUFFIX}"), key=lambda path: path.stat().st_atime)
+        target = int(self.max_bytes * 0.9)
+        size = sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if size <= target:
+                break
+            size -= path.stat().st_size
+            path.unlink(missing_ok=True)
+        LOGGER.info("API cache over %.0f MB; evicted least recently used entries.", self.max_bytes / 2**20)
+        self._size = size
+
+
+class CachedEndpoint:
+    def __init__(self, pro: Any, cache: ResponseCache, namespace: str, endpoint: str) -> None:
+        self._pro = pro
+        self._cache = cache
+        self._namespace = namespace
+        self._endpoint = endpoint
+
+    def lookup(self, params: Dict[str, Any]) -> Any:
+        """Cached response or ``None``; lets rate limiters skip calls that never reach the network."""
+        value = self._cache.get(self._namespace, self._endpoint, params)
+        return None if value is _MISSING else value
+
+    def fetch(self, params: Dict[str, Any]) -> Any:
+        """Call the provider and store the response; for callers that already missed :meth:`lookup`."""
+        if self._cache.mode == "replay" or self._pro is None:
+            raise CacheMiss(f"No cached {self._namespace}.{self._endpoint} response for {params}")
+        value = getattr(self._pro, self._endpoint)(**params)
+        self._cache.put(self._namespace, self._endpoint, params, value)
+        return value
+
+    def __call__(self, **params: Any) -> Any:
+        value = self.lookup(params)
+        return value if value is not None else self.fetch(params)
+
+
+class CachedPro:
+    """Proxy for a ``pro`` API object whose endpoint calls go through :class:`ResponseCache`."""
+
+    def __init__(self, pro: Any, cache: ResponseCache, namespace: str) -> None:
+        self._pro = pro
+        self._cache = cache
+        self._namespace = namespace
+
+    def __getattr__(self, endpoint: str) -> CachedEndpoint:
+        # feature probes like ``hasattr(pro, "etf_basic")`` must see what the real client offers
+        if endpoint.startswith("_") or (self._pro is not None and not hasattr(self._pro, endpoint)):
+            raise AttributeError(endpoint)
+        return CachedEndpoint(self._pro, self._cache, self._namespace, endpoint)
+
+
+def build_response_cache(settings: Dict) -> ResponseCache:
+    cfg = settings.get("api_cache", {})
+    ttls = {key: float(value) for key, value in cfg.get("ttl_seconds", {}).items()}
+    return ResponseCache(
+        root=Path(cfg.get("dir", "data/cache/api")),
+        mode=str(cfg.get("mode", "off")),
+        default_ttl=ttls.pop("default", 12 * 3600),
+        ttls=ttls,
+        max_bytes=int(float(cfg.get("max_mb", 512)) * 1024 * 1024),
+    )
+
+
+def wrap_pro(pro: Any, cache: Optional[ResponseCache], namespace: str) -> Any:
+    if cache is None or not cache.enabled:
+        return pro
+    return CachedPro(pro, cache, namespace)
@@ -0,0 +1,102 @@
+"""Rate limiting and retry for provider API calls.
+
+:class:`TokenBucket` is shared by every thread that calls the same provider so
+the per-minute quota holds across workers and across successive fetch calls;
+:func:`call_api` takes a token before each attempt and backs off exponentially
+between failed attempts. Methods exposing ``lookup(params)`` (cached endpoints)
+are asked first, so cache hits spend no token; a miss goes to their
+``fetch(params)`` without reading the cache a second time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+class PermanentError(Exception):
+    """A failure retrying cannot fix; :func:`call_api` re-raises it immediately."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``calls_per_minute / 60`` tokens per second.
+
+    With the default ``burst=1`` no 60-second window sees more than
+    ``calls_per_minute + 1`` calls.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive")
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 3
+    backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """Sleep before retry number ``attempt`` (0-based): backoff * 2**attempt, capped."""
+        return min(self.max_backoff_seconds, self.backoff_seconds * (2**attempt))
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+def call_api(
+    method: Callable[..., Any],
+    params: Dict[str, Any],
+    limiter: Optional[TokenBucket] = None,
+    retry: RetryPolicy = NO_RETRY,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Any:
+    """``method(**params)`` under the rate limit, retrying failures; re-raises the last error."""
+    call = partial(method, **params)
+    lookup = getattr(method, "lookup", None)
+    if lookup is not None:
+        cached = lookup(params)
+        if cached is not None:
+            return cached
+        call = partial(method.fetch, params)  # known miss: don't read the cache again
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return call()
+        except PermanentError:
+            raise
+        except Exception:
+            if attempt >= retry.max_retries:
+                raise
+            sleep(retry.delay(attempt))
+            attempt += 1
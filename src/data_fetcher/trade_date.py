@@ -0,0 +1,112 @@
+"""Whole-market daily fetches keyed by trade date.
+
+``fund_daily`` / ``fund_adj`` accept ``trade_date=`` and return every fund for
+that day, so catching the store up by a few days costs a couple of calls per
+day instead of one per symbol. Results are split back into per-symbol frames
+shaped like :func:`daily.fetch_daily_bars` output.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from src.data_fetcher.chinadata_client import ChinaDataClient, build_chinadata_client
+from src.data_fetcher.daily import DEFAULT_FIELDS, FetchOptions, _to_datestr, apply_adjustments
+from src.data_fetcher.throttle import call_api
+from src.logging import get_logger
+
+LOGGER = get_logger("data_fetcher.trade_date")
+
+PAGE_SIZE = 2000
+
+
+def fetch_trade_calendar(
+    start: date | str,
+    end: date | str,
+    client: ChinaDataClient | None = None,
+    options: FetchOptions | None = None,
+) -> List[str]:
+    """Open SSE trading days in ``[start, end]``; falls back to weekdays if ``trade_cal`` fails."""
+    _client = client or build_chinadata_client()
+    options = options or FetchOptions()
+    start_str, end_str = _to_datestr(start), _to_datestr(end)
+    params = {"exchange": "SSE", "start_date": start_str, "end_date": end_str, "is_open": "1"}
+    try:
+        cal = call_api(_client.pro.trade_cal, params, options.limiter, options.retry)
+    except Exception as exc:
+        LOGGER.warning("trade_cal failed (%s); using weekdays %s-%s.", exc, start_str, end_str)
+        cal = None
+    if cal is None or cal.empty or "cal_date" not in cal.columns:
+        return [day.strftime("%Y%m%d") for day in pd.bdate_range(start_str, end_str)]
+    if "is_open" in cal.columns:
+        cal = cal[cal["is_open"].astype(str) == "1"]
+    return sorted(cal["cal_date"].astype(str).unique())
+
+
+def fetch_daily_by_trade_date(
+    trade_dates: Iterable[str],
+    symbols: Optional[Iterable[str]] = None,
+    client: ChinaDataClient | None = None,
+    fields: Sequence[str] | None = None,
+    options: FetchOptions | None = None,
+) -> Dict[str, pd.DataFrame]:
+    """Bars for ``trade_dates`` across the market, split by ``ts_code``.
+
+    Each day costs one (paged) ``fund_daily`` and one ``fund_adj`` call. Only
+    ``symbols`` are kept when given; symbols without rows are absent from the
+    result. A day whose bars cannot be fetched is logged and skipped.
+    """
+    _client = client or build_chinadata_client()
+    options = options or FetchOptions()
+    selected_fields = ",".join(fields or DEFAULT_FIELDS)
+    wanted = set(symbols) if symbols is not None else None
+    bars: List[pd.DataFrame] = []
+    factors: List[pd.DataFrame] = []
+    for trade_date in trade_dates:
+        try:
+            day = _fetch_pages(_client.pro.fund_daily, {"trade_date": trade_date, "fields": selected_fields}, options)
+        except Exception as exc:
+            LOGGER.warning("fund_daily failed for trade_date %s: %s", trade_date, exc)
+            continue
+        if day.empty:
+            continue
+        bars.append(day)
+        try:
+            factors.append(_fetch_pages(_client.pro.fund_adj, {"trade_date": trade_date}, options))
+        except Exception as exc:
+            LOGGER.warning("fund_adj failed for trade_date %s: %s", trade_date, exc)
+    if not bars:
+        return {}
+
+    combined = pd.concat(bars, ignore_index=True)
+    if wanted is not None:
+        combined = combined[combined["ts_code"].isin(wanted)]
+    adj = pd.concat(factors, ignore_index=True) if factors else pd.DataFrame()
+    adj_by_symbol = dict(tuple(adj.groupby("ts_code"))) if {"ts_code", "adj_factor"} <= set(adj.columns) else {}
+    empty_adj = pd.DataFrame(columns=["trade_date", "adj_factor"])
+
+    result: Dict[str, pd.DataFrame] = {}
+    for symbol, frame in combined.groupby("ts_code", sort=True):
+        frame = frame.sort_values("trade_date").reset_index(drop=True)
+        symbol_adj = adj_by_symbol.get(symbol)
+        symbol_adj = empty_adj if symbol_adj is None else symbol_adj[["trade_date", "adj_factor"]]
+        result[symbol] = apply_adjustments(frame, symbol_adj)
+    return result
+
+
+def _fetch_pages(method: Callable[..., pd.DataFrame], params: Dict, options: FetchOptions) -> pd.DataFrame:
+    """Follow ``offset`` until a short page: a full-market day can exceed one page."""
+    pages: List[pd.DataFrame] = []
+    offset = 0
+    while True:
+        page = call_api(method, {**params, "limit": PAGE_SIZE, "offset": offset}, options.limiter, options.retry)
+        if page is None or page.empty:
+            break
+        pages.append(page)
+        if len(page) < PAGE_SIZE:
+            break
+        offset += len(page)
+    return pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
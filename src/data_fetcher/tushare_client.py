@@ -10,9 +10,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict
 
-from src.utils.config import load_tokens
+from src.data_fetcher.response_cache import build_response_cache, wrap_pro
+from src.utils.config import load_settings, load_tokens
 
 try:
     import tushare as ts  # type: ignore
@@ -34,15 +35,22 @@ class TushareClient:
         return self._pro
 
 
-def build_tushare_client(tokens_path: str | Path | None = None) -> TushareClient:
-    """Construct a client bound to the official Tushare package (historical minute data)."""
+def build_tushare_client(tokens_path: str | Path | None = None, settings: Dict | None = None) -> TushareClient:
+    """Construct a client bound to the official Tushare package (historical minute data).
+
+    ``pro`` calls go through the ``api_cache`` response cache when enabled; replay
+    mode needs no token.
+    """
+    cache = build_response_cache(settings if settings is not None else load_settings())
     tokens = load_tokens(tokens_path)
     entry = tokens.get("tushare", {})
     token = entry.get("token")
+    if cache.mode == "replay":
+        return TushareClient(token=token or "", _pro=wrap_pro(None, cache, "tushare"))
     if not token:
         raise RuntimeError(
             "Missing official Tushare token. Update config/tokens.json (tushare.token)."
         )
     ts.set_token(token)
     pro = ts.pro_api()
-    return TushareClient(token=token, _pro=pro)
+    return TushareClient(token=token, _pro=wrap_pro(pro, cache, "tushare"))
@@ -0,0 +1,69 @@
+"""Columnar storage layer for cached market data."""
+
+from .adj_store import (
+    AdjFactorStore,
+    AdjustedAppend,
+    append_adjusted_daily,
+    build_adj_store,
+    load_adj_factors,
+    save_adj_factors,
+)
+from .atomic import append_atomic, atomic_path
+from .change_journal import (
+    ChangeJournal,
+    SymbolCache,
+    acknowledge_changes,
+    build_change_journal,
+    config_digest,
+    describe_pending,
+    file_stamp,
+)
+from .csv_io import export_csv_dir, migrate_csv_dir, tail_csv
+from .daily_store import (
+    DailyStore,
+    append_daily,
+    build_daily_store,
+    compact_daily,
+    latest_trade_date,
+    load_daily,
+    load_daily_tail,
+    load_symbol_daily,
+    load_symbol_tail,
+    partition_meta,
+    write_daily,
+)
+from .market_data import MarketDataContext, build_market_data_context
+
+__all__ = [
+    "AdjFactorStore",
+    "AdjustedAppend",
+    "ChangeJournal",
+    "DailyStore",
+    "MarketDataContext",
+    "SymbolCache",
+    "acknowledge_changes",
+    "append_adjusted_daily",
+    "append_atomic",
+    "append_daily",
+    "atomic_path",
+    "build_adj_store",
+    "build_change_journal",
+    "build_daily_store",
+    "build_market_data_context",
+    "compact_daily",
+    "config_digest",
+    "describe_pending",
+    "export_csv_dir",
+    "file_stamp",
+    "latest_trade_date",
+    "load_adj_factors",
+    "load_daily",
+    "load_daily_tail",
+    "load_symbol_daily",
+    "load_symbol_tail",
+    "migrate_csv_dir",
+    "partition_meta",
+    "save_adj_factors",
+    "tail_csv",
+    "write_daily",
+]
@@ -0,0 +1,142 @@
+"""Persistent adjustment factors and front/back-adjusted price maintenance.
+
+Front-adjusted prices are ``price * adj_factor / latest_factor`` and
+back-adjusted ones ``price * adj_factor / first_factor``, both over a symbol's
+*whole* stored history. :class:`AdjFactorStore` keeps that history per symbol so
+appends price new bars against the same base as the stored ones, and a new
+latest factor (a distribution) re-bases the stored bars from their raw prices
+without refetching anything.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+
+from .atomic import atomic_path
+from .daily_store import DailyStore, append_daily, load_symbol_daily, normalize_daily_frame, write_daily
+
+SUFFIX = ".parquet"
+PRICE_COLUMNS: Sequence[str] = ("open", "high", "low", "close", "pre_close")
+FACTOR_COLUMNS = ["trade_date", "adj_factor"]
+
+
+@dataclass
+class AdjFactorStore:
+    """``{root}/{ts_code}.parquet`` with ``trade_date, adj_factor`` rows."""
+
+    root: Path
+
+    def path_for(self, symbol: str) -> Path:
+        return self.root / f"{symbol}{SUFFIX}"
+
+
+@dataclass
+class AdjustedAppend:
+    added: int  # new trade dates written
+    rebased: bool  # first/latest factor changed, so every stored adjusted price moved
+
+
+def build_adj_store(settings: Dict) -> AdjFactorStore:
+    data_cfg = settings.get("data", {})
+    return AdjFactorStore(root=Path(data_cfg.get("adj_store_dir", "data/store/adj")))
+
+
+def load_adj_factors(symbol: str, store: AdjFactorStore) -> pd.DataFrame:
+    path = store.path_for(symbol)
+    if not path.exists():
+        return pd.DataFrame(columns=FACTOR_COLUMNS)
+    return pd.read_parquet(path).sort_values("trade_date").reset_index(drop=True)
+
+
+def save_adj_factors(symbol: str, factors: pd.DataFrame, store: AdjFactorStore) -> None:
+    with atomic_path(store.path_for(symbol)) as tmp:
+        factors_of(factors).to_parquet(tmp, index=False)
+
+
+def factors_of(frame: pd.DataFrame) -> pd.DataFrame:
+    """``trade_date, adj_factor`` rows of a bar frame (int dates, NaN factors dropped)."""
+    if frame.empty or "adj_factor" not in frame.columns:
+        return pd.DataFrame(columns=FACTOR_COLUMNS)
+    factors = normalize_daily_frame(frame[FACTOR_COLUMNS])
+    factors = factors.dropna(subset=["adj_factor"])
+    factors["adj_factor"] = factors["adj_factor"].astype(float)
+    return factors.reset_index(drop=True)
+
+
+def adjust_prices(
+    frame: pd.DataFrame,
+    latest_factor: Optional[float] = None,
+    first_factor: Optional[float] = None,
+    factor: Optional[pd.Series] = None,
+) -> pd.DataFrame:
+    """Fill ``*_front_adj`` / ``*_back_adj`` from ``factor`` (default ``adj_factor``).
+
+    Bases default to the frame's own first/latest known factor; rows without a
+    factor are priced at the latest base (as if no distribution happened).
+    """
+    factor = (frame["adj_factor"] if factor is None else factor).astype(float)
+    known = factor.dropna()
+    latest = (latest_factor if latest_factor is not None else (known.iloc[-1] if not known.empty else None)) or 1.0
+    first = (first_factor if first_factor is not None else (known.iloc[0] if not known.empty else None)) or 1.0
+    factor = factor.fillna(latest)
+    for col in PRICE_COLUMNS:
+        if col in frame.columns:
+            frame[f"{col}_front_adj"] = frame[col] * factor / latest
+            frame[f"{col}_back_adj"] = frame[col] * factor / first
+    return frame
+
+
+def append_adjusted_daily(
+    symbol: str,
+    frame: pd.DataFrame,
+    daily_store: DailyStore,
+    adj_store: AdjFactorStore,
+) -> AdjustedAppend:
+    """Like :func:`append_daily`, keeping adjusted prices on the stored factor base.
+
+    Incoming factors are merged into the factor store (seeded from the stored
+    bars on first use). When the first and latest factors are unchanged only the
+    incoming rows are priced and appended as a segment; otherwise
+    (a new distribution, or history extended backwards) all rows are re-based
+    from raw prices and ``rebased`` is set.
+    """
+    incoming = normalize_daily_frame(frame)
+    if incoming.empty or "adj_factor" not in incoming.columns:
+        return AdjustedAppend(added=append_daily(symbol, frame, daily_store), rebased=False)
+    stored = load_adj_factors(symbol, adj_store)
+    if stored.empty:
+        stored = factors_of(load_symbol_daily(symbol, columns=FACTOR_COLUMNS, store=daily_store))
+    previous = (float(stored["adj_factor"].iloc[0]), float(stored["adj_factor"].iloc[-1])) if not stored.empty else None
+
+    factors = factors_of(pd.concat([stored, factors_of(incoming)], ignore_index=True))
+    save_adj_factors(symbol, factors, adj_store)
+    latest = float(factors["adj_factor"].iloc[-1]) if not factors.empty else None
+    first = float(factors["adj_factor"].iloc[0]) if not factors.empty else None
+    rebased = previous is not None and (first, latest) != previous
+
+    # bars without a fetched factor keep NaN and are priced on the stored factor in effect
+    incoming = adjust_prices(incoming, latest, first, _factor_by_date(incoming, factors))
+    if not daily_store.has_symbol(symbol):
+        write_daily(symbol, incoming, daily_store)
+        return AdjustedAppend(added=len(incoming), rebased=False)
+    if not rebased and "close_front_adj" in daily_store.columns(symbol):
+        return AdjustedAppend(added=append_daily(symbol, incoming, daily_store), rebased=False)
+
+    existing = load_symbol_daily(symbol, store=daily_store)
+    added = int((~incoming["trade_date"].isin(existing["trade_date"])).sum())
+    combined = normalize_daily_frame(pd.concat([existing, incoming], ignore_index=True))
+    write_daily(symbol, adjust_prices(combined, latest, first, _factor_by_date(combined, factors)), daily_store)
+    return AdjustedAppend(added=added, rebased=rebased)
+
+
+def _factor_by_date(frame: pd.DataFrame, factors: pd.DataFrame) -> pd.Series:
+    """Stored factor in effect on every bar: the last one on or before its date (the first before any)."""
+    if factors.empty:
+        return pd.Series(float("nan"), index=frame.index)
+    known = factors.drop_duplicates("trade_date", keep="last").set_index("trade_date")["adj_factor"]
+    rows = known.index.searchsorted(frame["trade_date"].to_numpy(), side="right") - 1
+    return pd.Series(known.to_numpy()[rows.clip(min=0)], index=frame.index, dtype=float)
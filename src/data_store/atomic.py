@@ -0,0 +1,34 @@
+"""Atomic file publishing: write to a temp sibling, then rename over the target."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """Yield a temp path next to ``path``; on success it replaces ``path`` in one rename.
+
+    Readers see either the old file or the complete new one, never a partial
+    write; if the block raises, the target is left untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def append_atomic(path: Path, payload: bytes) -> None:
+    """Publish ``path`` plus ``payload`` through :func:`atomic_path`: readers never see a half-written tail."""
+    with atomic_path(path) as tmp:
+        shutil.copyfile(path, tmp)
+        with tmp.open("ab") as handle:
+            handle.write(payload)
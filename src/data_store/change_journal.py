@@ -0,0 +1,167 @@
+"""Per-symbol change journal written by the daily fetch and read by later stages.
+
+Every time the fetch writes bars for a symbol it appends ``(seq, ts_code,
+since)`` where ``since`` is the earliest trade date whose stored bar changed
+(``0`` when the whole history moved: a first write or an adj-factor re-base).
+Each consumer keeps a cursor, the last ``seq`` it has processed, so
+:meth:`ChangeJournal.pending` returns exactly the symbols (and the earliest
+changed date per symbol) written since that consumer's last successful run.
+A consumer without a cursor has no baseline and gets ``None``: treat every
+symbol as dirty. Entries every consumer has passed are pruned on save.
+
+:class:`SymbolCache` holds per-symbol results of a consumer so clean symbols
+are served from disk instead of being recomputed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .atomic import atomic_path
+
+JOURNAL_VERSION = 1
+CACHE_VERSION = 1
+CONSUMERS = ("indicators", "watchlist", "backtest")
+WHOLE_HISTORY = 0
+
+
+@dataclass
+class ChangeJournal:
+    path: Path
+    head: int = 0  # seq of the newest entry
+    changes: List[List] = field(default_factory=list)  # [seq, ts_code, since]
+    cursors: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "ChangeJournal":
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(payload, dict) or payload.get("version") != JOURNAL_VERSION:
+            return cls(path)
+        return cls(path, int(payload.get("head", 0)), payload.get("changes", []), payload.get("cursors", {}))
+
+    def save(self) -> None:
+        if self.cursors:
+            floor = min(self.cursors.values())
+            self.changes = [entry for entry in self.changes if entry[0] > floor]
+        payload = {"version": JOURNAL_VERSION, "head": self.head, "changes": self.changes, "cursors": self.cursors}
+        with atomic_path(self.path) as tmp:
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+
+    def record(self, symbol: str, since: int) -> None:
+        self.head += 1
+        self.changes.append([self.head, symbol, int(since)])
+
+    def pending(self, consumer: str) -> Optional[Dict[str, int]]:
+        """``ts_code -> earliest changed trade date`` since ``consumer``'s cursor; ``None`` without one."""
+        cursor = self.cursors.get(consumer)
+        if cursor is None:
+            return None
+        dirty: Dict[str, int] = {}
+        for seq, symbol, since in self.changes:
+            if seq > cursor:
+                dirty[symbol] = min(since, dirty.get(symbol, since))
+        return dirty
+
+    def acknowledge(self, consumer: str, seq: int) -> None:
+        self.cursors[consumer] = max(seq, self.cursors.get(consumer, 0))
+
+
+def build_change_journal(settings: Dict) -> ChangeJournal:
+    data_cfg = settings.get("data", {})
+    return ChangeJournal.load(Path(data_cfg.get("change_journal_path", "data/store/change_journal.json")))
+
+
+def acknowledge_changes(path: Path, consumer: str, seq: int, retry: Optional[Dict[str, int]] = None) -> None:
+    """Advance ``consumer``'s cursor on the current file (other stages may have written since it was read).
+
+    ``retry`` (``ts_code -> since``) is recorded again so symbols that failed stay pending.
+    """
+    journal = ChangeJournal.load(path)
+    for symbol, since in (retry or {}).items():
+        journal.record(symbol, since)
+    journal.acknowledge(consumer, seq)
+    journal.save()
+
+
+def describe_pending(journal: ChangeJournal, consumers: Iterable[str] = CONSUMERS) -> str:
+    """Human-readable summary of what each consumer's next run would recompute."""
+    lines = [f"Change journal {journal.path} (head={journal.head}, {len(journal.changes)} entries)"]
+    for consumer in consumers:
+        dirty = journal.pending(consumer)
+        if dirty is None:
+            lines.append(f"  {consumer}: no recorded run; next run processes every symbol")
+            continue
+        lines.append(f"  {consumer}: {len(dirty)} dirty symbols")
+        for symbol, since in sorted(dirty.items()):
+            lines.append(f"    {symbol} since {'full history' if since == WHOLE_HISTORY else since}")
+    return "\n".join(lines)
+
+
+def config_digest(settings: Dict, *sections: str) -> str:
+    """Digest of the named settings sections; cached results keyed by it go stale when they change."""
+    return hashlib.sha1(json.dumps([settings.get(name) for name in sections], sort_keys=True).encode()).hexdigest()
+
+
+def file_stamp(path: Path) -> Optional[List[int]]:
+    """``[size, mtime_ns]`` of ``path`` or ``None`` when it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+@dataclass
+class SymbolCache:
+    """Per-symbol results of one consumer, valid while ``fingerprint`` (its settings) is unchanged.
+
+    Each entry is stored with a ``stamp`` of the input it was computed from,
+    so an entry is reused only when that input is untouched as well.
+    """
+
+    path: Path
+    fingerprint: str
+    entries: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> "SymbolCache":
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path, fingerprint)
+        if payload.get("version") != CACHE_VERSION or payload.get("fingerprint") != fingerprint:
+            return cls(path, fingerprint)
+        return cls(path, fingerprint, payload.get("symbols", {}))
+
+    def get(self, symbol: str, stamp: Any) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(symbol)
+        if entry is None or entry.get("stamp") != stamp:
+            return None
+        return entry
+
+    def put(self, symbol: str, stamp: Any, **values: Any) -> None:
+        self.entries[symbol] = {"stamp": stamp, **values}
+
+    def retain(self, symbols: Iterable[str]) -> None:
+        keep = set(symbols)
+        self.entries = {symbol: entry for symbol, entry in self.entries.items() if symbol in keep}
+
+    def save(self) -> None:
+        payload = {"version": CACHE_VERSION, "fingerprint": self.fingerprint, "symbols": self.entries}
+        with atomic_path(self.path) as tmp:
+            tmp.write_text(json.dumps(payload, default=_to_builtin), encoding="utf-8")
+
+
+def _to_builtin(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,75 @@
+"""CSV <-> daily store bridge (one-shot migration and CSV export) and CSV tail reads."""
+
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .change_journal import WHOLE_HISTORY, ChangeJournal
+from .daily_store import DailyStore, load_symbol_daily, write_daily
+
+
+def migrate_csv_dir(
+    csv_dir: Path, store: DailyStore, overwrite: bool = False, journal: Optional[ChangeJournal] = None
+) -> Tuple[int, List[str]]:
+    """Convert ``{csv_dir}/{ts_code}.csv`` files into store partitions.
+
+    Returns ``(migrated_count, failed_symbols)``. Existing partitions are kept
+    unless ``overwrite`` is set, so the migration can be re-run safely. Written
+    symbols are recorded in ``journal`` (saved by the caller) as whole-history changes.
+    """
+    migrated = 0
+    failed: List[str] = []
+    for path in sorted(csv_dir.glob("*.csv")):
+        symbol = path.stem
+        if not overwrite and store.has_symbol(symbol):
+            continue
+        try:
+            frame = pd.read_csv(path)
+        except Exception:
+            failed.append(symbol)
+            continue
+        if frame.empty or "trade_date" not in frame.columns:
+            failed.append(symbol)
+            continue
+        write_daily(symbol, frame, store)
+        if journal is not None:
+            journal.record(symbol, WHOLE_HISTORY)
+        migrated += 1
+    return migrated, failed
+
+
+def export_csv_dir(store: DailyStore, csv_dir: Path, symbols: Optional[Iterable[str]] = None) -> int:
+    """Write store partitions back out as ``{csv_dir}/{ts_code}.csv``."""
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    exported = 0
+    for symbol in symbols if symbols is not None else store.symbols():
+        frame = load_symbol_daily(symbol, store=store)
+        if frame.empty:
+            continue
+        frame.to_csv(csv_dir / f"{symbol}.csv", index=False, float_format="%.6f")
+        exported += 1
+    return exported
+
+
+def tail_csv(path: Path, rows: int = 1, block_size: int = 8192) -> pd.DataFrame:
+    """Header plus the last ``rows`` lines of a CSV, read backwards from the end of the file."""
+    with Path(path).open("rb") as handle:
+        header = handle.readline()
+        start = handle.tell()
+        position = handle.seek(0, os.SEEK_END)
+        data = b""
+        while position > start and data.count(b"\n") <= rows:
+            step = min(block_size, position - start)
+            position -= step
+            handle.seek(position)
+            data = handle.read(step) + data
+    lines = data.splitlines()
+    if position > start:
+        lines = lines[1:]  # first line may be cut mid-way
+    lines = [line for line in lines if line.strip()][-rows:] if rows > 0 else []
+    return pd.read_csv(io.BytesIO(header + b"".join(line + b"\n" for line in lines)))
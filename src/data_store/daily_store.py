@@ -0,0 +1,351 @@
+"""Columnar (Parquet) store for daily bars, one partition per ts_code.
+
+A partition is a base file plus, after appends, small delta segments under
+``_segments/{ts_code}/``. Appends write only the new rows as a segment; reads
+merge base and segments (later rows win per trade_date), and once
+``compact_segments`` segments pile up they are folded back into the base.
+Every file is published with temp-file + rename, so readers never see a
+partially written partition. Writes keep a metadata sidecar current
+(:mod:`.partition_meta`) so freshness and tail queries skip full history.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError as exc:  # pragma: no cover - import error highlighted at runtime
+    raise RuntimeError(
+        "pyarrow package is required for the daily store. Install via `pip install pyarrow` inside .venv."
+    ) from exc
+
+from src.utils.config import load_settings
+
+from .atomic import atomic_path
+from .partition_meta import ROW_GROUP_ROWS, PartitionMeta, load_meta, meta_path, save_meta
+
+SUFFIX = ".parquet"
+FLOAT_DECIMALS = 6
+SEGMENTS_DIR = "_segments"
+
+
+@dataclass
+class DailyStore:
+    """Parquet partitions under ``root``: ``{root}/{ts_code}.parquet`` plus delta segments."""
+
+    root: Path
+    compact_segments: int = 8
+
+    def path_for(self, symbol: str) -> Path:
+        return self.root / f"{symbol}{SUFFIX}"
+
+    def segment_dir(self, symbol: str) -> Path:
+        return self.root / SEGMENTS_DIR / symbol
+
+    def segments(self, symbol: str) -> List[Path]:
+        directory = self.segment_dir(symbol)
+        if not directory.exists():
+            return []
+        return sorted(directory.glob(f"*{SUFFIX}"))
+
+    def exists(self) -> bool:
+        return self.root.exists()
+
+    def has_symbol(self, symbol: str) -> bool:
+        return self.path_for(symbol).exists()
+
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name[: -len(SUFFIX)] for path in self.root.glob(f"*{SUFFIX}"))
+
+    def columns(self, symbol: str) -> List[str]:
+        path = self.path_for(symbol)
+        if not path.exists():
+            return []
+        names = list(pq.read_schema(path).names)
+        for segment in self.segments(symbol):
+            names.extend(name for name in pq.read_schema(segment).names if name not in names)
+        return names
+
+
+def build_daily_store(settings: Dict) -> DailyStore:
+    data_cfg = settings.get("data", {})
+    return DailyStore(
+        root=Path(data_cfg.get("daily_store_dir", "data/store/daily")),
+        compact_segments=max(1, int(data_cfg.get("daily_compact_segments", 8))),
+    )
+
+
+def load_daily(
+    symbols: Optional[Iterable[str]] = None,
+    start: date | str | int | None = None,
+    end: date | str | int | None = None,
+    columns: Optional[Sequence[str]] = None,
+    store: Optional[DailyStore] = None,
+) -> pd.DataFrame:
+    """Return a long frame (ts_code x trade_date) for the requested symbols."""
+    _store = store or build_daily_store(load_settings())
+    selected = list(symbols) if symbols is not None else _store.symbols()
+    frames = []
+    for symbol in selected:
+        frame = load_symbol_daily(symbol, start=start, end=end, columns=columns, store=_store)
+        if frame.empty:
+            continue
+        if "ts_code" not in frame.columns:
+            frame.insert(0, "ts_code", symbol)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=_frame_columns(columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_daily_tail(
+    symbols: Iterable[str],
+    rows: int,
+    columns: Optional[Sequence[str]] = None,
+    store: Optional[DailyStore] = None,
+) -> pd.DataFrame:
+    """Long frame of the newest ``rows`` bars per symbol, in ``symbols`` order then trade_date."""
+    _store = store or build_daily_store(load_settings())
+    frames = []
+    for symbol in symbols:
+        frame = load_symbol_tail(symbol, rows, columns=columns, store=_store)
+        if frame.empty:
+            continue
+        if "ts_code" in frame.columns:
+            frame = frame.drop(columns="ts_code")
+        frame.insert(0, "ts_code", symbol)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["ts_code", *_frame_columns(columns)])
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_symbol_daily(
+    symbol: str,
+    start: date | str | int | None = None,
+    end: date | str | int | None = None,
+    columns: Optional[Sequence[str]] = None,
+    store: Optional[DailyStore] = None,
+) -> pd.DataFrame:
+    """Read a single symbol's bars sorted by trade_date (empty frame if missing)."""
+    _store = store or build_daily_store(load_settings())
+    path = _store.path_for(symbol)
+    if not path.exists():
+        return pd.DataFrame(columns=_frame_columns(columns))
+    filters = []
+    start_int = to_int_date(start)
+    end_int = to_int_date(end)
+    if start_int is not None:
+        filters.append(("trade_date", ">=", start_int))
+    if end_int is not None:
+        filters.append(("trade_date", "<=", end_int))
+    segments = _store.segments(symbol)
+    parts = [_read_part(part, columns, filters) for part in [path, *segments]]
+    if not segments:
+        return parts[0].sort_values("trade_date").reset_index(drop=True)
+    df = pd.concat([part for part in parts if not part.empty] or parts[:1], ignore_index=True)
+    df = df.drop_duplicates(subset="trade_date", keep="last")
+    return df.sort_values("trade_date").reset_index(drop=True)
+
+
+def load_symbol_tail(
+    symbol: str,
+    rows: int,
+    columns: Optional[Sequence[str]] = None,
+    store: Optional[DailyStore] = None,
+) -> pd.DataFrame:
+    """``load_symbol_daily(...).tail(rows)``, decoding only the newest row groups of the base file."""
+    _store = store or build_daily_store(load_settings())
+    meta = partition_meta(symbol, _store)
+    if meta is None:
+        return load_symbol_daily(symbol, columns=columns, store=_store).tail(rows).reset_index(drop=True)
+    groups: List[int] = []
+    covered = 0
+    for index in range(len(meta.row_groups) - 1, -1, -1):
+        if covered >= rows:
+            break
+        groups.insert(0, index)
+        covered += meta.row_groups[index]
+    base_file = pq.ParquetFile(_store.path_for(symbol))
+    read_cols = _available(base_file.schema_arrow.names, columns)
+    parts = [base_file.read_row_groups(groups, columns=read_cols).to_pandas()]
+    parts.extend(_read_part(segment, columns, []) for segment in _store.segments(symbol))
+    df = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    df = df.drop_duplicates(subset="trade_date", keep="last").sort_values("trade_date")
+    return df.tail(rows).reset_index(drop=True)
+
+
+def latest_trade_date(symbol: str, store: Optional[DailyStore] = None) -> Optional[int]:
+    """Newest stored trade_date from the metadata sidecar (no bar data read when it is current)."""
+    meta = partition_meta(symbol, store or build_daily_store(load_settings()))
+    return meta.last_trade_date if meta is not None and meta.rows else None
+
+
+def partition_meta(symbol: str, store: DailyStore) -> Optional[PartitionMeta]:
+    """Current metadata for a partition, rebuilt from the files when missing or stale."""
+    base = store.path_for(symbol)
+    if not base.exists():
+        return None
+    segments = len(store.segments(symbol))
+    meta = load_meta(meta_path(store.root, symbol))
+    if meta is not None and meta.describes(base, segments):
+        return meta
+    dates = load_symbol_daily(symbol, columns=["trade_date"], store=store)["trade_date"]
+    return _record_meta(symbol, store, dates, store.columns(symbol), segments)
+
+
+def write_daily(symbol: str, frame: pd.DataFrame, store: DailyStore) -> Path:
+    """Replace a symbol's partition with ``frame`` (normalized, deduped, sorted)."""
+    normalized = normalize_daily_frame(frame)
+    # same order as compact_daily: the new base is in place before the old segments go,
+    # so no reader ever sees the old base with its appended rows already deleted
+    path = _publish(store.path_for(symbol), normalized, row_group_size=ROW_GROUP_ROWS)
+    _clear_segments(symbol, store)
+    _record_meta(symbol, store, normalized.get("trade_date", pd.Series(dtype="int64")), list(normalized.columns), 0)
+    return path
+
+
+def append_daily(symbol: str, frame: pd.DataFrame, store: DailyStore) -> int:
+    """Add rows to a symbol's partition as a delta segment; returns the number of new trade dates.
+
+    Costs O(new rows): only the stored trade dates are read, and the incoming
+    rows (which win over stored rows of the same date) are written as-is.
+    """
+    incoming = normalize_daily_frame(frame)
+    if incoming.empty:
+        return 0
+    meta = partition_meta(symbol, store)
+    if meta is None:
+        write_daily(symbol, incoming, store)
+        return len(incoming)
+    if meta.rows == 0 or incoming["trade_date"].min() > meta.last_trade_date:
+        added = len(incoming)  # pure append: no need to read the stored dates
+    else:
+        known = load_symbol_daily(symbol, columns=["trade_date"], store=store)["trade_date"]
+        added = int((~incoming["trade_date"].isin(known)).sum())
+    segments = store.segments(symbol)
+    sequence = int(segments[-1].stem) + 1 if segments else 1
+    _publish(store.segment_dir(symbol) / f"{sequence:08d}{SUFFIX}", incoming)
+
+    first, last = int(incoming["trade_date"].min()), int(incoming["trade_date"].max())
+    meta.first_trade_date = min(first, meta.first_trade_date) if meta.rows else first
+    meta.last_trade_date = max(last, meta.last_trade_date)
+    meta.rows += added
+    meta.columns.extend(column for column in incoming.columns if column not in meta.columns)
+    meta.segments = len(segments) + 1
+    save_meta(meta_path(store.root, symbol), meta)
+    if meta.segments >= store.compact_segments:
+        compact_daily(symbol, store)
+    return added
+
+
+def compact_daily(symbol: str, store: DailyStore) -> None:
+    """Fold a symbol's delta segments into its base file."""
+    segments = store.segments(symbol)
+    if not segments:
+        return
+    # publish the merged base before dropping segments: a reader in between
+    # applies segment rows the base already holds, which changes nothing
+    merged = normalize_daily_frame(load_symbol_daily(symbol, store=store))
+    _publish(store.path_for(symbol), merged, row_group_size=ROW_GROUP_ROWS)
+    for segment in segments:
+        segment.unlink(missing_ok=True)
+    _record_meta(symbol, store, merged["trade_date"], list(merged.columns), 0)
+
+
+def _publish(path: Path, frame: pd.DataFrame, **kwargs) -> Path:
+    with atomic_path(path) as tmp:
+        frame.to_parquet(tmp, index=False, **kwargs)
+    return path
+
+
+def _record_meta(
+    symbol: str, store: DailyStore, dates: pd.Series, columns: List[str], segments: int
+) -> PartitionMeta:
+    base = store.path_for(symbol)
+    footer = pq.read_metadata(base)
+    meta = PartitionMeta(
+        first_trade_date=int(dates.min()) if len(dates) else 0,
+        last_trade_date=int(dates.max()) if len(dates) else 0,
+        rows=int(len(dates)),
+        columns=list(columns),
+        row_groups=[footer.row_group(index).num_rows for index in range(footer.num_row_groups)],
+        base_size=base.stat().st_size,
+        segments=segments,
+    )
+    save_meta(meta_path(store.root, symbol), meta)
+    return meta
+
+
+def _clear_segments(symbol: str, store: DailyStore) -> None:
+    for segment in store.segments(symbol):
+        segment.unlink(missing_ok=True)
+
+
+def _read_part(path: Path, columns: Optional[Sequence[str]], filters: List) -> pd.DataFrame:
+    read_cols = _available(pq.read_schema(path).names, columns)
+    return pd.read_parquet(path, columns=read_cols, filters=filters or None)
+
+
+def _available(names: Sequence[str], columns: Optional[Sequence[str]]) -> Optional[List[str]]:
+    if columns is None:
+        return None
+    available = set(names)
+    return [col for col in _frame_columns(columns) if col in available]
+
+
+def normalize_daily_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce trade_date to int YYYYMMDD, numeric columns to float, drop dup dates."""
+    if frame.empty or "trade_date" not in frame.columns:
+        return frame.reset_index(drop=True)
+    df = frame.copy()
+    df["trade_date"] = df["trade_date"].map(to_int_date)
+    df = df.dropna(subset=["trade_date"])
+    df["trade_date"] = df["trade_date"].astype("int64")
+    for column in df.columns:
+        if column in ("trade_date", "ts_code"):
+            continue
+        if df[column].dtype == object:
+            converted = pd.to_numeric(df[column], errors="coerce")
+            if converted.notna().sum() == df[column].notna().sum():
+                df[column] = converted
+        if pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].round(FLOAT_DECIMALS)
+    if "ts_code" in df.columns:
+        df["ts_code"] = df["ts_code"].astype(str)
+    df = df.drop_duplicates(subset="trade_date", keep="last").sort_values("trade_date")
+    return df.reset_index(drop=True)
+
+
+def to_int_date(value) -> Optional[int]:
+    """Parse date-like values (20240102, "20240102", "20240102.0", date) into an int."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, date)):
+        return int(value.strftime("%Y%m%d"))
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.isdigit():
+        return int(text)
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+def _frame_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    if columns is None:
+        return []
+    ordered = list(columns)
+    if "trade_date" not in ordered:
+        ordered.insert(0, "trade_date")
+    return ordered
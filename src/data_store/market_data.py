@@ -0,0 +1,121 @@
+"""Load-once view of the market data shared by stages chained in one process.
+
+The auto pipeline, the backend daily routine and multi-flag CLI runs build one
+:class:`MarketDataContext` and hand it to every stage. Daily bars, indicator
+files, the active universe and the regime series are read on first use and
+served from memory afterwards; a stage that rewrites any of them invalidates
+the matching entries so later stages see the new data. Frames are returned as
+copies, so callers may modify them.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+import pandas as pd
+
+from .daily_store import DailyStore, build_daily_store, load_symbol_daily
+
+
+@dataclass
+class MarketDataContext:
+    daily_store: DailyStore
+    indicators_dir: Path
+    universe_path: Path
+    regime_path: Path
+    # per-symbol frames kept per kind, least recently used first out; None keeps every symbol. Stages walk the
+    # whole universe in turn, so any cap below its size evicts each frame before the next stage reuses it.
+    max_symbols: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._daily: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._indicators: "OrderedDict[str, Optional[pd.DataFrame]]" = OrderedDict()
+        self._tables: Dict[str, pd.DataFrame] = {}
+        self.reads: Counter = Counter()  # disk reads per kind, for logging and tests
+
+    def daily(self, symbol: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Full stored history of ``symbol`` (optionally a column subset), read once."""
+        frame = self._symbol_entry(
+            self._daily, "daily", symbol, lambda: load_symbol_daily(symbol, store=self.daily_store)
+        )
+        if columns is not None:
+            frame = frame[[column for column in columns if column in frame.columns]]
+        return frame.copy()
+
+    def indicators(self, symbol: str) -> Optional[pd.DataFrame]:
+        """``{indicators_dir}/{symbol}.csv`` or ``None`` when the file is missing."""
+        path = self.indicators_dir / f"{symbol}.csv"
+        frame = self._symbol_entry(
+            self._indicators, "indicators", symbol, lambda: pd.read_csv(path) if path.exists() else None
+        )
+        return None if frame is None else frame.copy()
+
+    def universe(self) -> pd.DataFrame:
+        """Active universe table (empty when the file does not exist yet)."""
+        return self._table("universe", self.universe_path)
+
+    def regime(self) -> pd.DataFrame:
+        """Market regime series (empty when the file does not exist yet)."""
+        return self._table("regime", self.regime_path)
+
+    def invalidate_daily(self, symbols: Optional[Iterable[str]] = None) -> None:
+        self._drop(self._daily, symbols)
+
+    def invalidate_indicators(self, symbols: Optional[Iterable[str]] = None) -> None:
+        self._drop(self._indicators, symbols)
+
+    def invalidate_universe(self) -> None:
+        with self._lock:
+            self._tables.pop("universe", None)
+
+    def invalidate_regime(self) -> None:
+        with self._lock:
+            self._tables.pop("regime", None)
+
+    def _symbol_entry(self, cache: OrderedDict, kind: str, symbol: str, load: Callable[[], Optional[pd.DataFrame]]):
+        with self._lock:
+            if symbol in cache:
+                cache.move_to_end(symbol)
+                return cache[symbol]
+        value = load()  # outside the lock: concurrent stages may read different symbols in parallel
+        with self._lock:
+            self.reads[kind] += 1
+            cache[symbol] = value
+            while self.max_symbols is not None and len(cache) > max(1, self.max_symbols):
+                cache.popitem(last=False)
+        return value
+
+    def _table(self, kind: str, path: Path) -> pd.DataFrame:
+        with self._lock:
+            frame = self._tables.get(kind)
+        if frame is None:
+            frame = pd.read_csv(path) if path.exists() else pd.DataFrame()
+            with self._lock:
+                self.reads[kind] += 1
+                self._tables[kind] = frame
+        return frame.copy()
+
+    def _drop(self, cache: OrderedDict, symbols: Optional[Iterable[str]]) -> None:
+        with self._lock:
+            if symbols is None:
+                cache.clear()
+                return
+            for symbol in symbols:
+                cache.pop(symbol, None)
+
+
+def build_market_data_context(settings: Dict) -> MarketDataContext:
+    data_cfg = settings.get("data", {})
+    max_symbols = data_cfg.get("context_cache_symbols")
+    return MarketDataContext(
+        daily_store=build_daily_store(settings),
+        indicators_dir=Path(data_cfg.get("indicators_dir", "data/indicators")),
+        universe_path=Path(settings.get("active_pool", {}).get("universe_path", "data/universe/active_universe.csv")),
+        regime_path=Path(settings.get("market_guard", {}).get("output_path", "data/backtests/market_regime.csv")),
+        max_symbols=int(max_symbols) if max_symbols else None,
+    )
@@ -0,0 +1,56 @@
+"""Per-symbol metadata sidecars for the daily store.
+
+``{root}/_meta/{ts_code}.json`` records a partition's date span, merged row
+count, schema and the row count of every Parquet row group in its base file.
+Freshness checks read only this file, and tail reads use the row-group sizes to
+decode just the newest groups. The sidecar notes the base file size and segment
+count it describes; a mismatch marks it stale and it is rebuilt from the data.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from .atomic import atomic_path
+
+META_VERSION = 1
+META_DIR = "_meta"
+ROW_GROUP_ROWS = 128  # base files are written in groups this size so tails decode <= 2 groups
+
+
+@dataclass
+class PartitionMeta:
+    first_trade_date: int
+    last_trade_date: int
+    rows: int  # merged rows across base + segments
+    columns: List[str]
+    row_groups: List[int] = field(default_factory=list)  # base rows per row group, oldest first
+    base_size: int = 0  # bytes of the base file this sidecar describes
+    segments: int = 0  # delta segments present when recorded
+    version: int = META_VERSION
+
+    def describes(self, base_path: Path, segments: int) -> bool:
+        try:
+            size = base_path.stat().st_size
+        except FileNotFoundError:
+            return False
+        return self.version == META_VERSION and self.base_size == size and self.segments == segments
+
+
+def meta_path(root: Path, symbol: str) -> Path:
+    return root / META_DIR / f"{symbol}.json"
+
+
+def load_meta(path: Path) -> Optional[PartitionMeta]:
+    try:
+        return PartitionMeta(**json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def save_meta(path: Path, meta: PartitionMeta) -> None:
+    with atomic_path(path) as tmp:
+        tmp.write_text(json.dumps(asdict(meta)), encoding="utf-8")
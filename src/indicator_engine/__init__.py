@@ -16,7 +16,7 @@ from .momentum.dmi import dmi
 
 from .volatility.boll import boll
 from .volatility.dpo import dpo
-from .volatility.sar import sar
+from .volatility.sar import sar, sar_array
 
 from .volume.obv import obv
 from .volume.vr import vr
@@ -41,6 +41,7 @@ __all__ = [
     "boll",
     "dpo",
     "sar",
+    "sar_array",
     "obv",
     "vr",
     "arbr",
@@ -2,21 +2,34 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import numpy as np
 import pandas as pd
 
+from ..utils import lag
+
 
 def asi(open_: pd.Series, high: pd.Series, low: pd.Series, close: pd.Series, ma_period: int = 10) -> pd.DataFrame:
-    prev_close = close.shift(1)
-    prev_open = open_.shift(1)
-    k = pd.Series(np.maximum.reduce([(high - prev_close).abs(), (low - prev_close).abs()]), index=close.index)
-    r = pd.Series(np.where(
-        (high - prev_close).abs() > (low - prev_close).abs(),
-        (high - prev_close).abs() - 0.5 * (low - prev_close).abs() + 0.25 * (close - prev_close).abs(),
-        (low - prev_close).abs() - 0.5 * (high - prev_close).abs() + 0.25 * (close - prev_close).abs(),
-    ), index=close.index)
-    r += 1e-9
-    si = 50 * ((close - prev_close) + 0.5 * (close - open_) + 0.25 * (prev_close - prev_open)) / r * k
-    asi_series = si.cumsum()
+    return pd.DataFrame(asi_columns(open_, high, low, close, ma_period))
+
+
+def asi_columns(open_, high, low, close, ma_period: int = 10) -> Dict[str, pd.Series]:
+    asi_series = swing_index(open_, high, low, close).cumsum()
     asit = asi_series.rolling(ma_period, min_periods=1).mean()
-    return pd.DataFrame({"ASI": asi_series, "ASIT": asit})
+    return {"ASI": asi_series, "ASIT": asit}
+
+
+def swing_index(open_: pd.Series, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    """Per-bar SI; ASI is its running sum."""
+    prev_close = lag(close)
+    prev_open = lag(open_)
+    up_move = (high - prev_close).abs()
+    down_move = (low - prev_close).abs()
+    k = np.maximum(up_move, down_move)
+    r = (up_move - 0.5 * down_move + 0.25 * (close - prev_close).abs()).where(
+        up_move > down_move,
+        down_move - 0.5 * up_move + 0.25 * (close - prev_close).abs(),
+    )
+    r += 1e-9
+    return 50 * ((close - prev_close) + 0.5 * (close - open_) + 0.25 * (prev_close - prev_open)) / r * k
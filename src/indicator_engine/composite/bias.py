@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 from ..trend.ma import ma
 
 
 def bias(series: pd.Series, periods: tuple[int, ...] = (6, 12, 24)) -> pd.DataFrame:
+    return pd.DataFrame(bias_columns(series, periods))
+
+
+def bias_columns(series, periods: tuple[int, ...] = (6, 12, 24)) -> Dict[str, pd.Series]:
     data = {}
     for idx, p in enumerate(periods, start=1):
         ma_val = ma(series, p)
@@ -15,4 +21,4 @@ def bias(series: pd.Series, periods: tuple[int, ...] = (6, 12, 24)) -> pd.DataFr
         label = f"bias{idx}"
         data[label] = bias_val
         data[f"bias_{p}"] = bias_val
-    return pd.DataFrame(data)
+    return data
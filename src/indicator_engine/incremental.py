@@ -0,0 +1,254 @@
+"""Incremental indicator updates that continue saved recursive state.
+
+A full run (:func:`compute_with_state`) also captures, at the last row, every
+value a recursive indicator carries forward: EMA levels (EXPMA/MACD/TRIX/RSI/
+KDJ), running OBV/ASI sums with the tails their moving averages need, and the
+SAR trend/EP/AF. :func:`update_indicators` then computes only the new rows:
+window-based indicators from a short tail of bars, recursive ones from state.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .calculator import compute_indicators, prepare_inputs
+from .composite.asi import swing_index
+from .momentum.kdj import rsv
+from .momentum.rsi import rsi_from_averages
+from .registry import output_columns
+from .trend.ema import ema
+from .volatility.sar import sar_with_state
+from .volume.obv import signed_volume
+
+STATE_VERSION = 1
+TAIL_ROWS = 120  # covers the longest window chain (DMA: ma50 -> ma10)
+EXPMA_SPANS = (5, 10, 20, 60)
+MACD_SPANS = (12, 26, 9)
+RSI_PERIODS = (6, 12, 24)
+TRIX_PERIOD, TRIX_SIGNAL = 12, 20
+OBV_MA, ASI_MA = 30, 10
+
+
+@dataclass
+class IndicatorState:
+    last_trade_date: int
+    rows: int
+    fingerprint: str
+    columns: List[str]
+    seeds: Dict[str, float] = field(default_factory=dict)
+    tails: Dict[str, List[float]] = field(default_factory=dict)
+    output_size: int = 0  # bytes of the indicator file this state was saved alongside
+    version: int = STATE_VERSION
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> Optional["IndicatorState"]:
+        try:
+            payload = json.loads(text)
+            state = cls(**payload)
+        except (TypeError, ValueError):
+            return None
+        return state if state.version == STATE_VERSION else None
+
+
+def compute_with_state(
+    daily_df: pd.DataFrame, columns: Optional[Iterable[str]] = None
+) -> Tuple[pd.DataFrame, Optional[IndicatorState]]:
+    """Full :func:`compute_indicators` plus the state needed to extend it later."""
+    result = compute_indicators(daily_df, columns)
+    if result.empty:
+        return result, None
+    inputs = prepare_inputs(daily_df)
+    seeds, tails = _recursive_state(inputs)
+    return result, _make_state(inputs, list(result.columns), seeds, tails)
+
+
+def update_indicators(
+    daily_df: pd.DataFrame, state: IndicatorState, columns: Optional[Iterable[str]] = None
+) -> Optional[Tuple[pd.DataFrame, IndicatorState]]:
+    """Indicator rows for bars after ``state.last_trade_date``.
+
+    Returns ``None`` when the saved state no longer describes the stored history
+    (rewritten or re-based bars, NaN seeds, schema or ``columns`` change);
+    callers should then fall back to :func:`compute_with_state`.
+    """
+    inputs = prepare_inputs(daily_df)
+    price = inputs["price"]
+    dates = price.index.to_numpy()
+    known = int((dates <= state.last_trade_date).sum())
+    if known != state.rows or known == 0 or _fingerprint(inputs, known - 1) != state.fingerprint:
+        return None
+    if any(pd.isna(value) for value in state.seeds.values()) or not _clean_bars(inputs, known):
+        return None
+    if ["trade_date"] + output_columns(columns, inputs["volume"] is not None) != state.columns:
+        return None
+    new_count = len(dates) - known
+    if new_count == 0:
+        return pd.DataFrame(columns=state.columns), state
+
+    start = max(0, known - TAIL_ROWS)
+    tail_daily = daily_df.sort_values("trade_date").iloc[start:]
+    window = compute_indicators(tail_daily, columns)
+    if list(window.columns) != state.columns:
+        return None
+    new_rows = window.iloc[-new_count:].reset_index(drop=True)
+    tail_inputs = {key: (series.iloc[start:] if series is not None else None) for key, series in inputs.items()}
+    recursive, seeds, tails = _continue_recursive(tail_inputs, known - start, state)
+    for column, values in recursive.items():
+        if column in new_rows.columns:
+            new_rows[column] = np.round(values, 6)
+    return new_rows[state.columns], _make_state(inputs, state.columns, seeds, tails)
+
+
+def _recursive_state(inputs: Dict[str, Optional[pd.Series]]) -> Tuple[Dict[str, float], Dict[str, List[float]]]:
+    price, high, low, open_, volume = (inputs[key] for key in ("price", "high", "low", "open", "volume"))
+    seeds: Dict[str, float] = {}
+    tails: Dict[str, List[float]] = {}
+    for span in EXPMA_SPANS + MACD_SPANS[:2]:
+        seeds[f"ema{span}"] = _last(ema(price, span))
+    dif = ema(price, MACD_SPANS[0]) - ema(price, MACD_SPANS[1])
+    seeds["dea"] = _last(ema(dif, MACD_SPANS[2]))
+    seeds["kdj_k"] = _last(rsv(high, low, price).ewm(alpha=1 / 3, adjust=False).mean())
+    seeds["kdj_d"] = _last(
+        rsv(high, low, price).ewm(alpha=1 / 3, adjust=False).mean().ewm(alpha=1 / 3, adjust=False).mean()
+    )
+    delta = price.diff()
+    for period in RSI_PERIODS:
+        seeds[f"rsi_gain{period}"] = _last(delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean())
+        seeds[f"rsi_loss{period}"] = _last(delta.clip(upper=0).ewm(alpha=1 / period, adjust=False).mean())
+    ema1 = ema(price, TRIX_PERIOD)
+    ema2 = ema(ema1, TRIX_PERIOD)
+    ema3 = ema(ema2, TRIX_PERIOD)
+    seeds.update(trix_ema1=_last(ema1), trix_ema2=_last(ema2), trix_ema3=_last(ema3))
+    tails["trix"] = _tail(ema3.pct_change() * 100, TRIX_SIGNAL - 1)
+    asi_series = swing_index(open_, high, low, price).cumsum()
+    seeds["asi"] = _last(asi_series)
+    tails["asi"] = _tail(asi_series, ASI_MA - 1)
+    if volume is not None:
+        obv_series = signed_volume(price, volume).cumsum()
+        seeds["obv"] = _last(obv_series)
+        tails["obv"] = _tail(obv_series, OBV_MA - 1)
+    seeds.update(sar_with_state(high.to_numpy(dtype=float), low.to_numpy(dtype=float))[1])
+    return seeds, tails
+
+
+def _continue_recursive(
+    inputs: Dict[str, Optional[pd.Series]], known: int, state: IndicatorState
+) -> Tuple[Dict[str, np.ndarray], Dict[str, float], Dict[str, List[float]]]:
+    """Extend every recursive series over rows ``inputs[*][known:]``."""
+    price, high, low, open_, volume = (inputs[key] for key in ("price", "high", "low", "open", "volume"))
+    seeds = dict(state.seeds)
+    tails: Dict[str, List[float]] = {}
+    out: Dict[str, np.ndarray] = {}
+    new_price = price.iloc[known:]
+
+    for idx, span in enumerate(EXPMA_SPANS, start=1):
+        out[f"ma{idx}"] = _continue_ewm(seeds, f"ema{span}", new_price, span=span)
+    fast = _continue_ewm(seeds, f"ema{MACD_SPANS[0]}", new_price, span=MACD_SPANS[0])
+    slow = _continue_ewm(seeds, f"ema{MACD_SPANS[1]}", new_price, span=MACD_SPANS[1])
+    dif = fast - slow
+    dea = _continue_ewm(seeds, "dea", dif, span=MACD_SPANS[2])
+    out.update(macd_dif=dif, macd_dea=dea, macd_macd=(dif - dea) * 2)
+
+    rsv_new = rsv(high, low, price).iloc[known:]
+    k = _continue_ewm(seeds, "kdj_k", rsv_new, alpha=1 / 3)
+    d = _continue_ewm(seeds, "kdj_d", k, alpha=1 / 3)
+    out.update(kdj_k=k, kdj_d=d, kdj_j=3 * k - 2 * d)
+
+    delta = price.diff().iloc[known:]
+    for period in RSI_PERIODS:
+        gain = _continue_ewm(seeds, f"rsi_gain{period}", delta.clip(lower=0), alpha=1 / period)
+        loss = -_continue_ewm(seeds, f"rsi_loss{period}", delta.clip(upper=0), alpha=1 / period)
+        out[f"rsi{period}"] = rsi_from_averages(pd.Series(gain), pd.Series(loss)).to_numpy()
+
+    prev_ema3 = seeds["trix_ema3"]
+    ema1 = _continue_ewm(seeds, "trix_ema1", new_price, span=TRIX_PERIOD)
+    ema2 = _continue_ewm(seeds, "trix_ema2", ema1, span=TRIX_PERIOD)
+    ema3 = _continue_ewm(seeds, "trix_ema3", ema2, span=TRIX_PERIOD)
+    trix = (pd.Series(np.r_[prev_ema3, ema3]).pct_change() * 100).to_numpy()[1:]
+    out["trix"] = trix
+    out["trma"], tails["trix"] = _continue_mean(state.tails["trix"], trix, TRIX_SIGNAL)
+
+    out["asi"] = _continue_cumsum(seeds, "asi", swing_index(open_, high, low, price).iloc[known:])
+    out["asit"], tails["asi"] = _continue_mean(state.tails["asi"], out["asi"], ASI_MA)
+    if volume is not None and "obv" in seeds:
+        out["obv"] = _continue_cumsum(seeds, "obv", signed_volume(price, volume).iloc[known:])
+        out["maobv"], tails["obv"] = _continue_mean(state.tails["obv"], out["obv"], OBV_MA)
+
+    sar_values, sar_state = sar_with_state(
+        high.to_numpy(dtype=float)[known - 1 :], low.to_numpy(dtype=float)[known - 1 :], seeds
+    )
+    seeds.update(sar_state)
+    out["sar"] = sar_values[1:]
+    return out, seeds, tails
+
+
+def _continue_ewm(seeds: Dict[str, float], key: str, values, **ewm_kwargs) -> np.ndarray:
+    """EWM (adjust=False) resumed from ``seeds[key]``; prepending the seed replays pandas' recursion."""
+    series = pd.Series(np.r_[seeds[key], np.asarray(values, dtype=float)])
+    result = series.ewm(adjust=False, **ewm_kwargs).mean().to_numpy()[1:]
+    seeds[key] = float(result[-1])
+    return result
+
+
+def _continue_cumsum(seeds: Dict[str, float], key: str, values) -> np.ndarray:
+    result = pd.Series(np.r_[seeds[key], np.asarray(values, dtype=float)]).cumsum().to_numpy()[1:]
+    seeds[key] = float(pd.Series(np.r_[seeds[key], result]).ffill().iloc[-1])
+    return result
+
+
+def _continue_mean(tail: List[float], values: np.ndarray, window: int) -> Tuple[np.ndarray, List[float]]:
+    """Trailing mean of the new values given the previous ``window - 1``; returns the next tail too."""
+    combined = pd.Series(np.r_[np.asarray(tail, dtype=float), values])
+    means = combined.rolling(window, min_periods=1).mean().to_numpy()[len(tail) :]
+    return means, _tail(combined, window - 1)
+
+
+def _make_state(
+    inputs: Dict[str, Optional[pd.Series]],
+    columns: List[str],
+    seeds: Dict[str, float],
+    tails: Dict[str, List[float]],
+) -> IndicatorState:
+    rows = len(inputs["price"])
+    return IndicatorState(
+        last_trade_date=int(inputs["price"].index[-1]),
+        rows=rows,
+        fingerprint=_fingerprint(inputs, rows - 1),
+        columns=columns,
+        seeds=seeds,
+        tails=tails,
+    )
+
+
+def _clean_bars(inputs: Dict[str, Optional[pd.Series]], known: int) -> bool:
+    """EWM state only carries over exactly when the last two saved bars are complete."""
+    for key in ("price", "high", "low", "open"):
+        if inputs[key].iloc[max(0, known - 2) : known].isna().any():
+            return False
+    return True
+
+
+def _fingerprint(inputs: Dict[str, Optional[pd.Series]], position: int) -> str:
+    """Hash of the bar the state was taken at; changes when history is rewritten or re-based."""
+    parts = [str(inputs["price"].index[position])]
+    for key in ("price", "high", "low", "open", "volume"):
+        series = inputs[key]
+        parts.append("none" if series is None else repr(float(series.iloc[position])))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def _last(series: pd.Series) -> float:
+    return float(series.iloc[-1]) if len(series) else float("nan")
+
+
+def _tail(series: pd.Series, size: int) -> List[float]:
+    return [float(value) for value in series.iloc[-size:]] if size > 0 else []
@@ -0,0 +1,60 @@
+"""Per-call memo shared by the indicator primitives.
+
+Inside :func:`shared_primitives` the building blocks that several indicators
+recompute (``ma``/``ema`` of the same input and window, ``lag``/``delta`` of a
+series, the true range) are evaluated once and reused. Outside of it every
+primitive computes directly, so indicator functions keep working standalone.
+
+Entries are keyed by the identity of the input object and hold a reference to
+it, so an id cannot be recycled for a different series while the memo lives.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_ACTIVE: ContextVar[Optional["IndicatorMemo"]] = ContextVar("indicator_memo", default=None)
+
+
+class IndicatorMemo:
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple, Tuple[object, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, inputs: Tuple[object, ...], params: Hashable, compute: Callable[[], T]) -> T:
+        key = (name, tuple(id(item) for item in inputs), params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (inputs, value)
+        return value
+
+
+@contextmanager
+def shared_primitives() -> Iterator[IndicatorMemo]:
+    """Activate a memo for the enclosed indicator calls (re-entrant)."""
+    current = _ACTIVE.get()
+    if current is not None:
+        yield current
+        return
+    memo = IndicatorMemo()
+    token = _ACTIVE.set(memo)
+    try:
+        yield memo
+    finally:
+        _ACTIVE.reset(token)
+
+
+def memoized(name: str, inputs: Tuple[object, ...], params: Hashable, compute: Callable[[], T]) -> T:
+    memo = _ACTIVE.get()
+    if memo is None:
+        return compute()
+    return memo.get(name, inputs, params, compute)
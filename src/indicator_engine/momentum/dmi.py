@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
-from ..utils import true_range
+from ..utils import lag, true_range
 
 
 def dmi(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14, smooth: int = 6) -> pd.DataFrame:
-    plus_dm = (high - high.shift(1)).clip(lower=0)
-    minus_dm = (low.shift(1) - low).clip(lower=0)
+    return pd.DataFrame(dmi_columns(high, low, close, period, smooth))
+
+
+def dmi_columns(high, low, close, period: int = 14, smooth: int = 6) -> Dict[str, pd.Series]:
+    plus_dm = (high - lag(high)).clip(lower=0)
+    minus_dm = (lag(low) - low).clip(lower=0)
     plus_dm[plus_dm < minus_dm] = 0
     minus_dm[minus_dm <= plus_dm] = 0
     tr = true_range(high, low, close)
@@ -19,4 +25,4 @@ def dmi(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14, smo
     dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di + 1e-9)
     adx = dx.rolling(smooth, min_periods=1).mean()
     adxr = (adx + adx.shift(smooth)) / 2
-    return pd.DataFrame({"+DI": plus_di, "-DI": minus_di, "ADX": adx, "ADXR": adxr})
+    return {"+DI": plus_di, "-DI": minus_di, "ADX": adx, "ADXR": adxr}
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 
@@ -13,10 +15,17 @@ def kdj(
     k_smooth: int = 3,
     d_smooth: int = 3,
 ) -> pd.DataFrame:
-    low_min = low.rolling(period, min_periods=1).min()
-    high_max = high.rolling(period, min_periods=1).max()
-    rsv = (close - low_min) / (high_max - low_min + 1e-9) * 100
-    k = rsv.ewm(alpha=1 / k_smooth, adjust=False).mean()
+    return pd.DataFrame(kdj_columns(high, low, close, period, k_smooth, d_smooth))
+
+
+def kdj_columns(high, low, close, period: int = 9, k_smooth: int = 3, d_smooth: int = 3) -> Dict[str, pd.Series]:
+    k = rsv(high, low, close, period).ewm(alpha=1 / k_smooth, adjust=False).mean()
     d = k.ewm(alpha=1 / d_smooth, adjust=False).mean()
     j = 3 * k - 2 * d
-    return pd.DataFrame({"K": k, "D": d, "J": j})
+    return {"K": k, "D": d, "J": j}
+
+
+def rsv(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 9) -> pd.Series:
+    low_min = low.rolling(period, min_periods=1).min()
+    high_max = high.rolling(period, min_periods=1).max()
+    return (close - low_min) / (high_max - low_min + 1e-9) * 100
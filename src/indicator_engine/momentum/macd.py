@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 from ..trend.ema import ema
 
 
 def macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    return pd.DataFrame(macd_columns(series, fast, slow, signal))
+
+
+def macd_columns(series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
     fast_ema = ema(series, fast)
     slow_ema = ema(series, slow)
     dif = fast_ema - slow_ema
     dea = ema(dif, signal)
     hist = (dif - dea) * 2
-    return pd.DataFrame({"dif": dif, "dea": dea, "macd": hist})
+    return {"dif": dif, "dea": dea, "macd": hist}
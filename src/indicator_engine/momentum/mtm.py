@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 from ..trend.ma import ma
+from ..utils import lag
 
 
 def mtm(series: pd.Series, period: int = 12, ma_period: int = 6) -> pd.DataFrame:
-    momentum = series - series.shift(period)
+    return pd.DataFrame(mtm_columns(series, period, ma_period))
+
+
+def mtm_columns(series, period: int = 12, ma_period: int = 6) -> Dict[str, pd.Series]:
+    momentum = series - lag(series, period)
     mtm_ma = ma(momentum, ma_period)
-    return pd.DataFrame({"MTM": momentum, "MTMMA": mtm_ma})
+    return {"MTM": momentum, "MTMMA": mtm_ma}
@@ -2,23 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Dict, Iterable
 
 import pandas as pd
 
+from ..utils import delta
+
 
 def rsi(series: pd.Series, periods: int | Iterable[int] = (6, 12, 24)) -> pd.Series | pd.DataFrame:
     if isinstance(periods, int):
         return _rsi_single(series, periods)
-    data = {}
-    for period in periods:
-        data[f"rsi{period}"] = _rsi_single(series, period)
-    return pd.DataFrame(data)
+    return pd.DataFrame(rsi_columns(series, periods))
+
+
+def rsi_columns(series, periods: Iterable[int] = (6, 12, 24)) -> Dict[str, pd.Series]:
+    return {f"rsi{period}": _rsi_single(series, period) for period in periods}
 
 
 def _rsi_single(series: pd.Series, period: int) -> pd.Series:
-    delta = series.diff()
-    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
-    loss = -delta.clip(upper=0).ewm(alpha=1 / period, adjust=False).mean()
+    change = delta(series)
+    gain = change.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    loss = -change.clip(upper=0).ewm(alpha=1 / period, adjust=False).mean()
+    return rsi_from_averages(gain, loss)
+
+
+def rsi_from_averages(gain: pd.Series, loss: pd.Series) -> pd.Series:
     rs = gain / (loss + 1e-9)
     return 100 - (100 / (1 + rs))
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Dict, Iterable
 
 import pandas as pd
 
@@ -10,6 +10,13 @@ import pandas as pd
 def wr(high: pd.Series, low: pd.Series, close: pd.Series, periods: int | Iterable[int] = (10, 6)) -> pd.Series | pd.DataFrame:
     if isinstance(periods, int):
         periods = (periods,)
+    df = pd.DataFrame(wr_columns(high, low, close, periods))
+    if len(periods) == 1:
+        return df.iloc[:, 0]
+    return df
+
+
+def wr_columns(high, low, close, periods: Iterable[int] = (10, 6)) -> Dict[str, pd.Series]:
     data = {}
     for idx, period in enumerate(periods, start=1):
         high_max = high.rolling(period, min_periods=1).max()
@@ -17,7 +24,4 @@ def wr(high: pd.Series, low: pd.Series, close: pd.Series, periods: int | Iterabl
         wr_series = (high_max - close) / (high_max - low_min + 1e-9) * 100
         label = f"wr{idx}" if idx <= 2 else f"wr{period}"
         data[label] = wr_series
-    df = pd.DataFrame(data)
-    if len(periods) == 1:
-        return df.iloc[:, 0]
-    return df
+    return data
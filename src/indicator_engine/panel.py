@@ -0,0 +1,113 @@
+"""Panel-mode indicators: the whole universe as ``date x symbol`` matrices.
+
+:func:`compute_indicators_panel` runs :func:`calculator.indicator_columns` once
+on aligned frames instead of once per symbol. Each symbol's bars are first
+packed to the top of its column (dates where the symbol has no bar are
+dropped), so windows and recursions see exactly the rows
+:func:`compute_indicators` would; results are scattered back to the dates.
+Per-symbol frames are only built when asked for via :meth:`IndicatorPanel.frame`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .calculator import indicator_columns, prepare_inputs
+
+DECIMALS = 6
+
+
+@dataclass
+class IndicatorPanel:
+    dates: pd.Index
+    symbols: pd.Index
+    present: np.ndarray  # bool, True where the symbol has a bar on that date
+    values: Dict[str, np.ndarray]  # indicator column -> rounded date x symbol matrix
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.values)
+
+    def __getitem__(self, column: str) -> pd.DataFrame:
+        return pd.DataFrame(self.values[column], index=self.dates, columns=self.symbols)
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """One symbol's indicators, shaped like :func:`compute_indicators` output."""
+        col = self.symbols.get_loc(symbol)
+        rows = self.present[:, col]
+        if not rows.any():
+            return pd.DataFrame()
+        data = {"trade_date": self.dates[rows]}
+        for name, matrix in self.values.items():
+            data[name] = matrix[rows, col]
+        return pd.DataFrame(data)
+
+    def frames(self) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for symbol in self.symbols:
+            yield symbol, self.frame(symbol)
+
+
+def compute_indicators_panel(
+    close: pd.DataFrame,
+    high: pd.DataFrame,
+    low: pd.DataFrame,
+    open_: pd.DataFrame,
+    vol: Optional[pd.DataFrame] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> IndicatorPanel:
+    """All default indicators for aligned ``date x symbol`` price/volume frames.
+
+    A symbol has a bar on a date when any of its inputs is present there.
+    Without ``vol`` the volume-based columns (VR/ARBR/OBV) are omitted, as in
+    :func:`compute_indicators`; ``columns`` selects a subset the same way.
+    """
+    frames = [close, high, low, open_] + ([vol] if vol is not None else [])
+    for frame in frames[1:]:
+        if not (frame.index.equals(close.index) and frame.columns.equals(close.columns)):
+            raise ValueError("Panel inputs must share the same dates and symbols.")
+    present = np.zeros(close.shape, dtype=bool)
+    for frame in frames:
+        present |= frame.notna().to_numpy()
+
+    order = np.argsort(~present, axis=0, kind="stable")
+    packed = [_pack(frame, order) if frame is not None else None for frame in (close, high, low, open_, vol)]
+    computed = indicator_columns(*packed, columns=columns)
+
+    values: Dict[str, np.ndarray] = {}
+    for name, packed_values in computed.items():
+        matrix = np.empty(close.shape)
+        np.put_along_axis(matrix, order, packed_values.to_numpy(dtype=float), axis=0)
+        matrix[~present] = np.nan
+        values[name] = np.round(matrix, DECIMALS)
+    return IndicatorPanel(dates=close.index, symbols=close.columns, present=present, values=values)
+
+
+def panel_inputs(daily_frames: Mapping[str, pd.DataFrame]) -> Dict[str, Optional[pd.DataFrame]]:
+    """Align per-symbol daily frames into ``close/high/low/open_/vol`` panels.
+
+    Prices resolve front-adjusted columns like :func:`prepare_inputs`; ``vol``
+    is ``None`` unless every symbol carries a volume column.
+    """
+    prepared = {symbol: prepare_inputs(df) for symbol, df in daily_frames.items() if not df.empty}
+    panels: Dict[str, Optional[pd.DataFrame]] = {}
+    for key, name in (("price", "close"), ("high", "high"), ("low", "low"), ("open", "open_"), ("volume", "vol")):
+        series = {symbol: inputs[key] for symbol, inputs in prepared.items()}
+        if any(item is None for item in series.values()):
+            panels[name] = None
+            continue
+        panels[name] = pd.DataFrame({symbol: _last_per_date(item) for symbol, item in series.items()}).sort_index()
+    return panels
+
+
+def _pack(frame: pd.DataFrame, order: np.ndarray) -> pd.DataFrame:
+    """Move each column's bars to the top (stable), leaving NaN padding below."""
+    packed = np.take_along_axis(frame.to_numpy(dtype=float), order, axis=0)
+    return pd.DataFrame(packed, columns=frame.columns)
+
+
+def _last_per_date(series: pd.Series) -> pd.Series:
+    return series[~series.index.duplicated(keep="last")]
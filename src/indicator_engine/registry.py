@@ -0,0 +1,130 @@
+"""Registry of the default indicator set and the columns each entry produces.
+
+Every :class:`IndicatorSpec` computes one family of output columns from the
+prepared price inputs. ``requires`` names other entries whose output the family
+builds on (e.g. the BOLL mid band *is* ``ma20``); :func:`resolve` expands a
+column request into the entries to run, in output order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .composite.asi import asi_columns
+from .composite.bias import bias_columns
+from .momentum.dmi import dmi_columns
+from .momentum.kdj import kdj_columns
+from .momentum.macd import macd_columns
+from .momentum.mtm import mtm_columns
+from .momentum.rsi import rsi_columns
+from .momentum.wr import wr_columns
+from .trend.bbi import bbi
+from .trend.dma import dma_columns
+from .trend.expma import expma_columns
+from .trend.ma import ma
+from .trend.trix import trix_columns
+from .volatility.boll import boll_columns
+from .volatility.dpo import dpo_columns
+from .volatility.sar import sar, sar_array
+from .volume.arbr import arbr_columns
+from .volume.obv import obv_columns
+from .volume.vr import vr
+
+MA_WINDOWS = (5, 10, 20, 30, 60)
+
+Inputs = Dict[str, Optional[pd.Series]]
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    name: str
+    columns: Tuple[str, ...]
+    compute: Callable[[Inputs], Dict[str, pd.Series]]
+    requires: Tuple[str, ...] = ()
+    needs_volume: bool = False
+
+
+def _lower(columns: Dict[str, pd.Series], prefix: str = "") -> Dict[str, pd.Series]:
+    return {f"{prefix}{name.lower()}": values for name, values in columns.items()}
+
+
+def _dmi(inputs: Inputs) -> Dict[str, pd.Series]:
+    columns = dmi_columns(inputs["high"], inputs["low"], inputs["price"])
+    return _lower({name.replace("+", "plus").replace("-", "minus"): values for name, values in columns.items()}, "dmi_")
+
+
+def _sar(inputs: Inputs) -> Dict[str, pd.Series]:
+    high, low = inputs["high"], inputs["low"]
+    if isinstance(high, pd.DataFrame):
+        values = sar_array(high.to_numpy(dtype=float), low.to_numpy(dtype=float))
+        return {"sar": pd.DataFrame(values, index=high.index, columns=high.columns)}
+    return {"sar": sar(high, low)}
+
+
+def _ma_spec(window: int) -> IndicatorSpec:
+    return IndicatorSpec(f"ma{window}", (f"ma{window}",), lambda inputs: {f"ma{window}": ma(inputs["price"], window)})
+
+
+REGISTRY: Tuple[IndicatorSpec, ...] = (
+    *(_ma_spec(window) for window in MA_WINDOWS),
+    IndicatorSpec("expma", ("ma1", "ma2", "ma3", "ma4"), lambda i: expma_columns(i["price"])),
+    IndicatorSpec("macd", ("macd_dif", "macd_dea", "macd_macd"), lambda i: _lower(macd_columns(i["price"]), "macd_")),
+    IndicatorSpec("kdj", ("kdj_k", "kdj_d", "kdj_j"), lambda i: _lower(kdj_columns(i["high"], i["low"], i["price"]), "kdj_")),
+    IndicatorSpec("rsi", ("rsi6", "rsi12", "rsi24"), lambda i: rsi_columns(i["price"], periods=(6, 12, 24))),
+    IndicatorSpec("boll", ("boll_upper", "boll_mid", "boll_lower"), lambda i: boll_columns(i["price"]), requires=("ma20",)),
+    IndicatorSpec("wr", ("wr1", "wr2"), lambda i: wr_columns(i["high"], i["low"], i["price"], periods=(10, 6))),
+    IndicatorSpec("dmi", ("dmi_plusdi", "dmi_minusdi", "dmi_adx", "dmi_adxr"), _dmi),
+    IndicatorSpec(
+        "bias", ("bias1", "bias_6", "bias2", "bias_12", "bias3", "bias_24"), lambda i: bias_columns(i["price"])
+    ),
+    IndicatorSpec("asi", ("asi", "asit"), lambda i: _lower(asi_columns(i["open"], i["high"], i["low"], i["price"]))),
+    IndicatorSpec("vr", ("vr",), lambda i: {"vr": vr(i["price"], i["volume"])}, needs_volume=True),
+    IndicatorSpec(
+        "arbr", ("ar", "br"), lambda i: _lower(arbr_columns(i["high"], i["low"], i["open"], i["price"])), needs_volume=True
+    ),
+    IndicatorSpec("obv", ("obv", "maobv"), lambda i: _lower(obv_columns(i["price"], i["volume"])), needs_volume=True),
+    IndicatorSpec("dpo", ("dpo", "madpo"), lambda i: _lower(dpo_columns(i["price"])), requires=("ma20",)),
+    IndicatorSpec("trix", ("trix", "trma"), lambda i: _lower(trix_columns(i["price"]))),
+    IndicatorSpec("dma", ("ddd", "ama"), lambda i: _lower(dma_columns(i["price"])), requires=("ma10",)),
+    IndicatorSpec("bbi", ("bbi",), lambda i: {"bbi": bbi(i["price"])}),
+    IndicatorSpec("mtm", ("mtm", "mtmma"), lambda i: _lower(mtm_columns(i["price"]))),
+    IndicatorSpec("sar", ("sar",), _sar),
+)
+
+_BY_NAME = {spec.name: spec for spec in REGISTRY}
+_BY_COLUMN = {column: spec.name for spec in REGISTRY for column in spec.columns}
+
+
+def all_columns() -> List[str]:
+    return [column for spec in REGISTRY for column in spec.columns]
+
+
+def output_columns(columns: Optional[Iterable[str]] = None, with_volume: bool = True) -> List[str]:
+    """Column order :func:`compute_indicators` produces for a request (without trade_date)."""
+    wanted = None if columns is None else set(columns)
+    return [
+        column
+        for spec in REGISTRY
+        if with_volume or not spec.needs_volume
+        for column in spec.columns
+        if wanted is None or column in wanted
+    ]
+
+
+def resolve(columns: Iterable[str]) -> List[IndicatorSpec]:
+    """Entries needed for ``columns`` plus everything they require, in registry order."""
+    requested = [column for column in columns if column != "trade_date"]
+    unknown = sorted(set(requested) - set(_BY_COLUMN))
+    if unknown:
+        raise ValueError(f"Unknown indicator columns: {', '.join(unknown)}")
+    needed = set()
+    pending = [_BY_COLUMN[column] for column in requested]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(_BY_NAME[name].requires)
+    return [spec for spec in REGISTRY if spec.name in needed]
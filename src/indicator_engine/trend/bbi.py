@@ -8,6 +8,8 @@ from .ma import ma
 
 
 def bbi(series: pd.Series, periods: tuple[int, ...] = (3, 6, 12, 24)) -> pd.Series:
+    """Mean of the moving averages, skipping NaN like ``concat(...).mean(axis=1)``."""
     mas = [ma(series, p) for p in periods]
-    stacked = pd.concat(mas, axis=1)
-    return stacked.mean(axis=1)
+    total = sum(item.fillna(0) for item in mas)
+    count = sum(item.notna().astype(float) for item in mas)
+    return total / count
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 from .ma import ma
 
 
 def dma(series: pd.Series, short: int = 10, long: int = 50, ama_period: int = 10) -> pd.DataFrame:
+    return pd.DataFrame(dma_columns(series, short, long, ama_period))
+
+
+def dma_columns(series, short: int = 10, long: int = 50, ama_period: int = 10) -> Dict[str, pd.Series]:
     ddd = ma(series, short) - ma(series, long)
     ama = ma(ddd, ama_period)
-    return pd.DataFrame({"DDD": ddd, "AMA": ama})
+    return {"DDD": ddd, "AMA": ama}
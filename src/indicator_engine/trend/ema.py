@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import pandas as pd
 
+from ..memo import memoized
+
 
 def ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
+    return memoized("ema", (series,), span, lambda: series.ewm(span=span, adjust=False).mean())
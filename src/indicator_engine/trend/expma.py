@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Dict, Sequence
 
 import pandas as pd
 
@@ -12,7 +12,11 @@ from .ema import ema
 def expma(series: pd.Series, spans: int | Sequence[int] = (5, 10, 20, 60)) -> pd.Series | pd.DataFrame:
     if isinstance(spans, int):
         return ema(series, spans)
+    return pd.DataFrame(expma_columns(series, spans))
+
+
+def expma_columns(series, spans: Sequence[int] = (5, 10, 20, 60)) -> Dict[str, pd.Series]:
     data = {}
     for idx, span in enumerate(spans, start=1):
         data[f"ma{idx}"] = ema(series, span)
-    return pd.DataFrame(data)
+    return data
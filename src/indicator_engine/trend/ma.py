@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import pandas as pd
 
+from ..memo import memoized
+
 
 def ma(series: pd.Series, window: int) -> pd.Series:
-    return series.rolling(window, min_periods=1).mean()
+    return memoized("ma", (series,), window, lambda: series.rolling(window, min_periods=1).mean())
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 from .ema import ema
@@ -9,9 +11,13 @@ from .ma import ma
 
 
 def trix(series: pd.Series, period: int = 12, signal: int = 20) -> pd.DataFrame:
+    return pd.DataFrame(trix_columns(series, period, signal))
+
+
+def trix_columns(series, period: int = 12, signal: int = 20) -> Dict[str, pd.Series]:
     ema1 = ema(series, period)
     ema2 = ema(ema1, period)
     ema3 = ema(ema2, period)
     trix_val = ema3.pct_change() * 100
     trma = ma(trix_val, signal)
-    return pd.DataFrame({"TRIX": trix_val, "TRMA": trma})
+    return {"TRIX": trix_val, "TRMA": trma}
@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from .memo import memoized
+
+
+def lag(series: pd.Series, periods: int = 1) -> pd.Series:
+    """``series.shift(periods)``, shared across indicators within :func:`shared_primitives`."""
+    return memoized("lag", (series,), periods, lambda: series.shift(periods))
+
+
+def delta(series: pd.Series) -> pd.Series:
+    """``series.diff()``, shared across indicators within :func:`shared_primitives`."""
+    return memoized("delta", (series,), None, series.diff)
+
 
 def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-    prev_close = close.shift(1)
-    ranges = pd.concat(
-        [
-            high - low,
-            (high - prev_close).abs(),
-            (low - prev_close).abs(),
-        ],
-        axis=1,
-    )
-    return ranges.max(axis=1)
+    """Largest of the three ranges, skipping NaN (works on Series and date x symbol frames)."""
+
+    def compute():
+        prev_close = lag(close)
+        return np.fmax(np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs())
+
+    return memoized("true_range", (high, low, close), None, compute)
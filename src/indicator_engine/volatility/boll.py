@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
+from ..trend.ma import ma
+
 
 def boll(series: pd.Series, window: int = 20, num_std: float = 2.0) -> pd.DataFrame:
-    mid = series.rolling(window, min_periods=1).mean()
+    return pd.DataFrame(boll_columns(series, window, num_std))
+
+
+def boll_columns(series, window: int = 20, num_std: float = 2.0) -> Dict[str, pd.Series]:
+    mid = ma(series, window)
     std = series.rolling(window, min_periods=1).std(ddof=0)
     upper = mid + num_std * std
     lower = mid - num_std * std
-    return pd.DataFrame({"boll_upper": upper, "boll_mid": mid, "boll_lower": lower})
+    return {"boll_upper": upper, "boll_mid": mid, "boll_lower": lower}
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
 from ..trend.ma import ma
+from ..utils import lag
 
 
 def dpo(series: pd.Series, m1: int = 20, m2: int = 10, m3: int = 6) -> pd.DataFrame:
+    return pd.DataFrame(dpo_columns(series, m1, m2, m3))
+
+
+def dpo_columns(series, m1: int = 20, m2: int = 10, m3: int = 6) -> Dict[str, pd.Series]:
     base = ma(series, m1)
-    dpo_val = series - base.shift(m2)
+    dpo_val = series - lag(base, m2)
     madpo = ma(dpo_val, m3)
-    return pd.DataFrame({"DPO": dpo_val, "MADPO": madpo})
+    return {"DPO": dpo_val, "MADPO": madpo}
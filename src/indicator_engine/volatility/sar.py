@@ -1,11 +1,93 @@
-"""SAR indicator."""
+"""SAR indicator.
+
+:func:`sar_array` is the NumPy kernel: a 1-D array runs the scalar recursion on
+plain floats. A 2-D ``dates x symbols`` panel with at least
+``PANEL_MIN_SYMBOLS`` columns advances every column per step; narrower panels
+run the 1-D recursion per column, which is faster there (each panel step costs
+a fixed set of array operations however few columns it covers; see
+``benchmarks/sar_benchmark.py``). :func:`sar_reference` keeps the original
+per-element ``.iloc`` loop for tests and benchmarks.
+"""
 
 from __future__ import annotations
 
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
+PANEL_MIN_SYMBOLS = 200  # measured crossover is ~150 columns at 250-4000 rows
+
 
 def sar(high: pd.Series, low: pd.Series, step: float = 0.02, max_step: float = 0.2) -> pd.Series:
+    values = sar_array(high.to_numpy(dtype=float), low.to_numpy(dtype=float), step, max_step)
+    return pd.Series(values, index=high.index, dtype=float)
+
+
+def sar_array(high: np.ndarray, low: np.ndarray, step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+    """SAR of a 1-D series or of each column of a 2-D ``dates x symbols`` panel.
+
+    Panel columns start at their first row with both high and low present (NaN
+    before it), so a symbol listed mid-panel matches :func:`sar` on its own bars.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    if high.shape != low.shape:
+        raise ValueError(f"high/low shape mismatch: {high.shape} vs {low.shape}")
+    if high.ndim == 1:
+        return sar_with_state(high, low, step=step, max_step=max_step)[0]
+    if high.ndim == 2:
+        if high.shape[1] >= PANEL_MIN_SYMBOLS:
+            return _sar_panel(high, low, step, max_step)
+        return _sar_columns(high, low, step, max_step)
+    raise ValueError(f"SAR expects 1-D or 2-D arrays, got {high.ndim}-D")
+
+
+def sar_with_state(
+    high: np.ndarray,
+    low: np.ndarray,
+    state: Optional[Dict[str, float]] = None,
+    step: float = 0.02,
+    max_step: float = 0.2,
+) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Same recursion as :func:`sar` on arrays, resumable from a saved state.
+
+    With ``state`` (as returned by a previous call), row 0 is the bar that state
+    was taken at and only rows 1.. are computed.
+    """
+    size = len(high)
+    if size == 0:
+        return np.full(0, np.nan), dict(state or {})
+    highs = np.asarray(high, dtype=float).tolist()
+    lows = np.asarray(low, dtype=float).tolist()
+    values = [0.0] * size
+    if state is None:
+        values[0], ep, af, trend_up = lows[0], highs[0], step, True
+    else:
+        values[0], ep, af, trend_up = state["sar"], state["sar_ep"], state["sar_af"], bool(state["sar_up"])
+    for i in range(1, size):
+        prev_sar = values[i - 1]
+        current = prev_sar + af * (ep - prev_sar)
+        if trend_up:
+            current = min(current, lows[i - 1], lows[i])
+            if highs[i] > ep:
+                ep = highs[i]
+                af = min(af + step, max_step)
+            if lows[i] < current:
+                trend_up, current, ep, af = False, ep, lows[i], step
+        else:
+            current = max(current, highs[i - 1], highs[i])
+            if lows[i] < ep:
+                ep = lows[i]
+                af = min(af + step, max_step)
+            if highs[i] > current:
+                trend_up, current, ep, af = True, ep, highs[i], step
+        values[i] = current
+    result = np.array(values, dtype=float)
+    return result, {"sar": float(result[-1]), "sar_ep": float(ep), "sar_af": float(af), "sar_up": float(trend_up)}
+
+
+def sar_reference(high: pd.Series, low: pd.Series, step: float = 0.02, max_step: float = 0.2) -> pd.Series:
     sar = pd.Series(index=high.index, dtype=float)
     ep = high.iloc[0]
     af = step
@@ -36,3 +118,59 @@ def sar(high: pd.Series, low: pd.Series, step: float = 0.02, max_step: float = 0
                 ep = high.iloc[i]
                 af = step
     return sar
+
+
+def _sar_columns(high: np.ndarray, low: np.ndarray, step: float, max_step: float) -> np.ndarray:
+    """Per-column 1-D recursion from each column's first complete bar; same result as :func:`_sar_panel`."""
+    rows, cols = high.shape
+    out = np.full((rows, cols), np.nan)
+    valid = ~(np.isnan(high) | np.isnan(low))
+    for col in range(cols):
+        if valid[:, col].any():
+            start = int(valid[:, col].argmax())
+            out[start:, col] = sar_with_state(high[start:, col], low[start:, col], step=step, max_step=max_step)[0]
+    return out
+
+
+def _sar_panel(high: np.ndarray, low: np.ndarray, step: float, max_step: float) -> np.ndarray:
+    """Column-parallel SAR; comparisons mirror Python's ``min``/``max`` (NaN never wins)."""
+    rows, cols = high.shape
+    out = np.full((rows, cols), np.nan)
+    valid = ~(np.isnan(high) | np.isnan(low))
+    start = np.where(valid.any(axis=0), valid.argmax(axis=0), rows)
+    ep = np.full(cols, np.nan)
+    af = np.full(cols, step)
+    up = np.ones(cols, dtype=bool)
+    for i in range(rows):
+        begin = start == i
+        if begin.any():
+            out[i, begin] = low[i, begin]
+            ep[begin] = high[i, begin]
+        live = start < i
+        if not live.any():
+            continue
+        prev_sar = out[i - 1]
+        current = prev_sar + af * (ep - prev_sar)
+        floor = np.where(low[i - 1] < current, low[i - 1], current)
+        floor = np.where(low[i] < floor, low[i], floor)
+        ceiling = np.where(high[i - 1] > current, high[i - 1], current)
+        ceiling = np.where(high[i] > ceiling, high[i], ceiling)
+        current = np.where(up, floor, ceiling)
+
+        extend_up = up & (high[i] > ep)
+        extend_down = ~up & (low[i] < ep)
+        next_ep = np.where(extend_up, high[i], np.where(extend_down, low[i], ep))
+        next_af = np.where(extend_up | extend_down, np.minimum(af + step, max_step), af)
+
+        turn_down = up & (low[i] < current)
+        turn_up = ~up & (high[i] > current)
+        turned = turn_down | turn_up
+        current = np.where(turned, next_ep, current)
+        next_ep = np.where(turn_down, low[i], np.where(turn_up, high[i], next_ep))
+        next_af = np.where(turned, step, next_af)
+
+        out[i, live] = current[live]
+        ep = np.where(live, next_ep, ep)
+        af = np.where(live, next_af, af)
+        up = np.where(live, up ^ turned, up)
+    return out
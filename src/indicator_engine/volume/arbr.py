@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import pandas as pd
 
+from ..utils import lag
+
 
 def arbr(high: pd.Series, low: pd.Series, open_: pd.Series, close: pd.Series, period: int = 26) -> pd.DataFrame:
+    return pd.DataFrame(arbr_columns(high, low, open_, close, period))
+
+
+def arbr_columns(high, low, open_, close, period: int = 26) -> Dict[str, pd.Series]:
     ar = (high - open_).rolling(period, min_periods=1).sum() / ((open_ - low).rolling(period, min_periods=1).sum() + 1e-9) * 100
-    br = (high - close.shift(1)).rolling(period, min_periods=1).sum() / ((close.shift(1) - low).rolling(period, min_periods=1).sum() + 1e-9) * 100
-    return pd.DataFrame({"AR": ar, "BR": br})
+    prev_close = lag(close)
+    br = (high - prev_close).rolling(period, min_periods=1).sum() / ((prev_close - low).rolling(period, min_periods=1).sum() + 1e-9) * 100
+    return {"AR": ar, "BR": br}
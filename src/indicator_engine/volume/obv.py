@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import numpy as np
 import pandas as pd
 
+from ..utils import delta
+
 
 def obv(close: pd.Series, volume: pd.Series, ma_period: int = 30) -> pd.DataFrame:
-    direction = np.sign(close.diff()).fillna(0)
-    obv_series = (volume * direction).cumsum()
+    return pd.DataFrame(obv_columns(close, volume, ma_period))
+
+
+def obv_columns(close, volume, ma_period: int = 30) -> Dict[str, pd.Series]:
+    obv_series = signed_volume(close, volume).cumsum()
     maobv = obv_series.rolling(ma_period, min_periods=1).mean()
-    return pd.DataFrame({"OBV": obv_series, "MAOBV": maobv})
+    return {"OBV": obv_series, "MAOBV": maobv}
+
+
+def signed_volume(close: pd.Series, volume: pd.Series) -> pd.Series:
+    """Volume signed by the close-to-close direction; OBV is its running sum."""
+    return volume * np.sign(delta(close)).fillna(0)
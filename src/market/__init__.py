@@ -1,5 +1,16 @@
 """Market analysis utilities."""
 
-from .regime import RegimeParams, detect_regime_states
+from .composite import WEIGHTINGS, capped_weights, composite_index, normalized_closes
+from .regime import RegimeParams, RegimeState, detect_regime_states, regime_with_state, update_regime
 
-__all__ = ["RegimeParams", "detect_regime_states"]
+__all__ = [
+    "WEIGHTINGS",
+    "RegimeParams",
+    "RegimeState",
+    "capped_weights",
+    "composite_index",
+    "detect_regime_states",
+    "normalized_closes",
+    "regime_with_state",
+    "update_regime",
+]
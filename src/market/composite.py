@@ -0,0 +1,81 @@
+"""Composite index built from a ``date x symbol`` panel of closes.
+
+Each symbol's close is normalised to 1.0 on its first bar; the composite level
+on a date is the weighted mean over the symbols that have a bar that day, so
+listings and suspensions do not jump the index. Weighting schemes:
+
+- ``"equal"``: plain mean of the normalised closes;
+- ``"turnover"``: each day weighted by that day's traded amount;
+- ``"capped"``: static weights proportional to ``mean_amount_60`` with no single
+  symbol above ``cap`` (the excess is spread over the others).
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+WEIGHTINGS = ("equal", "turnover", "capped")
+
+
+def normalized_closes(closes: pd.DataFrame) -> pd.DataFrame:
+    """Divide every column by its first valid close; columns without a usable base are dropped."""
+    values = closes.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    first_row = valid.argmax(axis=0)
+    has_bar = valid.any(axis=0)
+    base = values[first_row, np.arange(values.shape[1])]
+    usable = has_bar & (base != 0) & ~np.isnan(base)
+    normalized = values[:, usable] / base[usable]
+    return pd.DataFrame(normalized, index=closes.index, columns=closes.columns[usable])
+
+
+def capped_weights(size: pd.Series, cap: float) -> pd.Series:
+    """Weights proportional to ``size`` with none above ``cap``; equal weights when the cap is infeasible."""
+    size = size.clip(lower=0).fillna(0.0).astype(float)
+    if size.empty:
+        return size
+    if size.sum() <= 0 or cap * len(size) <= 1:
+        return pd.Series(1.0 / len(size), index=size.index)
+    weights = size / size.sum()
+    capped = pd.Series(False, index=size.index)
+    while True:
+        over = (weights > cap + 1e-12) & ~capped
+        if not over.any():
+            return weights
+        capped |= over
+        free = size[~capped]
+        remaining = 1.0 - cap * capped.sum()
+        weights = pd.Series(cap, index=size.index)
+        weights[~capped] = free / free.sum() * remaining if free.sum() > 0 else remaining / len(free)
+
+
+def composite_index(
+    normalized: pd.DataFrame,
+    weights: Optional[pd.DataFrame | pd.Series] = None,
+) -> pd.Series:
+    """Weighted mean across columns per row, renormalised over the symbols present that day.
+
+    ``weights`` is ``None`` (equal), a per-symbol Series (static) or a
+    ``date x symbol`` frame (time-varying). Rows with no weight are dropped.
+    """
+    values = normalized.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    if weights is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows -> NaN
+            level = np.nanmean(values, axis=1) if values.size else np.empty(len(normalized))
+    else:
+        if isinstance(weights, pd.Series):
+            matrix = np.broadcast_to(weights.reindex(normalized.columns).to_numpy(dtype=float), values.shape)
+        else:
+            matrix = weights.reindex(index=normalized.index, columns=normalized.columns).to_numpy(dtype=float)
+        matrix = np.where(present & (matrix > 0), matrix, 0.0)
+        total = matrix.sum(axis=1)
+        weighted = (matrix * np.where(present, values, 0.0)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            level = np.where(total > 0, weighted / total, np.nan)
+    return pd.Series(level, index=normalized.index).dropna()
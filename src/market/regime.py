@@ -1,15 +1,28 @@
-"""Market regime detection based on trend + volatility features."""
+"""Market regime detection based on trend + volatility features.
+
+:func:`regime_with_state` classifies whole benchmark histories and also
+captures, per benchmark, the trailing closes and EMA levels its features carry
+forward. :func:`update_regime` continues from that state over new bars only, so
+the daily run extends ``market_regime.csv`` without recomputing history.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from src.indicator_engine import macd as macd_fn
 from src.indicator_engine import rsi as rsi_fn
+from src.indicator_engine.momentum.rsi import rsi_from_averages
+
+STATE_VERSION = 1
+FEATURE_COLUMNS = ["ma_fast", "ma_slow", "macd_hist", "rsi", "volatility"]
+_EMPTY_BARS = pd.DataFrame({"trade_date": pd.Series(dtype=object), "close": pd.Series(dtype=float)})
 
 
 @dataclass
@@ -28,58 +41,113 @@ class RegimeParams:
     low_vol_threshold: float = 0.01
 
 
+@dataclass
+class BenchmarkState:
+    last_trade_date: str
+    closes: List[float]  # trailing closes covering the longest rolling window
+    seeds: Dict[str, float]  # EMA levels at the last bar: MACD fast/slow/signal, RSI gain/loss
+
+
+@dataclass
+class RegimeState:
+    fingerprint: str  # RegimeParams the state was computed with
+    benchmarks: Dict[str, BenchmarkState]
+    version: int = STATE_VERSION
+    output_size: int = 0  # bytes of the regime file this state was saved with (set by the pipeline)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> Optional["RegimeState"]:
+        try:
+            payload = json.loads(text)
+            benchmarks = {symbol: BenchmarkState(**entry) for symbol, entry in payload.pop("benchmarks").items()}
+            state = cls(benchmarks=benchmarks, **payload)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+        return state if state.version == STATE_VERSION else None
+
+
+def params_fingerprint(params: RegimeParams) -> str:
+    return hashlib.sha1(json.dumps(asdict(params), sort_keys=True).encode()).hexdigest()[:16]
+
+
 def detect_regime_states(
     price_frames: Dict[str, pd.DataFrame],
     params: RegimeParams,
 ) -> pd.DataFrame:
     """Return combined regime states from benchmark price frames."""
-    states: List[pd.DataFrame] = []
+    return regime_with_state(price_frames, params)[0]
+
+
+def regime_with_state(
+    price_frames: Dict[str, pd.DataFrame],
+    params: RegimeParams,
+) -> Tuple[pd.DataFrame, RegimeState]:
+    """:func:`detect_regime_states` plus the state :func:`update_regime` continues from."""
+    labels: Dict[str, pd.DataFrame] = {}
+    states: Dict[str, BenchmarkState] = {}
     for symbol, frame in price_frames.items():
-        features = _prepare_features(frame.copy(), params)
-        classification = _classify(features, params)
-        classification = classification.rename(columns={"regime": symbol})
-        classification.set_index("trade_date", inplace=True)
-        states.append(classification)
+        prices = _prepare_prices(frame)
+        labels[symbol] = _classify(_prepare_features(prices.copy(), params), params)
+        states[symbol] = _benchmark_state(prices, params)
+    return _vote(labels), RegimeState(fingerprint=params_fingerprint(params), benchmarks=states)
 
-    if not states:
-        return pd.DataFrame()
 
-    merged = pd.concat(states, axis=1, join="inner").dropna()
-    merged["bull_count"] = (merged == "bull").sum(axis=1)
-    merged["bear_count"] = (merged == "bear").sum(axis=1)
-    total = len(states)
-
-    def _vote(row) -> str:
-        if row["bull_count"] == total:
-            return "bull"
-        if row["bear_count"] == total:
-            return "bear"
-        if row["bull_count"] > row["bear_count"]:
-            return "bull"
-        if row["bear_count"] > row["bull_count"]:
-            return "bear"
-        return "sideways"
-
-    merged["regime"] = merged.apply(_vote, axis=1)
-    merged = merged[["regime"]]
-    merged.index.name = "date"
-    merged.reset_index(inplace=True)
-    return merged
+def update_regime(
+    last_state: RegimeState,
+    new_bars: Dict[str, pd.DataFrame],
+    params: RegimeParams,
+) -> Optional[Tuple[pd.DataFrame, RegimeState]]:
+    """Regime rows after ``last_state`` and the advanced state.
 
+    ``new_bars`` may include each benchmark's last stated bar; its close must
+    still match, otherwise the series was re-based and ``None`` is returned, as
+    for a state built with other params or benchmarks. Callers then fall back
+    to :func:`regime_with_state`. Only dates up to the earliest latest bar
+    across benchmarks are consumed, so a benchmark lagging by a day is caught
+    up on the next call exactly as a full run would see it.
+    """
+    if last_state.fingerprint != params_fingerprint(params) or set(new_bars) != set(last_state.benchmarks):
+        return None
+    prices: Dict[str, pd.DataFrame] = {}
+    for symbol, frame in new_bars.items():
+        state = last_state.benchmarks[symbol]
+        bars = _prepare_prices(frame) if not frame.empty else _EMPTY_BARS
+        overlap = bars.loc[bars["trade_date"] == state.last_trade_date, "close"]
+        if not overlap.empty and state.closes and not np.isclose(overlap.iloc[-1], state.closes[-1], rtol=1e-9):
+            return None
+        prices[symbol] = bars[bars["trade_date"] > state.last_trade_date]
+
+    cutoff = min(
+        frame["trade_date"].iloc[-1] if not frame.empty else last_state.benchmarks[symbol].last_trade_date
+        for symbol, frame in prices.items()
+    )
+    labels: Dict[str, pd.DataFrame] = {}
+    states: Dict[str, BenchmarkState] = {}
+    for symbol, frame in prices.items():
+        features, states[symbol] = _extend_features(
+            last_state.benchmarks[symbol], frame[frame["trade_date"] <= cutoff], params
+        )
+        labels[symbol] = _classify(features, params)
+    return _vote(labels), RegimeState(fingerprint=last_state.fingerprint, benchmarks=states)
 
-def _prepare_features(df: pd.DataFrame, params: RegimeParams) -> pd.DataFrame:
-    df = df.sort_values("trade_date").copy()
-    df["trade_date"] = df["trade_date"].apply(_normalize_date)
 
-    available_cols = {"close_front_adj", "close", "high", "low"}
-    for column in available_cols:
+def _prepare_prices(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.sort_values("trade_date").copy()
+    df["trade_date"] = _normalize_dates(df["trade_date"])
+    for column in ("close_front_adj", "close", "high", "low"):
         if column in df.columns:
             df[column] = pd.to_numeric(df[column], errors="coerce")
     close_col = "close_front_adj" if "close_front_adj" in df.columns else "close"
     if close_col not in df.columns:
         raise ValueError("Price frame missing close column.")
-    df["close"] = pd.to_numeric(df[close_col], errors="coerce")
+    df["close"] = df[close_col]
+    return df
+
 
+def _prepare_features(df: pd.DataFrame, params: RegimeParams) -> pd.DataFrame:
     df["ma_fast"] = df["close"].rolling(window=params.ma_fast, min_periods=params.ma_fast).mean()
     df["ma_slow"] = df["close"].rolling(window=params.ma_slow, min_periods=params.ma_slow).mean()
 
@@ -92,38 +160,107 @@ def _prepare_features(df: pd.DataFrame, params: RegimeParams) -> pd.DataFrame:
     returns = df["close"].pct_change()
     df["volatility"] = returns.rolling(window=params.vol_period).std()
 
-    df.dropna(subset=["ma_fast", "ma_slow", "macd_hist", "rsi", "volatility"], inplace=True)
+    df.dropna(subset=FEATURE_COLUMNS, inplace=True)
     return df
 
 
+def _benchmark_state(prices: pd.DataFrame, params: RegimeParams) -> BenchmarkState:
+    close = prices["close"]
+    fast = close.ewm(span=params.macd_fast, adjust=False).mean()
+    slow = close.ewm(span=params.macd_slow, adjust=False).mean()
+    dea = (fast - slow).ewm(span=params.macd_signal, adjust=False).mean()
+    change = close.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / params.rsi_period, adjust=False).mean()
+    loss = change.clip(upper=0).ewm(alpha=1 / params.rsi_period, adjust=False).mean()
+    seeds = {"macd_fast": fast, "macd_slow": slow, "macd_dea": dea, "rsi_gain": gain, "rsi_loss": loss}
+    return BenchmarkState(
+        last_trade_date=str(prices["trade_date"].iloc[-1]) if not prices.empty else "",
+        closes=close.tail(_tail_rows(params)).astype(float).tolist(),
+        seeds={key: float(series.iloc[-1]) if not series.empty else float("nan") for key, series in seeds.items()},
+    )
+
+
+def _extend_features(
+    state: BenchmarkState, frame: pd.DataFrame, params: RegimeParams
+) -> Tuple[pd.DataFrame, BenchmarkState]:
+    """Features for ``frame``'s rows given the closes and EMA levels before them."""
+    known = len(state.closes)
+    new_close = frame["close"].to_numpy(dtype=float)
+    closes = pd.Series(np.r_[np.asarray(state.closes, dtype=float), new_close])
+    seeds = dict(state.seeds)
+
+    dif = _continue_ewm(seeds, "macd_fast", new_close, span=params.macd_fast) - _continue_ewm(
+        seeds, "macd_slow", new_close, span=params.macd_slow
+    )
+    dea = _continue_ewm(seeds, "macd_dea", dif, span=params.macd_signal)
+    change = closes.diff().to_numpy()[known:]
+    alpha = 1 / params.rsi_period
+    gain = _continue_ewm(seeds, "rsi_gain", np.clip(change, 0, None), alpha=alpha)
+    loss = -_continue_ewm(seeds, "rsi_loss", np.clip(change, None, 0), alpha=alpha)
+
+    features = pd.DataFrame(
+        {
+            "trade_date": frame["trade_date"].to_numpy(),
+            "ma_fast": closes.rolling(params.ma_fast, min_periods=params.ma_fast).mean().to_numpy()[known:],
+            "ma_slow": closes.rolling(params.ma_slow, min_periods=params.ma_slow).mean().to_numpy()[known:],
+            "macd_hist": (dif - dea) * 2,
+            "rsi": rsi_from_averages(pd.Series(gain), pd.Series(loss)).to_numpy(),
+            "volatility": closes.pct_change().rolling(params.vol_period).std().to_numpy()[known:],
+        }
+    ).dropna(subset=FEATURE_COLUMNS)
+    advanced = BenchmarkState(
+        last_trade_date=str(frame["trade_date"].iloc[-1]) if not frame.empty else state.last_trade_date,
+        closes=closes.tail(_tail_rows(params)).tolist(),
+        seeds=seeds,
+    )
+    return features, advanced
+
+
 def _classify(df: pd.DataFrame, params: RegimeParams) -> pd.DataFrame:
     threshold = params.trend_threshold
-    df["trend_up"] = df["ma_fast"] > df["ma_slow"] * (1 + threshold)
-    df["trend_down"] = df["ma_fast"] < df["ma_slow"] * (1 - threshold)
-
-    df["momentum_up"] = df["macd_hist"] > 0
-    df["momentum_down"] = df["macd_hist"] < 0
+    trend_up = (df["ma_fast"] > df["ma_slow"] * (1 + threshold)).to_numpy()
+    trend_down = (df["ma_fast"] < df["ma_slow"] * (1 - threshold)).to_numpy()
+    momentum_up = (df["macd_hist"] > 0).to_numpy()
+    momentum_down = (df["macd_hist"] < 0).to_numpy()
+    rsi = df["rsi"].to_numpy()
 
-    df["vol_state"] = np.where(
-        df["volatility"] >= params.high_vol_threshold,
-        "high",
-        np.where(df["volatility"] <= params.low_vol_threshold, "low", "mid"),
+    regime = np.select(
+        [trend_up & momentum_up & (rsi >= params.bull_rsi), trend_down & momentum_down & (rsi <= params.bear_rsi)],
+        ["bull", "bear"],
+        "sideways",
     )
+    return pd.DataFrame({"trade_date": df["trade_date"].to_numpy(), "regime": regime.astype(object)})
+
+
+def _vote(labels: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Majority of bull/bear votes per date across benchmarks (dates all of them classified)."""
+    if not labels:
+        return pd.DataFrame()
+    merged = pd.concat(
+        [frame.set_index("trade_date")["regime"].rename(symbol) for symbol, frame in labels.items()],
+        axis=1,
+        join="inner",
+    ).dropna()
+    votes = merged.to_numpy()
+    bull = (votes == "bull").sum(axis=1)
+    bear = (votes == "bear").sum(axis=1)
+    regime = np.select([bull > bear, bear > bull], ["bull", "bear"], "sideways")
+    return pd.DataFrame({"date": merged.index.to_numpy(), "regime": regime.astype(object)})
+
+
+def _continue_ewm(seeds: Dict[str, float], key: str, values, **ewm_kwargs) -> np.ndarray:
+    """EWM (adjust=False) resumed from ``seeds[key]``; prepending the seed replays pandas' recursion."""
+    series = pd.Series(np.r_[seeds[key], np.asarray(values, dtype=float)])
+    result = series.ewm(adjust=False, **ewm_kwargs).mean().to_numpy()[1:]
+    if len(result):
+        seeds[key] = float(result[-1])
+    return result
+
+
+def _tail_rows(params: RegimeParams) -> int:
+    return max(params.ma_fast, params.ma_slow, params.vol_period + 1)
+
 
-    conditions = []
-    for _, row in df.iterrows():
-        if row["trend_up"] and row["momentum_up"] and row["rsi"] >= params.bull_rsi:
-            conditions.append("bull")
-        elif row["trend_down"] and row["momentum_down"] and row["rsi"] <= params.bear_rsi:
-            conditions.append("bear")
-        else:
-            conditions.append("sideways")
-    df["regime"] = conditions
-    return df[["trade_date", "regime"]]
-
-
-def _normalize_date(value) -> str:
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return ""
-    text = str(value).split(".")[0]
-    return text.zfill(8)
+def _normalize_dates(values: pd.Series) -> pd.Series:
+    text = values.astype(str).str.split(".").str[0].str.zfill(8)
+    return text.where(values.notna(), "")
@@ -8,6 +8,7 @@ from .backfill_daily import run_backfill_daily
 from .market_regime import run_market_regime_detection
 from .execution import run_execution_pipeline
 from .auto import run_auto_pipeline
+from .store_migration import run_daily_csv_export, run_daily_store_migration
 
 __all__ = [
     "FullPoolContext",
@@ -20,4 +21,6 @@ __all__ = [
     "run_market_regime_detection",
     "run_execution_pipeline",
     "run_auto_pipeline",
+    "run_daily_store_migration",
+    "run_daily_csv_export",
 ]
@@ -5,38 +5,40 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Optional
 
 import pandas as pd
 
+from src.data_store import DailyStore, MarketDataContext, build_daily_store, load_daily_tail
 from src.logging import get_logger
 
 LOGGER = get_logger("pipelines.active_pool")
+METRIC_COLUMNS = ["trade_date", "amount", "vol", "open", "high", "low", "close"]
+METRIC_WINDOW = 60
 
 
 @dataclass
 class ActivePoolContext:
     universe_path: Path
-    daily_dir: Path
+    daily_store: DailyStore
     master_path: Path
     filters: Dict[str, float]
     refresh_interval_days: int
 
 
 def build_active_pool_context(settings: Dict) -> ActivePoolContext:
-    data_cfg = settings.get("data", {})
     active_cfg = settings.get("active_pool", {})
     full_cfg = settings.get("full_pool", {})
     return ActivePoolContext(
         universe_path=Path(active_cfg.get("universe_path", "data/universe/active_universe.csv")),
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
+        daily_store=build_daily_store(settings),
         master_path=Path(full_cfg.get("master_path", "data/master/etf_master.csv")),
         filters=active_cfg.get("filters", {}),
         refresh_interval_days=active_cfg.get("refresh_interval_days", 7),
     )
 
 
-def run_active_pool_refresh(settings: Dict) -> None:
+def run_active_pool_refresh(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     ctx = build_active_pool_context(settings)
     ctx.universe_path.parent.mkdir(parents=True, exist_ok=True)
     if not ctx.master_path.exists():
@@ -48,11 +50,13 @@ def run_active_pool_refresh(settings: Dict) -> None:
         return
 
     master_df = pd.read_csv(ctx.master_path)
-    metrics = _compute_metrics(master_df, ctx.daily_dir)
+    metrics = _compute_metrics(master_df, ctx.daily_store)
     filtered = _apply_filters(metrics, ctx.filters)
 
     filtered.sort_values("mean_amount_60", ascending=False, inplace=True)
     filtered.to_csv(ctx.universe_path, index=False)
+    if data is not None:
+        data.invalidate_universe()
     LOGGER.info(
         "Active pool refresh complete. Selected %s symbols out of %s.",
         len(filtered),
@@ -67,47 +71,37 @@ def _needs_refresh(path: Path, refresh_interval_days: int) -> bool:
     return (datetime.now() - modified).days >= max(1, refresh_interval_days)
 
 
-def _compute_metrics(master_df: pd.DataFrame, daily_dir: Path) -> pd.DataFrame:
-    rows: List[Dict] = []
-    for _, row in master_df.iterrows():
-        ts_code = row["ts_code"]
-        daily_path = daily_dir / f"{ts_code}.csv"
-        if not daily_path.exists():
-            continue
-        df = pd.read_csv(daily_path).tail(60)
-        if df.empty:
-            continue
-        df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
-        df["vol"] = pd.to_numeric(df["vol"], errors="coerce")
-        df["open"] = pd.to_numeric(df["open"], errors="coerce")
-        df["high"] = pd.to_numeric(df["high"], errors="coerce")
-        df["low"] = pd.to_numeric(df["low"], errors="coerce")
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df = df.dropna(subset=["amount", "vol", "close"])
-        if df.empty:
-            continue
-        amount = df["amount"].clip(lower=0)
-        mean_amount = amount.mean()
-        median_amount = amount.median()
-        floor_amount = amount.quantile(0.1)
-        trade_days_ratio = (df["vol"] > 0).mean()
-        median_range = ((df["high"] - df["low"]) / df["close"]).median()
-        recent_close = df["close"].iloc[-1]
-        listed_days = _calc_listed_days(row.get("list_date"))
-        rows.append(
-            {
-                "ts_code": ts_code,
-                "name": row.get("name", ""),
-                "mean_amount_60": mean_amount,
-                "median_amount_60": median_amount,
-                "floor_amount_60": floor_amount,
-                "trade_days_ratio_60": trade_days_ratio,
-                "median_range_60": median_range,
-                "recent_close": recent_close,
-                "listed_days": listed_days,
-            }
-        )
-    metrics = pd.DataFrame(rows)
+def _compute_metrics(master_df: pd.DataFrame, store: DailyStore) -> pd.DataFrame:
+    """Liquidity/stability metrics over each symbol's last 60 bars, as one grouped reduction."""
+    symbols = [code for code in master_df["ts_code"].drop_duplicates() if store.has_symbol(code)]
+    tails = load_daily_tail(symbols, METRIC_WINDOW, columns=METRIC_COLUMNS, store=store)
+    for column in METRIC_COLUMNS[1:]:
+        tails[column] = pd.to_numeric(tails.get(column), errors="coerce")
+    tails = tails.dropna(subset=["amount", "vol", "close"])
+    tails["amount"] = tails["amount"].clip(lower=0)
+    tails["traded"] = tails["vol"] > 0
+    tails["range"] = (tails["high"] - tails["low"]) / tails["close"]
+
+    grouped = tails.groupby("ts_code", sort=False)
+    stats = pd.DataFrame(
+        {
+            "mean_amount_60": grouped["amount"].mean(),
+            "median_amount_60": grouped["amount"].median(),
+            "floor_amount_60": grouped["amount"].quantile(0.1),
+            "trade_days_ratio_60": grouped["traded"].mean(),
+            "median_range_60": grouped["range"].median(),
+            "recent_close": grouped["close"].last(),
+        }
+    )
+    master = master_df[master_df["ts_code"].isin(stats.index)]
+    metrics = pd.DataFrame(
+        {
+            "ts_code": master["ts_code"].to_numpy(),
+            "name": master["name"].to_numpy() if "name" in master.columns else "",
+        }
+    ).join(stats, on="ts_code")
+    list_dates = master["list_date"] if "list_date" in master.columns else pd.Series(None, index=master.index)
+    metrics["listed_days"] = [_calc_listed_days(value) for value in list_dates]
     LOGGER.info("Computed metrics for %s symbols.", len(metrics))
     return metrics
 
@@ -1,66 +1,180 @@
-"""Auto pipeline: check timestamps and run required refreshes."""
+"""Auto pipeline: run the refresh stages whose inputs changed.
 
-from __future__ import annotations
+Stages form a dependency graph (see :mod:`stage_graph`)::
 
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import Dict, Optional
+    full_pool -> fetch -> active_pool -> indicators -+-> watchlist [-> execution]
+                                      \\-> regime ----/
 
-import pandas as pd
+``full_pool`` and ``fetch`` are clock-driven; every later stage compares
+content fingerprints of its inputs (daily partitions, indicator files, the
+universe, the regime series and its config sections) with those recorded in
+``auto.manifest_path`` after its last successful run. Indicators are recomputed
+only for symbols whose daily partition changed or that the change journal still
+lists (failed symbols are journaled again, so the stage reruns for them), and
+indicators and regime detection run concurrently.
+"""
 
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.data_store import (
+    DailyStore,
+    MarketDataContext,
+    build_change_journal,
+    build_market_data_context,
+    config_digest,
+    latest_trade_date,
+)
 from src.logging import get_logger
 
 from .active_pool import run_active_pool_refresh
 from .backfill_daily import run_backfill_daily
+from .execution import run_execution_pipeline
 from .full_pool import run_full_pool_refresh
 from .indicator_batch import run_indicator_batch
-from .watchlist import run_watchlist_pipeline
 from .market_regime import run_market_regime_detection
+from .stage_graph import Stage, StageManifest, StageRun, run_stage_graph
+from .watchlist import run_watchlist_pipeline
 
 LOGGER = get_logger("pipelines.auto")
 
 
-def run_auto_pipeline(settings: Dict) -> None:
-    """Main entry to orchestrate refreshes based on timestamps."""
-    daily_dir = Path(settings.get("data", {}).get("daily_dir", "data/daily"))
-    indicators_dir = Path(settings.get("data", {}).get("indicators_dir", "data/indicators"))
-    master_path = Path(settings.get("full_pool", {}).get("master_path", "data/master/etf_master.csv"))
-    universe_path = Path(settings.get("active_pool", {}).get("universe_path", "data/universe/active_universe.csv"))
+def run_auto_pipeline(settings: Dict) -> Dict[str, str]:
+    """Main entry: run stale stages; returns each stage's status (ran/fresh/failed/blocked)."""
+    auto_cfg = settings.get("auto", {})
+    data = build_market_data_context(settings)  # each file read once across the stages
+    manifest = StageManifest.load(Path(auto_cfg.get("manifest_path", "data/store/auto_manifest.json")))
 
     LOGGER.info("Starting auto pipeline...")
-
-    if _needs_refresh(master_path, settings.get("full_pool", {}).get("refresh_interval_days", 60)):
-        LOGGER.info("Full-pool data stale; running full-pool refresh.")
-        run_full_pool_refresh(settings)
-    else:
-        LOGGER.info("Full-pool data fresh; skipping.")
-
-    if _needs_daily_refresh(daily_dir):
-        LOGGER.info("Daily cache stale; running backfill/daily refresh.")
-        run_backfill_daily(settings)
-    else:
-        LOGGER.info("Daily cache up to date; skipping backfill.")
-
-    if _needs_refresh(universe_path, settings.get("active_pool", {}).get("refresh_interval_days", 7)):
-        LOGGER.info("Active universe stale; running active-pool refresh.")
-        run_active_pool_refresh(settings)
-    else:
-        LOGGER.info("Active universe fresh; skipping.")
-
-    if _needs_indicator_refresh(indicators_dir, daily_dir):
-        LOGGER.info("Indicator cache stale; recomputing indicators.")
-        run_indicator_batch(settings)
-    else:
-        LOGGER.info("Indicator cache fresh; skipping.")
-
-    LOGGER.info("Generating watchlist for latest data.")
-    run_watchlist_pipeline(settings)
-    LOGGER.info("Updating market regime snapshot.")
+    status = run_stage_graph(build_auto_stages(settings, data, manifest), manifest, int(auto_cfg.get("workers", 2)))
+    LOGGER.info("Auto pipeline complete: %s. Disk reads via shared data context: %s", status, dict(data.reads))
+    return status
+
+
+def build_auto_stages(settings: Dict, data: MarketDataContext, manifest: StageManifest) -> List[Stage]:
+    store = data.daily_store
+    full_cfg = settings.get("full_pool", {})
+    active_cfg = settings.get("active_pool", {})
+    guard_cfg = settings.get("market_guard", {})
+    watch_cfg = settings.get("watchlist", {})
+    master_path = Path(full_cfg.get("master_path", "data/master/etf_master.csv"))
+    watchlist_path = Path(watch_cfg.get("path", "data/watchlists/watchlist_today.csv"))
+
+    def universe() -> List[str]:
+        frame = data.universe()
+        if frame.empty or "ts_code" not in frame.columns:
+            return store.symbols()
+        return [symbol for symbol in frame["ts_code"].dropna().astype(str) if store.has_symbol(symbol)]
+
+    def daily_inputs(symbols: Iterable[str]) -> Dict[str, str]:
+        return {
+            f"daily:{symbol}": manifest.files_digest([store.path_for(symbol), *store.segments(symbol)])
+            for symbol in symbols
+            if store.has_symbol(symbol)
+        }
+
+    def indicator_inputs() -> Dict[str, str]:
+        inputs = daily_inputs(universe())
+        inputs["config:indicators"] = config_digest(settings, "indicator_batch", "strategies")
+        return inputs
+
+    def journaled_indicators() -> List[str]:
+        """Universe symbols the change journal still lists for the indicator batch (e.g. failed last run)."""
+        dirty = build_change_journal(settings).pending("indicators") or {}
+        return [symbol for symbol in universe() if symbol in dirty]
+
+    def run_indicators(plan: StageRun) -> None:
+        if plan.first_run or any(not key.startswith("daily:") for key in plan.changed):
+            run_indicator_batch(settings, incremental=True, data=data)
+            return
+        missing = [symbol for symbol in universe() if not (data.indicators_dir / f"{symbol}.csv").exists()]
+        symbols = sorted(set(plan.changed_with_prefix("daily:")) | set(missing) | set(journaled_indicators()))
+        if symbols:
+            run_indicator_batch(settings, symbols=symbols, incremental=True, data=data)
+
+    def regime_inputs() -> Dict[str, str]:
+        inputs = daily_inputs(guard_cfg.get("benchmarks", []))
+        if not inputs:  # composite fallback: built from the head of the active universe
+            inputs = daily_inputs(universe()[: int(guard_cfg.get("composite_limit", 100))])
+            inputs["file:universe"] = manifest.file_digest(data.universe_path)
+        inputs["config:market_guard"] = config_digest(settings, "market_guard")
+        return inputs
+
+    def watchlist_inputs() -> Dict[str, str]:
+        symbols = universe()
+        inputs = daily_inputs(symbols)
+        inputs.update({f"indicators:{s}": manifest.file_digest(data.indicators_dir / f"{s}.csv") for s in symbols})
+        inputs["file:universe"] = manifest.file_digest(data.universe_path)
+        inputs["file:regime"] = manifest.file_digest(data.regime_path)
+        inputs["config:watchlist"] = config_digest(settings, "watchlist", "strategies", "positions")
+        return inputs
+
+    stages = [
+        Stage(
+            "full_pool",
+            run=lambda plan: run_full_pool_refresh(settings, data=data),
+            outputs=lambda: [master_path],
+            due=lambda: _needs_refresh(master_path, full_cfg.get("refresh_interval_days", 60)),
+        ),
+        Stage(
+            "fetch",  # bars are adjusted as they are stored, so this also covers factor updates
+            run=lambda plan: run_backfill_daily(settings, data=data),
+            after=("full_pool",),
+            inputs=lambda: {"file:master": manifest.file_digest(master_path)},
+            due=lambda: _needs_daily_refresh(store),
+        ),
+        Stage(
+            "active_pool",
+            run=lambda plan: run_active_pool_refresh(settings, data=data),
+            after=("fetch",),
+            inputs=lambda: {
+                "file:master": manifest.file_digest(master_path),
+                "config:active_pool": config_digest(settings, "active_pool"),
+            },
+            outputs=lambda: [data.universe_path],
+            due=lambda: _needs_refresh(data.universe_path, active_cfg.get("refresh_interval_days", 7)),
+        ),
+        Stage(
+            "indicators",
+            run=run_indicators,
+            after=("active_pool",),
+            inputs=indicator_inputs,
+            outputs=lambda: [data.indicators_dir / f"{symbol}.csv" for symbol in universe()],
+            # symbols that failed are journaled again; rerun for them even when no partition changed
+            due=lambda: bool(journaled_indicators()),
+        ),
+        Stage(
+            "regime",
+            run=lambda plan: _run_regime(settings, data),
+            after=("active_pool",),
+            inputs=regime_inputs,
+            outputs=lambda: [data.regime_path],
+        ),
+        Stage(
+            "watchlist",
+            run=lambda plan: run_watchlist_pipeline(settings, data=data),
+            after=("indicators", "regime"),
+            inputs=watchlist_inputs,
+            outputs=lambda: [watchlist_path],
+        ),
+    ]
+    if settings.get("auto", {}).get("execution", False):
+        stages.append(
+            Stage("execution", run=lambda plan: run_execution_pipeline(settings), after=("watchlist",), due=lambda: True)
+        )
+    return stages
+
+
+def _run_regime(settings: Dict, data: MarketDataContext) -> None:
     try:
-        run_market_regime_detection(settings)
-    except Exception as exc:  # pragma: no cover
+        run_market_regime_detection(settings, data=data)
+    except Exception as exc:
+        # re-raised so the stage is marked failed (and retried) and the watchlist waits for it
         LOGGER.warning("Market regime detection failed: %s", exc)
-    LOGGER.info("Auto pipeline complete.")
+        raise
 
 
 def _needs_refresh(path: Path, interval_days: int) -> bool:
@@ -70,50 +184,29 @@ def _needs_refresh(path: Path, interval_days: int) -> bool:
     return (datetime.now() - modified).days >= max(1, interval_days)
 
 
-def _needs_daily_refresh(daily_dir: Path) -> bool:
-    sample = _pick_sample_file(daily_dir)
-    if not sample:
-        return True
-    latest = _latest_trade_date(sample)
+def _needs_daily_refresh(daily_store: DailyStore) -> bool:
+    latest = _latest_store_date(daily_store)
     if latest is None:
         return True
     today = datetime.now().date()
     return (today - latest).days >= 1
 
 
-def _needs_indicator_refresh(indicators_dir: Path, daily_dir: Path) -> bool:
-    sample = _pick_sample_file(indicators_dir, suffix=".csv")
-    if not sample:
-        return True
-    latest_indicator = _latest_trade_date(sample)
-    if latest_indicator is None:
-        return True
-    daily_sample = _pick_sample_file(daily_dir)
-    if not daily_sample:
-        return True
-    latest_daily = _latest_trade_date(daily_sample)
-    if latest_daily is None:
-        return True
-    return latest_indicator < latest_daily
+def _latest_store_date(store: DailyStore) -> Optional[datetime.date]:
+    """Newest trade date across all partitions (read from their metadata sidecars)."""
+    dates = []
+    for symbol in store.symbols():
+        try:
+            value = latest_trade_date(symbol, store=store)
+        except Exception:
+            continue
+        if value is not None:
+            dates.append(value)
+    return _parse_trade_date(max(dates)) if dates else None
 
 
-def _pick_sample_file(directory: Path, suffix: str = ".csv") -> Optional[Path]:
-    if not directory.exists():
-        return None
-    for path in directory.iterdir():
-        if path.is_file() and path.suffix == suffix and path.stat().st_size > 0:
-            return path
-    return None
-
-
-def _latest_trade_date(path: Path) -> Optional[datetime.date]:
-    try:
-        df = pd.read_csv(path, usecols=["trade_date"])
-    except Exception:
-        return None
-    if df.empty:
-        return None
-    raw = str(df.iloc[-1]["trade_date"]).split(".")[0]
+def _parse_trade_date(value) -> Optional[datetime.date]:
+    raw = str(value).split(".")[0]
     raw = raw.zfill(8)
     try:
         return datetime.strptime(raw, "%Y%m%d").date()
@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
-from src.data_fetcher.daily import fetch_daily_bars
+from src.data_fetcher.daily import FetchOptions, build_fetch_options, fetch_daily_bars
+from src.data_fetcher.trade_date import fetch_daily_by_trade_date, fetch_trade_calendar
+from src.data_store import (
+    AdjFactorStore,
+    ChangeJournal,
+    DailyStore,
+    MarketDataContext,
+    append_adjusted_daily,
+    build_adj_store,
+    build_change_journal,
+    build_daily_store,
+    latest_trade_date,
+    save_adj_factors,
+    write_daily,
+)
+from src.data_store.change_journal import WHOLE_HISTORY
 from src.logging import get_logger
+from src.pipelines.backfill_manifest import BackfillManifest
 
 LOGGER = get_logger("pipelines.backfill_daily")
 
@@ -18,32 +35,43 @@ LOGGER = get_logger("pipelines.backfill_daily")
 @dataclass
 class BackfillDailyContext:
     master_path: Path
-    daily_dir: Path
+    daily_store: DailyStore
+    adj_store: AdjFactorStore
     start_date: str
     end_date: str
     batch_size: int
+    fetch_options: FetchOptions
+    manifest_path: Path
+    journal: ChangeJournal  # symbols written by this run, read by indicators/watchlist/backtest
+    incremental_mode: str = "symbol"
+    bulk_max_days: int = 20
 
 
 def build_backfill_context(settings: Dict) -> BackfillDailyContext:
-    data_cfg = settings.get("data", {})
     full_cfg = settings.get("full_pool", {})
     hist_cfg = settings.get("history_backfill", {})
     end_date = hist_cfg.get("end_date") or datetime.now().strftime("%Y%m%d")
     return BackfillDailyContext(
         master_path=Path(full_cfg.get("master_path", "data/master/etf_master.csv")),
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
+        daily_store=build_daily_store(settings),
+        adj_store=build_adj_store(settings),
         start_date=hist_cfg.get("start_date", "20200101"),
         end_date=end_date,
         batch_size=int(hist_cfg.get("batch_size", 20)),
+        fetch_options=build_fetch_options(settings),
+        manifest_path=Path(hist_cfg.get("manifest_path", "data/store/backfill_manifest.json")),
+        journal=build_change_journal(settings),
+        incremental_mode=str(hist_cfg.get("incremental_mode", "symbol")),
+        bulk_max_days=int(hist_cfg.get("bulk_max_days", 20)),
     )
 
 
-def run_backfill_daily(settings: Dict) -> None:
+def run_backfill_daily(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     ctx = build_backfill_context(settings)
     if not ctx.master_path.exists():
         LOGGER.error("Master file %s missing; run --full-pool first.", ctx.master_path)
         return
-    ctx.daily_dir.mkdir(parents=True, exist_ok=True)
+    ctx.daily_store.root.mkdir(parents=True, exist_ok=True)
 
     master_df = pd.read_csv(ctx.master_path)
     if "ts_code" not in master_df.columns:
@@ -54,41 +82,77 @@ def run_backfill_daily(settings: Dict) -> None:
         LOGGER.warning("No symbols found in master file; aborting backfill.")
         return
 
+    start_int, end_int = _coerce_int_date(ctx.start_date), _coerce_int_date(ctx.end_date)
+    if start_int is None or end_int is None:
+        LOGGER.error("Invalid backfill window %s-%s; aborting.", ctx.start_date, ctx.end_date)
+        return
+    manifest = BackfillManifest.load(ctx.manifest_path)
     LOGGER.info(
-        "Starting daily backfill from %s to %s for %s symbols (batch=%s).",
+        "Starting daily backfill from %s to %s for %s symbols (batch=%s, checkpointed=%s).",
         ctx.start_date,
         ctx.end_date,
         len(symbols),
         ctx.batch_size,
+        len(manifest.entries),
     )
 
-    processed = 0
+    processed = skipped = 0
+    total_batches = _calc_total_batches(len(symbols), ctx.batch_size)
     for batch_idx, chunk in enumerate(_chunked(symbols, ctx.batch_size), start=1):
-        frames = fetch_daily_bars(chunk, start=ctx.start_date, end=ctx.end_date)
-        for symbol, frame in frames.items():
-            if frame is None or frame.empty:
-                LOGGER.warning("No daily data fetched for %s; skipping.", symbol)
-                continue
-            out_path = ctx.daily_dir / f"{symbol}.csv"
-            frame.to_csv(out_path, index=False, float_format="%.6f")
-            processed += 1
+        started = time.perf_counter()
+        windows: Dict[Tuple[int, int], List[str]] = {}
+        for symbol in chunk:
+            for gap in manifest.gaps(symbol, start_int, end_int, ctx.daily_store):
+                windows.setdefault(gap, []).append(symbol)
+        pending = {symbol for group in windows.values() for symbol in group}
+        batch_skipped = len(chunk) - len(pending)
+        skipped += batch_skipped
+        rows = 0
+        for (gap_start, gap_end), group in windows.items():
+            full = (gap_start, gap_end) == (start_int, end_int)
+            frames = fetch_daily_bars(group, start=f"{gap_start:08d}", end=f"{gap_end:08d}", options=ctx.fetch_options)
+            for symbol, frame in frames.items():
+                if frame is None or frame.empty:
+                    # failed fetches also come back empty: leave the window unrecorded so a later run retries it
+                    LOGGER.warning("No daily data fetched for %s (%s-%s); skipping.", symbol, gap_start, gap_end)
+                    pending.discard(symbol)
+                    continue
+                if full:
+                    write_daily(symbol, frame, ctx.daily_store)
+                    save_adj_factors(symbol, frame, ctx.adj_store)
+                    ctx.journal.record(symbol, WHOLE_HISTORY)
+                else:
+                    _append(ctx, symbol, frame, [])
+                rows += len(frame)
+        for symbol in sorted(pending):
+            manifest.record(symbol, start_int, end_int, ctx.daily_store)
+        manifest.save()
+        ctx.journal.save()
+        processed += len(pending)
+        elapsed = max(time.perf_counter() - started, 1e-9)
         LOGGER.info(
-            "Processed batch %s/%s (symbols=%s, cumulative=%s).",
+            "Processed batch %s/%s (fetched=%s, skipped=%s, rows=%s) in %.1fs: %.1f symbols/min, %.0f rows/s.",
             batch_idx,
-            _calc_total_batches(len(symbols), ctx.batch_size),
-            len(chunk),
-            processed,
+            total_batches,
+            len(pending),
+            batch_skipped,
+            rows,
+            elapsed,
+            len(pending) * 60 / elapsed,
+            rows / elapsed,
         )
 
-    LOGGER.info("Daily backfill complete. Updated %s symbols.", processed)
+    if data is not None and processed:
+        data.invalidate_daily()
+    LOGGER.info("Daily backfill complete. Updated %s symbols, %s already complete.", processed, skipped)
 
 
-def run_incremental_daily(settings: Dict) -> None:
+def run_incremental_daily(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     ctx = build_backfill_context(settings)
     if not ctx.master_path.exists():
         LOGGER.error("Master file %s missing; run --full-pool first.", ctx.master_path)
         return
-    ctx.daily_dir.mkdir(parents=True, exist_ok=True)
+    ctx.daily_store.root.mkdir(parents=True, exist_ok=True)
 
     master_df = pd.read_csv(ctx.master_path)
     if "ts_code" not in master_df.columns:
@@ -99,49 +163,119 @@ def run_incremental_daily(settings: Dict) -> None:
         LOGGER.warning("No symbols found in master file; aborting incremental update.")
         return
 
-    LOGGER.info("Starting incremental daily update up to %s for %s symbols.", ctx.end_date, len(symbols))
-    updated = 0
+    LOGGER.info(
+        "Starting incremental daily update up to %s for %s symbols (mode=%s).",
+        ctx.end_date,
+        len(symbols),
+        ctx.incremental_mode,
+    )
+    end_int = _coerce_int_date(ctx.end_date)
+    if end_int is None:
+        LOGGER.error("Invalid end date %s; aborting incremental update.", ctx.end_date)
+        return
+    pending: List[Tuple[str, int, bool]] = []
     for symbol in symbols:
-        out_path = ctx.daily_dir / f"{symbol}.csv"
-        last_trade = _get_last_trade_date(out_path)
+        last_trade = _get_last_trade_date(ctx.daily_store, symbol)
         start_int = _coerce_int_date(_next_date(last_trade) if last_trade else ctx.start_date)
-        end_int = _coerce_int_date(ctx.end_date)
-        if start_int is None or end_int is None:
+        if start_int is None:
             LOGGER.warning("Invalid date for %s; skipping.", symbol)
             continue
-        if start_int > end_int:
-            continue
+        if start_int <= end_int:
+            pending.append((symbol, start_int, last_trade is not None))
+
+    updated = 0
+    rebased: List[str] = []
+    if ctx.incremental_mode == "trade_date":
+        bulk_updated, pending = _update_by_trade_date(ctx, pending, end_int, rebased)
+        updated += bulk_updated
+    for symbol, start_int, _ in pending:
         start_date = f"{start_int:08d}"
         end_date = f"{end_int:08d}"
         try:
-            frames = fetch_daily_bars([symbol], start=start_date, end=end_date)
+            frames = fetch_daily_bars([symbol], start=start_date, end=end_date, options=ctx.fetch_options)
             frame = frames.get(symbol)
             if frame is None or frame.empty:
                 continue
-            frame = _normalize_trade_dates(frame)
-            if frame.empty:
-                continue
-            if out_path.exists():
-                try:
-                    existing = pd.read_csv(out_path)
-                except Exception:
-                    existing = pd.DataFrame()
-                existing = _normalize_trade_dates(existing)
-                combined = pd.concat([existing, frame], ignore_index=True)
-            else:
-                combined = frame
-            combined = _normalize_trade_dates(combined)
-            combined = combined.drop_duplicates(subset="trade_date").sort_values("trade_date")
-            combined.to_csv(out_path, index=False, float_format="%.6f")
-            updated += 1
+            if _append(ctx, symbol, frame, rebased):
+                updated += 1
         except Exception:  # pragma: no cover - logged for diagnostics
             LOGGER.exception("Incremental update failed for %s", symbol)
+    ctx.journal.save()
     LOGGER.info("Incremental daily update complete. Updated %s symbols.", updated)
     if updated:
-        LOGGER.info("Recomputing indicators for updated universe.")
-        from src.pipelines.indicator_batch import run_indicator_batch  # local import to avoid cycle
-
-        run_indicator_batch(settings)
+        if data is not None:
+            data.invalidate_daily()
+        LOGGER.info("Appending indicators for updated universe.")
+        from src.pipelines.indicator_batch import invalidate_indicator_state, run_indicator_batch  # avoid cycle
+
+        if rebased:
+            LOGGER.info("Adjustment factor changed for %s symbols; rebuilding their indicators.", len(rebased))
+            invalidate_indicator_state(settings, rebased)
+        run_indicator_batch(settings, incremental=True, data=data, changed_only=True)
+
+
+def _append(ctx: BackfillDailyContext, symbol: str, frame: pd.DataFrame, rebased: List[str]) -> bool:
+    """Append fetched bars on the stored factor base; journals the change and records re-based symbols."""
+    result = append_adjusted_daily(symbol, frame, ctx.daily_store, ctx.adj_store)
+    if result.rebased:
+        rebased.append(symbol)
+    # incoming rows win over stored ones, so the first incoming date bounds what changed
+    ctx.journal.record(symbol, WHOLE_HISTORY if result.rebased else _first_trade_date(frame))
+    return bool(result.added or result.rebased)
+
+
+def _first_trade_date(frame: pd.DataFrame) -> int:
+    dates = [date for date in frame["trade_date"].map(_coerce_int_date) if date is not None]
+    return min(dates) if dates else WHOLE_HISTORY
+
+
+def _update_by_trade_date(
+    ctx: BackfillDailyContext,
+    pending: List[Tuple[str, int, bool]],
+    end_int: int,
+    rebased: List[str],
+) -> Tuple[int, List[Tuple[str, int, bool]]]:
+    """Catch stored symbols up with whole-market calls per missing trade date.
+
+    Symbols without stored history, or more than ``bulk_max_days`` trading days
+    behind, are returned for the per-symbol path.
+    """
+    stored = [item for item in pending if item[2]]
+    if not stored:
+        return 0, pending
+    earliest = min(start for _, start, _ in stored)
+    try:
+        days = fetch_trade_calendar(f"{earliest:08d}", f"{end_int:08d}", options=ctx.fetch_options)
+        calendar = [int(day) for day in days]
+    except Exception:  # pragma: no cover - logged for diagnostics
+        LOGGER.exception("Trade calendar unavailable; falling back to per-symbol updates.")
+        return 0, pending
+
+    bulk: Dict[str, int] = {}
+    fallback: List[Tuple[str, int, bool]] = []
+    for symbol, start_int, has_history in pending:
+        missing = sum(1 for day in calendar if day >= start_int)
+        if has_history and missing <= ctx.bulk_max_days:
+            if missing:
+                bulk[symbol] = start_int
+        else:
+            fallback.append((symbol, start_int, has_history))
+    if not bulk:
+        return 0, fallback
+
+    days = [f"{day:08d}" for day in calendar if day >= min(bulk.values())]
+    LOGGER.info("Fetching %s trade dates market-wide for %s symbols.", len(days), len(bulk))
+    frames = fetch_daily_by_trade_date(days, symbols=bulk, options=ctx.fetch_options)
+    updated = 0
+    for symbol, frame in frames.items():
+        dates = frame["trade_date"].map(_coerce_int_date)
+        frame = frame[dates >= bulk[symbol]]
+        try:
+            if not frame.empty and _append(ctx, symbol, frame, rebased):
+                updated += 1
+        except Exception:  # pragma: no cover - logged for diagnostics
+            LOGGER.exception("Incremental update failed for %s", symbol)
+    return updated, fallback
 
 
 def _chunked(items: Sequence[str], size: int) -> Iterable[List[str]]:
@@ -155,16 +289,12 @@ def _calc_total_batches(total: int, size: int) -> int:
     return (total + size - 1) // size
 
 
-def _get_last_trade_date(path: Path) -> str | None:
-    if not path.exists():
-        return None
+def _get_last_trade_date(store: DailyStore, symbol: str) -> str | None:
     try:
-        df = pd.read_csv(path, usecols=["trade_date"])
+        latest = latest_trade_date(symbol, store=store)
     except Exception:
         return None
-    if df.empty:
-        return None
-    return str(df["trade_date"].iloc[-1])
+    return f"{latest:08d}" if latest is not None else None
 
 
 def _next_date(value: str | None) -> str:
@@ -192,19 +322,3 @@ def _coerce_int_date(value: str | int | None) -> int | None:
     except ValueError:
         return None
 
-
-def _normalize_trade_dates(frame: pd.DataFrame) -> pd.DataFrame:
-    """Ensure trade_date is zero-padded string so sorting/dedup never mixes dtypes."""
-    if "trade_date" not in frame.columns or frame.empty:
-        return frame
-    normalized = frame["trade_date"].apply(_format_trade_date)
-    result = frame.copy()
-    result["trade_date"] = normalized
-    return result.dropna(subset=["trade_date"])
-
-
-def _format_trade_date(value) -> str | None:
-    coerced = _coerce_int_date(value)
-    if coerced is None:
-        return None
-    return f"{coerced:08d}"
@@ -0,0 +1,118 @@
+"""Checkpoint manifest that makes the daily backfill resumable.
+
+Per symbol it records the requested date range already fetched, the row count
+in that range and a checksum of the raw bars. A later run skips symbols whose
+stored bars still match and only requests the parts of its window outside the
+recorded range; a checksum mismatch (file rewritten or damaged) refetches the
+whole window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from src.data_store import DailyStore, load_symbol_daily
+
+MANIFEST_VERSION = 1
+CHECKSUM_COLUMNS = ("trade_date", "open", "high", "low", "close", "vol")
+
+
+@dataclass
+class SymbolCheckpoint:
+    start: int
+    end: int
+    rows: int
+    checksum: str
+    updated_at: str
+
+
+@dataclass
+class BackfillManifest:
+    path: Path
+    entries: Dict[str, SymbolCheckpoint]
+
+    @classmethod
+    def load(cls, path: Path) -> "BackfillManifest":
+        if not path.exists():
+            return cls(path, {})
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if payload.get("version") != MANIFEST_VERSION:
+                return cls(path, {})
+            entries = {symbol: SymbolCheckpoint(**entry) for symbol, entry in payload["symbols"].items()}
+        except (ValueError, TypeError, KeyError):
+            return cls(path, {})
+        return cls(path, entries)
+
+    def save(self) -> None:
+        """Write via temp file + rename so an interrupted run never leaves a torn manifest."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": MANIFEST_VERSION,
+            "symbols": {symbol: asdict(entry) for symbol, entry in sorted(self.entries.items())},
+        }
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def gaps(self, symbol: str, start: int, end: int, store: DailyStore) -> List[Tuple[int, int]]:
+        """Sub-ranges of ``[start, end]`` still to fetch for ``symbol`` (empty when complete)."""
+        if not self.is_valid(symbol, store):
+            return [(start, end)]
+        entry = self.entries[symbol]
+        gaps = []
+        if start < entry.start:
+            gaps.append((start, _shift_day(entry.start, -1)))
+        if end > entry.end:
+            gaps.append((_shift_day(entry.end, 1), end))
+        return gaps
+
+    def is_valid(self, symbol: str, store: DailyStore) -> bool:
+        """Stored bars in the recorded range still match the checkpoint."""
+        entry = self.entries.get(symbol)
+        if entry is None:
+            return False
+        return range_checksum(store, symbol, entry.start, entry.end) == (entry.rows, entry.checksum)
+
+    def record(self, symbol: str, start: int, end: int, store: DailyStore) -> SymbolCheckpoint:
+        entry = self.entries.get(symbol)
+        if entry is not None:
+            start, end = min(start, entry.start), max(end, entry.end)
+        rows, checksum = range_checksum(store, symbol, start, end)
+        self.entries[symbol] = SymbolCheckpoint(
+            start=start,
+            end=end,
+            rows=rows,
+            checksum=checksum,
+            updated_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        return self.entries[symbol]
+
+
+def range_checksum(store: DailyStore, symbol: str, start: int, end: int) -> Tuple[int, str]:
+    """Row count and SHA-1 of the raw bars in ``[start, end]``.
+
+    Only unadjusted columns are hashed, so factor re-basing and appends past
+    ``end`` leave the checkpoint valid.
+    """
+    available = set(store.columns(symbol))
+    columns = [column for column in CHECKSUM_COLUMNS if column in available]
+    if "trade_date" not in columns:
+        return 0, ""
+    df = load_symbol_daily(symbol, start=start, end=end, columns=columns, store=store)
+    digest = hashlib.sha1(",".join(columns).encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    return len(df), digest.hexdigest()
+
+
+def _shift_day(value: int, days: int) -> int:
+    shifted = datetime.strptime(f"{value:08d}", "%Y%m%d") + timedelta(days=days)
+    return int(shifted.strftime("%Y%m%d"))
@@ -5,11 +5,23 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional
 
 import pandas as pd
 
-from src.data_fetcher import build_chinadata_client, fetch_daily_bars
+from src.data_fetcher import FetchOptions, build_chinadata_client, build_fetch_options, fetch_daily_bars
+from src.data_store import (
+    AdjFactorStore,
+    ChangeJournal,
+    DailyStore,
+    MarketDataContext,
+    build_adj_store,
+    build_change_journal,
+    build_daily_store,
+    save_adj_factors,
+    write_daily,
+)
+from src.data_store.change_journal import WHOLE_HISTORY
 from src.logging import get_logger
 
 LOGGER = get_logger("pipelines.full_pool")
@@ -21,13 +33,15 @@ class FullPoolContext:
     refresh_interval_days: int
     master_path: Path
     universe_path: Path
-    daily_dir: Path
+    daily_store: DailyStore
+    adj_store: AdjFactorStore
     chunk_size: int
+    fetch_options: FetchOptions
+    journal: ChangeJournal  # every rewritten history is journaled for indicators/watchlist/backtest
 
 
 def build_full_pool_context(settings: Dict) -> FullPoolContext:
     """Derive filesystem paths and parameters from settings.json."""
-    data_cfg = settings.get("data", {})
     full_cfg = settings.get("full_pool", {})
     active_cfg = settings.get("active_pool", {})
 
@@ -36,17 +50,20 @@ def build_full_pool_context(settings: Dict) -> FullPoolContext:
         refresh_interval_days=full_cfg.get("refresh_interval_days", 60),
         master_path=Path(full_cfg.get("master_path", "data/master/etf_master.csv")),
         universe_path=Path(active_cfg.get("universe_path", "data/universe/active_universe.csv")),
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
+        daily_store=build_daily_store(settings),
+        adj_store=build_adj_store(settings),
         chunk_size=max(1, full_cfg.get("chunk_size", 25)),
+        fetch_options=build_fetch_options(settings),
+        journal=build_change_journal(settings),
     )
 
 
-def run_full_pool_refresh(settings: Dict) -> None:
+def run_full_pool_refresh(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     """Entry for the 'every 60–90 days' full-pool refresh."""
     ctx = build_full_pool_context(settings)
     ctx.master_path.parent.mkdir(parents=True, exist_ok=True)
     ctx.universe_path.parent.mkdir(parents=True, exist_ok=True)
-    ctx.daily_dir.mkdir(parents=True, exist_ok=True)
+    ctx.daily_store.root.mkdir(parents=True, exist_ok=True)
 
     if not _needs_refresh(ctx.master_path, ctx.refresh_interval_days):
         LOGGER.info(
@@ -75,6 +92,8 @@ def run_full_pool_refresh(settings: Dict) -> None:
         start_date=cutoff.strftime("%Y%m%d"),
         end_date=datetime.utcnow().strftime("%Y%m%d"),
     )
+    if data is not None:
+        data.invalidate_daily()
     duration = datetime.utcnow() - start_time
     LOGGER.info(
         "Full-pool refresh complete. Master rows=%s, daily files=%s, duration=%s.",
@@ -139,19 +158,21 @@ def _cache_daily_history(
             start=start_date,
             end=end_date,
             client=client,
+            options=ctx.fetch_options,
         )
         for symbol, frame in frames.items():
-            _write_daily_file(ctx.daily_dir, symbol, frame)
+            _write_daily_file(ctx, symbol, frame)
+        ctx.journal.save()
         if index % 10 == 0 or index == total_chunks:
             LOGGER.info("Processed chunk %s/%s (symbols=%s)", index, total_chunks, len(chunk))
 
 
-def _write_daily_file(daily_dir: Path, symbol: str, frame: pd.DataFrame) -> None:
-    path = daily_dir / f"{symbol}.csv"
+def _write_daily_file(ctx: FullPoolContext, symbol: str, frame: pd.DataFrame) -> None:
     if frame.empty:
-        path.write_text("ts_code,trade_date,open,high,low,close,vol,amount\n", encoding="utf-8")
         return
-    frame.to_csv(path, index=False)
+    write_daily(symbol, frame, ctx.daily_store)
+    ctx.journal.record(symbol, WHOLE_HISTORY)
+    save_adj_factors(symbol, frame, ctx.adj_store)
 
 
 def _chunk(items: Iterable[str], size: int) -> Iterable[List[str]]:
@@ -2,79 +2,282 @@
 
 from __future__ import annotations
 
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
 import pandas as pd
 
-from src.indicator_engine.calculator import compute_indicators
+from src.data_store import (
+    DailyStore,
+    MarketDataContext,
+    acknowledge_changes,
+    append_atomic,
+    atomic_path,
+    build_change_journal,
+    build_daily_store,
+    load_symbol_daily,
+)
+from src.data_store.change_journal import WHOLE_HISTORY
+from src.indicator_engine.incremental import IndicatorState, compute_with_state, update_indicators
 from src.logging import get_logger
+from src.signal_generator.requirements import required_indicator_columns
 
 LOGGER = get_logger("pipelines.indicators")
+JOURNAL_CONSUMER = "indicators"
 
 
 @dataclass
 class IndicatorContext:
-    daily_dir: Path
+    daily_store: DailyStore
     indicators_dir: Path
+    state_dir: Path
+    workers: int = 1
+    columns: Optional[List[str]] = None  # None = every registry column
 
 
-def build_indicator_context(settings: Dict) -> IndicatorContext:
+@dataclass
+class SymbolResult:
+    """Outcome of one symbol's indicator run, reported back from the worker."""
+
+    symbol: str
+    status: str  # "ok" | "appended" | "fresh" | "empty" | "error"
+    elapsed: float
+    rows: int = 0
+    error: Optional[str] = None
+
+
+def build_indicator_context(settings: Dict, workers: Optional[int] = None) -> IndicatorContext:
     data_cfg = settings.get("data", {})
+    batch_cfg = settings.get("indicator_batch", {})
+    indicators_dir = Path(data_cfg.get("indicators_dir", "data/indicators"))
     return IndicatorContext(
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
-        indicators_dir=Path(data_cfg.get("indicators_dir", "data/indicators")),
+        daily_store=build_daily_store(settings),
+        indicators_dir=indicators_dir,
+        state_dir=Path(data_cfg.get("indicator_state_dir", indicators_dir / "_state")),
+        workers=max(1, int(workers or batch_cfg.get("workers", 1))),
+        columns=_resolve_columns(settings, batch_cfg.get("columns", "all")),
     )
 
 
-def run_indicator_batch(settings: Dict, symbols: Optional[Iterable[str]] = None) -> None:
-    ctx = build_indicator_context(settings)
+def _resolve_columns(settings: Dict, option) -> Optional[List[str]]:
+    """``"all"`` -> every column, ``"required"`` -> what the signal layer reads, or an explicit list."""
+    if option in (None, "all"):
+        return None
+    if option == "required":
+        return required_indicator_columns(settings)
+    if isinstance(option, str):
+        raise ValueError(f"Unsupported indicator_batch.columns value: {option!r}")
+    return list(option)
+
+
+def run_indicator_batch(
+    settings: Dict,
+    symbols: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    incremental: bool = False,
+    data: Optional[MarketDataContext] = None,
+    changed_only: bool = False,
+) -> None:
+    """Compute indicator files; ``incremental`` appends only bars newer than the saved state.
+
+    With ``data``, the universe and (single-process runs) the daily bars come
+    from the shared context, and rewritten indicator files are invalidated in it.
+
+    The change journal narrows the work: ``changed_only`` limits targets to
+    symbols written since the last batch (plus those without an indicator
+    file), and incremental runs recompute a symbol in full when a journaled
+    change reaches back into rows its saved state already covers.
+    """
+    ctx = build_indicator_context(settings, workers)
     ctx.indicators_dir.mkdir(parents=True, exist_ok=True)
-    if not ctx.daily_dir.exists():
-        LOGGER.error("Daily directory %s missing. Run full-pool refresh first.", ctx.daily_dir)
+    ctx.state_dir.mkdir(parents=True, exist_ok=True)
+    if not ctx.daily_store.exists():
+        LOGGER.error("Daily store %s missing. Run full-pool refresh first.", ctx.daily_store.root)
         return
 
-    symbol_filter = _resolve_symbol_filter(settings, symbols)
+    symbol_filter = _resolve_symbol_filter(settings, symbols, data)
     if symbol_filter:
-        files = []
+        targets = []
         missing = []
-        for symbol in symbol_filter:
-            path = ctx.daily_dir / f"{symbol}.csv"
-            if path.exists():
-                files.append(path)
+        for symbol in sorted(symbol_filter):
+            if ctx.daily_store.has_symbol(symbol):
+                targets.append(symbol)
             else:
                 missing.append(symbol)
         if missing:
             LOGGER.warning("Skipping %s symbols missing daily cache: %s", len(missing), ", ".join(sorted(missing)[:10]))
     else:
-        files = sorted(ctx.daily_dir.glob("*.csv"))
+        targets = ctx.daily_store.symbols()
 
-    if not files:
-        LOGGER.warning("No daily files found for indicator batch.")
+    journal = build_change_journal(settings)
+    dirty = journal.pending(JOURNAL_CONSUMER)
+    if changed_only and dirty is not None:
+        targets = [s for s in targets if s in dirty or not (ctx.indicators_dir / f"{s}.csv").exists()]
+        LOGGER.info("Change journal: %s symbols changed since the last batch.", len(targets))
+    if not targets:
+        if changed_only and dirty is not None:
+            acknowledge_changes(journal.path, JOURNAL_CONSUMER, journal.head)
+        else:
+            LOGGER.warning("No daily data found for indicator batch.")
         return
+    if incremental and dirty:
+        _drop_rewritten_state(ctx, {symbol: dirty[symbol] for symbol in targets if symbol in dirty})
 
-    total = len(files)
-    LOGGER.info("Starting indicator batch for %s symbols.", total)
+    total = len(targets)
+    mode = "incremental" if incremental else "full"
+    LOGGER.info("Starting %s indicator batch for %s symbols (workers=%s).", mode, total, ctx.workers)
+    if ctx.columns is not None:
+        LOGGER.info("Computing %s selected indicator columns: %s", len(ctx.columns), ", ".join(ctx.columns))
 
+    started = time.perf_counter()
     processed = 0
-    for idx, file_path in enumerate(files, start=1):
-        symbol = file_path.stem
-        df = pd.read_csv(file_path)
-        indicators = compute_indicators(df)
-        if indicators.empty:
-            LOGGER.warning("No data for %s; skipping.", symbol)
-            continue
-        out_path = ctx.indicators_dir / f"{symbol}.csv"
-        indicators.to_csv(out_path, index=False, float_format="%.6f")
-        processed += 1
+    appended = 0
+    failed: List[str] = []
+    slowest: Optional[SymbolResult] = None
+    # results arrive in target order regardless of worker count, so logs stay deterministic
+    for idx, result in enumerate(_iter_results(ctx, targets, incremental, data), start=1):
+        LOGGER.debug("%s: %s in %.3fs (%s rows).", result.symbol, result.status, result.elapsed, result.rows)
+        if result.status == "error":
+            failed.append(result.symbol)
+            LOGGER.error("Indicator computation failed for %s: %s", result.symbol, result.error)
+        elif result.status == "empty":
+            LOGGER.warning("No data for %s; skipping.", result.symbol)
+        elif result.status == "appended":
+            appended += 1
+        elif result.status == "ok":
+            processed += 1
+        if slowest is None or result.elapsed > slowest.elapsed:
+            slowest = result
         if idx % 50 == 0:
             LOGGER.info("Processed %s/%s files.", idx, total)
 
-    LOGGER.info("Indicator batch complete. Generated %s files.", processed)
+    if data is not None:
+        data.invalidate_indicators(targets)
+    # advance the cursor once every journaled symbol was attempted; failures are journaled again
+    if symbols is None or (dirty is not None and set(dirty) <= set(targets)):
+        retry = {symbol: (dirty or {}).get(symbol, WHOLE_HISTORY) for symbol in failed}
+        acknowledge_changes(journal.path, JOURNAL_CONSUMER, journal.head, retry)
+    if failed:
+        LOGGER.warning("Indicator batch failed for %s symbols: %s", len(failed), ", ".join(failed[:10]))
+    if slowest is not None:
+        LOGGER.info("Slowest symbol %s took %.3fs.", slowest.symbol, slowest.elapsed)
+    LOGGER.info(
+        "Indicator batch complete. Generated %s files, appended to %s in %.1fs.",
+        processed,
+        appended,
+        time.perf_counter() - started,
+    )
+
+
+def _iter_results(
+    ctx: IndicatorContext, targets: List[str], incremental: bool, data: Optional[MarketDataContext] = None
+) -> Iterator[SymbolResult]:
+    worker = partial(
+        _process_symbol,
+        str(ctx.daily_store.root),
+        str(ctx.indicators_dir),
+        str(ctx.state_dir),
+        incremental,
+        ctx.columns,
+    )
+    if ctx.workers <= 1 or len(targets) <= 1:
+        # serial runs share bars with later stages; worker processes read the store themselves
+        yield from map(partial(worker, loader=data.daily if data is not None else None), targets)
+        return
+    workers = min(ctx.workers, len(targets))
+    chunksize = max(1, len(targets) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(worker, targets, chunksize=chunksize)
+
+
+def _process_symbol(
+    store_root: str,
+    output_dir: str,
+    state_dir: str,
+    incremental: bool,
+    columns: Optional[List[str]],
+    symbol: str,
+    loader: Optional[Callable[[str], pd.DataFrame]] = None,
+) -> SymbolResult:
+    """Compute and write one symbol's indicators; never raises so one bad file can't stop the batch."""
+    started = time.perf_counter()
+    out_path = Path(output_dir) / f"{symbol}.csv"
+    state_path = Path(state_dir) / f"{symbol}.json"
+    try:
+        df = loader(symbol) if loader is not None else load_symbol_daily(symbol, store=DailyStore(Path(store_root)))
+        if incremental:
+            added = _append_new_rows(df, out_path, state_path, columns)
+            if added is not None:
+                status = "appended" if added else "fresh"
+                return SymbolResult(symbol, status, time.perf_counter() - started, rows=added)
+        indicators, state = compute_with_state(df, columns)
+        if indicators.empty:
+            return SymbolResult(symbol, "empty", time.perf_counter() - started)
+        with atomic_path(out_path) as tmp:
+            indicators.to_csv(tmp, index=False, float_format="%.6f")
+        _write_state(state, out_path, state_path)
+        return SymbolResult(symbol, "ok", time.perf_counter() - started, rows=len(indicators))
+    except Exception as exc:  # isolate per-symbol failures
+        return SymbolResult(symbol, "error", time.perf_counter() - started, error=f"{type(exc).__name__}: {exc}")
+
+
+def _append_new_rows(
+    df: pd.DataFrame, out_path: Path, state_path: Path, columns: Optional[List[str]] = None
+) -> Optional[int]:
+    """Append rows past the saved state; ``None`` means a full recompute is required."""
+    if not out_path.exists() or not state_path.exists():
+        return None
+    state = IndicatorState.from_json(state_path.read_text(encoding="utf-8"))
+    if state is None or state.output_size != out_path.stat().st_size:
+        return None
+    update = update_indicators(df, state, columns)
+    if update is None:
+        return None
+    rows, new_state = update
+    if not rows.empty:
+        # a crash before the state is saved fails the size check next run
+        append_atomic(out_path, rows.to_csv(header=False, index=False, float_format="%.6f").encode("utf-8"))
+        _write_state(new_state, out_path, state_path)
+    return len(rows)
+
+
+def _write_state(state: Optional[IndicatorState], out_path: Path, state_path: Path) -> None:
+    if state is None:
+        return
+    state.output_size = out_path.stat().st_size
+    with atomic_path(state_path) as tmp:
+        tmp.write_text(state.to_json(), encoding="utf-8")
+
+
+def _drop_rewritten_state(ctx: IndicatorContext, dirty: Dict[str, int]) -> None:
+    """Drop saved state whose rows reach the first changed trade date; appending cannot fix those rows."""
+    rewritten = []
+    for symbol, since in dirty.items():
+        state_path = ctx.state_dir / f"{symbol}.json"
+        if not state_path.exists():
+            continue
+        state = IndicatorState.from_json(state_path.read_text(encoding="utf-8"))
+        if state is None or state.last_trade_date >= since:
+            state_path.unlink(missing_ok=True)
+            rewritten.append(symbol)
+    if rewritten:
+        LOGGER.info("Recomputing %s symbols with changed history: %s", len(rewritten), ", ".join(rewritten[:10]))
+
+
+def invalidate_indicator_state(settings: Dict, symbols: Iterable[str]) -> None:
+    """Drop saved state so the next incremental run recomputes these symbols in full."""
+    ctx = build_indicator_context(settings)
+    for symbol in symbols:
+        (ctx.state_dir / f"{symbol}.json").unlink(missing_ok=True)
 
 
-def _resolve_symbol_filter(settings: Dict, symbols: Optional[Iterable[str]]) -> Optional[set[str]]:
+def _resolve_symbol_filter(
+    settings: Dict, symbols: Optional[Iterable[str]], data: Optional[MarketDataContext] = None
+) -> Optional[set[str]]:
     if symbols:
         return set(symbols)
     active_cfg = settings.get("active_pool", {})
@@ -83,7 +286,7 @@ def _resolve_symbol_filter(settings: Dict, symbols: Optional[Iterable[str]]) ->
         LOGGER.warning("Active universe file %s not found; using all daily files.", universe_path)
         return None
     try:
-        df = pd.read_csv(universe_path)
+        df = data.universe() if data is not None else pd.read_csv(universe_path)
     except Exception as exc:  # pragma: no cover
         LOGGER.warning("Failed to read %s: %s; using all symbols.", universe_path, exc)
         return None
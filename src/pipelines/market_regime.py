@@ -8,26 +8,46 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 
+from src.data_store import (
+    DailyStore,
+    MarketDataContext,
+    append_atomic,
+    atomic_path,
+    build_daily_store,
+    build_market_data_context,
+)
 from src.logging import get_logger
-from src.market import RegimeParams, detect_regime_states
+from src.market import (
+    WEIGHTINGS,
+    RegimeParams,
+    RegimeState,
+    capped_weights,
+    composite_index,
+    normalized_closes,
+    regime_with_state,
+    update_regime,
+)
 from src.pipelines.active_pool import build_active_pool_context
 
 LOGGER = get_logger("pipelines.market_regime")
+BENCHMARK_COLUMNS = ["trade_date", "close_front_adj", "close", "high", "low"]
 
 
 @dataclass
 class MarketRegimeContext:
-    daily_dir: Path
+    daily_store: DailyStore
     active_universe_path: Path
     output_path: Path
     segments_path: Path
+    state_path: Path
     benchmarks: List[str]
     composite_limit: int
+    composite_weighting: str
+    composite_weight_cap: float
     regime_params: RegimeParams
 
 
 def build_market_regime_context(settings: Dict) -> MarketRegimeContext:
-    data_cfg = settings.get("data", {})
     active_ctx = build_active_pool_context(settings)
     guard_cfg = settings.get("market_guard", {})
 
@@ -48,37 +68,50 @@ def build_market_regime_context(settings: Dict) -> MarketRegimeContext:
 
     benchmarks = guard_cfg.get("benchmarks", [])
     return MarketRegimeContext(
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
+        daily_store=build_daily_store(settings),
         active_universe_path=active_ctx.universe_path,
         output_path=Path(guard_cfg.get("output_path", "data/backtests/market_regime.csv")),
         segments_path=Path(guard_cfg.get("segments_path", "data/backtests/market_regime_segments.csv")),
+        state_path=Path(guard_cfg.get("state_path", "data/backtests/market_regime_state.json")),
         benchmarks=benchmarks,
         composite_limit=int(guard_cfg.get("composite_limit", 100)),
+        composite_weighting=str(guard_cfg.get("composite_weighting", "equal")),
+        composite_weight_cap=float(guard_cfg.get("composite_weight_cap", 0.1)),
         regime_params=params,
     )
 
 
-def run_market_regime_detection(settings: Dict) -> None:
+def run_market_regime_detection(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     ctx = build_market_regime_context(settings)
+    data = data or build_market_data_context(settings)
     ctx.output_path.parent.mkdir(parents=True, exist_ok=True)
     ctx.segments_path.parent.mkdir(parents=True, exist_ok=True)
+    if _extend_regime(ctx, data):
+        return
 
-    price_frames = _load_benchmark_frames(ctx.daily_dir, ctx.benchmarks)
+    price_frames = _load_benchmark_frames(ctx.daily_store, ctx.benchmarks, data)
+    from_benchmarks = bool(price_frames)
     if not price_frames:
         LOGGER.warning("No benchmark price data found; building composite index from active universe.")
-        composite_frame = _build_composite_frame(ctx)
+        composite_frame = _build_composite_frame(ctx, data)
         if composite_frame is None or composite_frame.empty:
             LOGGER.error("Unable to build composite index; aborting regime detection.")
             return
         price_frames = {"composite": composite_frame}
 
-    regime_df = detect_regime_states(price_frames, ctx.regime_params)
+    regime_df, state = regime_with_state(price_frames, ctx.regime_params)
     if regime_df.empty:
         LOGGER.error("Failed to classify regimes.")
         return
 
-    regime_df.to_csv(ctx.output_path, index=False)
+    with atomic_path(ctx.output_path) as tmp:
+        regime_df.to_csv(tmp, index=False)
+    data.invalidate_regime()
     _write_segments(regime_df, ctx.segments_path)
+    if from_benchmarks:
+        _save_state(ctx.state_path, state, ctx.output_path)
+    else:
+        ctx.state_path.unlink(missing_ok=True)  # the composite is rebuilt from a changing universe
     summary = regime_df["regime"].value_counts().to_dict()
     LOGGER.info(
         "Market regime detection complete (%s rows). Distribution: %s",
@@ -87,62 +120,111 @@ def run_market_regime_detection(settings: Dict) -> None:
     )
 
 
-def _load_benchmark_frames(daily_dir: Path, benchmarks: List[str]) -> Dict[str, pd.DataFrame]:
+def _extend_regime(ctx: MarketRegimeContext, data: MarketDataContext) -> bool:
+    """Append regimes for bars newer than the saved state; False when a full run is needed."""
+    state = _load_state(ctx.state_path)
+    available = [symbol for symbol in ctx.benchmarks if ctx.daily_store.has_symbol(symbol)]
+    if state is None or not ctx.output_path.exists() or set(available) != set(state.benchmarks):
+        return False
+    if state.output_size != ctx.output_path.stat().st_size:
+        LOGGER.info("Regime file %s changed since the saved state; recomputing history.", ctx.output_path)
+        return False
+    start = min(int(entry.last_trade_date) for entry in state.benchmarks.values())
+    new_bars = {
+        symbol: _since(data.daily(symbol, columns=BENCHMARK_COLUMNS), start) for symbol in available
+    }
+    result = update_regime(state, new_bars, ctx.regime_params)
+    if result is None:
+        LOGGER.info("Regime state no longer matches the benchmarks; recomputing history.")
+        return False
+    rows, state = result
+    if not rows.empty:
+        # a crash before the state is saved fails the size check next run
+        append_atomic(ctx.output_path, rows.to_csv(header=False, index=False).encode("utf-8"))
+        data.invalidate_regime()
+        _write_segments(pd.read_csv(ctx.output_path, dtype={"date": str}), ctx.segments_path)
+    _save_state(ctx.state_path, state, ctx.output_path)
+    LOGGER.info("Market regime extended by %s rows from saved state.", len(rows))
+    return True
+
+
+def _since(frame: pd.DataFrame, start: int) -> pd.DataFrame:
+    return frame[frame["trade_date"] >= start].reset_index(drop=True)
+
+
+def _load_state(path: Path) -> Optional[RegimeState]:
+    if not path.exists():
+        return None
+    return RegimeState.from_json(path.read_text(encoding="utf-8"))
+
+
+def _save_state(path: Path, state: RegimeState, output_path: Path) -> None:
+    state.output_size = output_path.stat().st_size
+    with atomic_path(path) as tmp:
+        tmp.write_text(state.to_json(), encoding="utf-8")
+
+
+def _load_benchmark_frames(
+    store: DailyStore, benchmarks: List[str], data: MarketDataContext
+) -> Dict[str, pd.DataFrame]:
     frames: Dict[str, pd.DataFrame] = {}
     for symbol in benchmarks:
-        path = daily_dir / f"{symbol}.csv"
-        if not path.exists():
-            LOGGER.warning("Benchmark %s missing daily data at %s", symbol, path)
+        if not store.has_symbol(symbol):
+            LOGGER.warning("Benchmark %s missing daily data in %s", symbol, store.root)
             continue
-        df = pd.read_csv(path)
+        df = data.daily(symbol, columns=BENCHMARK_COLUMNS)
         if df.empty:
             continue
-        frames[symbol] = df[["trade_date", "close_front_adj", "close", "high", "low"]].copy()
+        frames[symbol] = df
     return frames
 
 
-def _build_composite_frame(ctx: MarketRegimeContext) -> Optional[pd.DataFrame]:
-    if not ctx.active_universe_path.exists():
+def _build_composite_frame(ctx: MarketRegimeContext, data: MarketDataContext) -> Optional[pd.DataFrame]:
+    universe = data.universe()
+    if universe.empty or "ts_code" not in universe.columns:
         return None
-    universe = pd.read_csv(ctx.active_universe_path)
-    symbols = universe["ts_code"].dropna().astype(str).tolist()
-    symbols = symbols[: ctx.composite_limit]
+    universe = universe.dropna(subset=["ts_code"]).head(ctx.composite_limit)
+    symbols = universe["ts_code"].astype(str).tolist()
     if not symbols:
         return None
 
-    totals: Dict[str, float] = {}
-    counts: Dict[str, int] = {}
+    weighting = ctx.composite_weighting
+    if weighting not in WEIGHTINGS:
+        LOGGER.warning("Unknown composite_weighting %r; using equal weights.", weighting)
+        weighting = "equal"
+    if weighting == "capped" and "mean_amount_60" not in universe.columns:
+        LOGGER.warning("Active universe lacks mean_amount_60; using equal weights.")
+        weighting = "equal"
+
+    columns = ["trade_date", "close_front_adj", "close"] + (["amount"] if weighting == "turnover" else [])
+    frames = []
     for symbol in symbols:
-        path = ctx.daily_dir / f"{symbol}.csv"
-        if not path.exists():
+        if not ctx.daily_store.has_symbol(symbol):
             continue
-        df = pd.read_csv(path, usecols=["trade_date", "close_front_adj", "close"])
+        df = data.daily(symbol, columns=columns)
         df["close"] = df["close_front_adj"].fillna(df["close"])
-        df.dropna(subset=["close"], inplace=True)
-        if df.empty:
-            continue
-        base = df["close"].iloc[0]
-        if not base:
-            continue
-        df["normalized"] = df["close"] / base
-        for _, row in df.iterrows():
-            date = _normalize_date(row["trade_date"])
-            val = float(row["normalized"])
-            totals[date] = totals.get(date, 0.0) + val
-            counts[date] = counts.get(date, 0) + 1
-
-    if not totals:
+        df = df.dropna(subset=["close"])
+        if not df.empty:
+            frames.append(df.assign(ts_code=symbol))
+    if not frames:
         return None
 
-    rows = []
-    for date, total in totals.items():
-        count = counts.get(date, 0)
-        if count == 0:
-            continue
-        rows.append({"trade_date": date, "close": total / count})
-
-    composite = pd.DataFrame(rows).sort_values("trade_date")
-    return composite
+    bars = pd.concat(frames, ignore_index=True)
+    bars["trade_date"] = bars["trade_date"].map(_normalize_date)
+    normalized = normalized_closes(bars.pivot_table(index="trade_date", columns="ts_code", values="close", aggfunc="last"))
+    if weighting == "turnover":
+        weights = bars.pivot_table(index="trade_date", columns="ts_code", values="amount", aggfunc="last")
+    elif weighting == "capped":
+        size = universe.set_index(universe["ts_code"].astype(str))["mean_amount_60"].reindex(normalized.columns)
+        weights = capped_weights(size, ctx.composite_weight_cap)
+    else:
+        weights = None
+
+    level = composite_index(normalized, weights)
+    if level.empty:
+        return None
+    LOGGER.info("Composite index from %s symbols (%s weighting).", normalized.shape[1], weighting)
+    return pd.DataFrame({"trade_date": level.index, "close": level.to_numpy()})
 
 
 def _write_segments(regime_df: pd.DataFrame, segments_path: Path) -> None:
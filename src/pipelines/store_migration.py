@@ -0,0 +1,36 @@
+"""One-shot migration of data/daily CSVs into the columnar store (and CSV export)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from src.data_store import build_change_journal, build_daily_store, export_csv_dir, migrate_csv_dir
+from src.logging import get_logger
+
+LOGGER = get_logger("pipelines.store_migration")
+
+
+def run_daily_store_migration(settings: Dict, overwrite: bool = False) -> None:
+    csv_dir = Path(settings.get("data", {}).get("daily_dir", "data/daily"))
+    store = build_daily_store(settings)
+    if not csv_dir.exists():
+        LOGGER.error("Daily CSV directory %s missing; nothing to migrate.", csv_dir)
+        return
+    LOGGER.info("Migrating daily CSVs from %s into %s.", csv_dir, store.root)
+    journal = build_change_journal(settings)
+    migrated, failed = migrate_csv_dir(csv_dir, store, overwrite=overwrite, journal=journal)
+    journal.save()
+    if failed:
+        LOGGER.warning("Failed to migrate %s files: %s", len(failed), ", ".join(failed[:10]))
+    LOGGER.info("Daily store migration complete. Migrated %s symbols.", migrated)
+
+
+def run_daily_csv_export(settings: Dict, symbols: Optional[Iterable[str]] = None) -> None:
+    csv_dir = Path(settings.get("data", {}).get("daily_dir", "data/daily"))
+    store = build_daily_store(settings)
+    if not store.exists():
+        LOGGER.error("Daily store %s missing; run --migrate-daily-store or --backfill-daily first.", store.root)
+        return
+    exported = export_csv_dir(store, csv_dir, symbols)
+    LOGGER.info("Exported %s daily files to %s.", exported, csv_dir)
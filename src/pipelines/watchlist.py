@@ -9,6 +9,17 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 
+from src.data_store import (
+    DailyStore,
+    MarketDataContext,
+    SymbolCache,
+    acknowledge_changes,
+    build_change_journal,
+    build_daily_store,
+    build_market_data_context,
+    config_digest,
+    file_stamp,
+)
 from src.logging import get_logger
 from src.signal_generator import strategy_router
 from src.signal_generator.universe_filters import configure as configure_filters
@@ -17,18 +28,20 @@ from src.strategy_etf.position_manager import recommend_weight
 from src.utils.watch_pool import POOL_COLUMNS, days_between, infer_today, load_watch_pool, save_watch_pool
 
 LOGGER = get_logger("pipelines.watchlist")
+JOURNAL_CONSUMER = "watchlist"
 
 
 @dataclass
 class WatchlistContext:
     indicators_dir: Path
-    daily_dir: Path
+    daily_store: DailyStore
     universe_path: Path
     output_path: Path
     position_config: Dict
     top_n: Optional[int]
     pool_path: Path
     pool_expiry_days: int
+    cache_path: Path  # per-symbol candidate rows reused for symbols the change journal marks clean
 
 
 def build_watchlist_context(settings: Dict) -> WatchlistContext:
@@ -37,18 +50,20 @@ def build_watchlist_context(settings: Dict) -> WatchlistContext:
     pool_cfg = watch_cfg.get("pool", {})
     return WatchlistContext(
         indicators_dir=Path(data_cfg.get("indicators_dir", "data/indicators")),
-        daily_dir=Path(data_cfg.get("daily_dir", "data/daily")),
+        daily_store=build_daily_store(settings),
         universe_path=Path(settings.get("active_pool", {}).get("universe_path", "data/universe/active_universe.csv")),
         output_path=Path(watch_cfg.get("path", "data/watchlists/watchlist_today.csv")),
         position_config=settings.get("positions", {}),
         top_n=watch_cfg.get("top_n"),
         pool_path=Path(pool_cfg.get("path", "data/watchlists/watch_pool.csv")),
         pool_expiry_days=int(pool_cfg.get("expiry_days", 10)),
+        cache_path=Path(watch_cfg.get("cache_path", "data/watchlists/_candidates.json")),
     )
 
 
-def run_watchlist_pipeline(settings: Dict) -> None:
+def run_watchlist_pipeline(settings: Dict, data: Optional[MarketDataContext] = None) -> None:
     ctx = build_watchlist_context(settings)
+    data = data or build_market_data_context(settings)
     if not ctx.indicators_dir.exists():
         LOGGER.error("Indicators directory %s missing. Run --indicators first.", ctx.indicators_dir)
         return
@@ -56,46 +71,41 @@ def run_watchlist_pipeline(settings: Dict) -> None:
         LOGGER.error("Active universe file %s missing. Run --active-pool first.", ctx.universe_path)
         return
 
-    symbols = _load_active_symbols(ctx.universe_path)
+    symbols = _load_active_symbols(data.universe(), ctx.universe_path)
     if not symbols:
         LOGGER.warning("No active symbols found; watchlist not generated.")
         return
 
     strategy_router.configure_strategies(settings)
     configure_filters(settings.get("watchlist", {}).get("filters", {}))
-    current_regime = strategy_router.get_current_regime()
+    current_regime = strategy_router.get_current_regime(data.regime())
+    journal = build_change_journal(settings)
+    dirty = journal.pending(JOURNAL_CONSUMER)
+    fingerprint = config_digest(settings, "watchlist", "strategies", "positions", "indicator_batch")
+    cache = SymbolCache.load(ctx.cache_path, f"{fingerprint}:{current_regime}")
     candidates: List[Dict] = []
+    reused = 0
     for symbol in symbols:
-        ind_file = ctx.indicators_dir / f"{symbol}.csv"
-        if not ind_file.exists():
-            LOGGER.warning("Indicator file %s missing; skipping.", ind_file)
-            continue
-        daily_file = ctx.daily_dir / f"{symbol}.csv"
-        if not daily_file.exists():
-            LOGGER.warning("Daily file %s missing; skipping.", daily_file)
-            continue
-
-        ind_df = pd.read_csv(ind_file)
-        daily_df = pd.read_csv(daily_file)
-
-        filter_result = evaluate_filter(current_regime, symbol, ind_df, daily_df)
-        if not filter_result:
-            continue
-
-        row = strategy_router.generate_latest_signal(symbol, ind_df, daily_df, regime=current_regime)
-        if not row:
-            continue
-
-        trade_date = row.pop("trade_date", None)
-        row["date"] = _format_trade_date(trade_date)
-        row["tier"] = filter_result.tier
-        row["env_score"] = filter_result.score
-        for key, value in (filter_result.metadata or {}).items():
-            if value is not None:
-                row[key] = value
-        row["env_regime"] = current_regime
-        row["position_weight"] = recommend_weight(ctx.position_config, current_regime, filter_result.tier)
-        candidates.append(row)
+        # daily writes are journaled; indicator files are stamped since that stage may run after us
+        stamp = file_stamp(ctx.indicators_dir / f"{symbol}.csv")
+        cached = cache.get(symbol, stamp) if dirty is not None and symbol not in dirty else None
+        if cached is not None:
+            reused += 1
+            row = cached["row"]
+        else:
+            ind_df = data.indicators(symbol)
+            if ind_df is None:
+                LOGGER.warning("Indicator file %s missing; skipping.", ctx.indicators_dir / f"{symbol}.csv")
+                continue
+            if not ctx.daily_store.has_symbol(symbol):
+                LOGGER.warning("Daily data for %s missing from %s; skipping.", symbol, ctx.daily_store.root)
+                continue
+            row = _evaluate_symbol(ctx, symbol, ind_df, data.daily(symbol), current_regime)
+            cache.put(symbol, stamp, row=row)
+        if row:
+            candidates.append(dict(row))
+    if dirty is not None:
+        LOGGER.info("Change journal: reused %s of %s symbols; %s changed.", reused, len(symbols), len(dirty))
 
     ctx.output_path.parent.mkdir(parents=True, exist_ok=True)
     ctx.pool_path.parent.mkdir(parents=True, exist_ok=True)
@@ -114,10 +124,36 @@ def run_watchlist_pipeline(settings: Dict) -> None:
         ctx.output_path.write_text("ts_code,date,close,pct_chg,score\n", encoding="utf-8")
 
     _update_watch_pool(ctx, candidates)
+    cache.retain(symbols)
+    cache.save()
+    acknowledge_changes(journal.path, JOURNAL_CONSUMER, journal.head)
+
+
+def _evaluate_symbol(
+    ctx: WatchlistContext, symbol: str, ind_df: pd.DataFrame, daily_df: pd.DataFrame, current_regime: str
+) -> Optional[Dict]:
+    """Candidate row for ``symbol`` or ``None`` when it fails the filters or has no signal."""
+    filter_result = evaluate_filter(current_regime, symbol, ind_df, daily_df)
+    if not filter_result:
+        return None
+
+    row = strategy_router.generate_latest_signal(symbol, ind_df, daily_df, regime=current_regime)
+    if not row:
+        return None
+
+    trade_date = row.pop("trade_date", None)
+    row["date"] = _format_trade_date(trade_date)
+    row["tier"] = filter_result.tier
+    row["env_score"] = filter_result.score
+    for key, value in (filter_result.metadata or {}).items():
+        if value is not None:
+            row[key] = value
+    row["env_regime"] = current_regime
+    row["position_weight"] = recommend_weight(ctx.position_config, current_regime, filter_result.tier)
+    return row
 
 
-def _load_active_symbols(path: Path) -> List[str]:
-    df = pd.read_csv(path)
+def _load_active_symbols(df: pd.DataFrame, path: Path) -> List[str]:
     if "ts_code" not in df.columns:
         LOGGER.warning("Active universe file %s lacks ts_code column.", path)
         return []
@@ -0,0 +1,58 @@
+"""Indicator columns the signal layer actually reads.
+
+Strategies, universe filters and sell rules each declare ``required_columns()``;
+:func:`required_indicator_columns` unions them so the indicator batch can
+compute just those (see ``indicator_batch.columns``).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from src.indicator_engine.registry import all_columns
+
+from . import sell_rules
+from .strategies.bear import oversold_rebound
+from .strategies.bull import trend_follow
+from .strategies.sideways import range_trade
+from .universe_filters import bear as bear_filter
+from .universe_filters import bull as bull_filter
+from .universe_filters import sideways as sideways_filter
+
+CONSUMERS = (
+    trend_follow,
+    range_trade,
+    oversold_rebound,
+    bull_filter,
+    sideways_filter,
+    bear_filter,
+    sell_rules,
+)
+
+
+def required_indicator_columns(settings: Optional[Dict] = None) -> List[str]:
+    """Union of declared columns in registry order; MA keys come from ``settings`` when given.
+
+    Only reads ``settings``: the strategies and filters keep their active config.
+    """
+    needed = set()
+    for columns in _declared_columns(settings):
+        needed.update(columns)
+    known = all_columns()
+    # unknown keys (e.g. a misconfigured MA name) are kept so the registry reports them
+    return [column for column in known if column in needed] + sorted(needed - set(known))
+
+
+def _declared_columns(settings: Optional[Dict]) -> List[Tuple[str, ...]]:
+    if settings is None:
+        return [consumer.required_columns() for consumer in CONSUMERS]
+    strat_cfg = settings.get("strategies", {})
+    filters_cfg = settings.get("watchlist", {}).get("filters", {})
+    configured = {
+        trend_follow: trend_follow.build_config(strat_cfg.get("bull", {})),
+        bull_filter: bull_filter.build_config(filters_cfg.get("bull", {})),
+    }
+    return [
+        consumer.required_columns(configured[consumer]) if consumer in configured else consumer.required_columns()
+        for consumer in CONSUMERS
+    ]
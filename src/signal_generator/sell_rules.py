@@ -3,11 +3,36 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
+INDICATOR_COLUMNS = (
+    "ma5",
+    "ma10",
+    "ma20",
+    "macd_dif",
+    "macd_dea",
+    "rsi6",
+    "kdj_k",
+    "kdj_d",
+    "obv",
+    "maobv",
+    "boll_upper",
+    "boll_mid",
+    "boll_lower",
+    "wr1",
+    "wr2",
+)
+
+
+def required_columns() -> Tuple[str, ...]:
+    """Indicator columns read by the sell checks."""
+    return INDICATOR_COLUMNS
+
+
 @dataclass
 class SellSignalResult:
     triggered: bool
@@ -18,6 +43,34 @@ class SellSignalResult:
     reason: str
 
 
+@dataclass
+class SellSignalPath:
+    """Sell evaluation for every row of a trade path (see :func:`evaluate_sell_path`)."""
+
+    core_hits: Dict[str, np.ndarray]  # rule -> bool per row, in the scalar evaluators' order
+    aux_hits: Dict[str, np.ndarray]
+    score: np.ndarray
+    action: np.ndarray  # "exit" | "reduce" | "hold" per row
+
+    @property
+    def triggered(self) -> np.ndarray:
+        return self.action != "hold"
+
+    def result(self, idx: int) -> SellSignalResult:
+        """The :class:`SellSignalResult` :func:`evaluate_sell_signal` returns for row ``idx``."""
+        core_hits = {key: bool(hits[idx]) for key, hits in self.core_hits.items()}
+        aux_hits = {key: bool(hits[idx]) for key, hits in self.aux_hits.items()}
+        action = str(self.action[idx])
+        return SellSignalResult(
+            triggered=action != "hold",
+            action=action,
+            core_hits=core_hits,
+            aux_hits=aux_hits,
+            score=float(self.score[idx]),
+            reason=_determine_reason(action, core_hits, aux_hits),
+        )
+
+
 def prepare_daily_features(daily_df: pd.DataFrame) -> pd.DataFrame:
     """Compute rolling stats (vol MA5, ATR, ATR MA5) used for sell checks."""
     if daily_df.empty:
@@ -27,22 +80,16 @@ def prepare_daily_features(daily_df: pd.DataFrame) -> pd.DataFrame:
     for col in numeric_cols:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
-    df["trade_date"] = df["trade_date"].astype(str)
+    df["trade_date"] = df["trade_date"].map(str)
     df["vol_ma5"] = df["vol"].rolling(window=5, min_periods=5).mean()
 
-    high = pd.to_numeric(df["high"], errors="coerce")
-    low = pd.to_numeric(df["low"], errors="coerce")
-    close = pd.to_numeric(df["close"], errors="coerce")
-    prev_close = close.shift(1)
-    tr = pd.concat(
-        [
-            (high - low).abs(),
-            (high - prev_close).abs(),
-            (low - prev_close).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
-    df["atr"] = tr.rolling(window=14, min_periods=1).mean()
+    high = pd.to_numeric(df["high"], errors="coerce").to_numpy(dtype=float)
+    low = pd.to_numeric(df["low"], errors="coerce").to_numpy(dtype=float)
+    close = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float)
+    prev_close = _shift(close)
+    # true range; fmax skips NaN like DataFrame.max(axis=1)
+    tr = np.fmax.reduce([np.abs(high - low), np.abs(high - prev_close), np.abs(low - prev_close)])
+    df["atr"] = pd.Series(tr, index=df.index).rolling(window=14, min_periods=1).mean()
     df["atr_ma5"] = df["atr"].rolling(window=5, min_periods=5).mean()
     return df
 
@@ -380,6 +427,163 @@ def _evaluate_generic_sell(
     )
 
 
+def prepare_sell_path(indicators: pd.DataFrame, daily_features: pd.DataFrame) -> pd.DataFrame:
+    """Align sell inputs by row of ``indicators`` (sorted, ``trade_date`` as YYYYMMDD strings).
+
+    Each row carries the day's indicator values, its :func:`prepare_daily_features`
+    row matched on ``trade_date`` (``has_daily`` is False when there is none),
+    the resolved price and the previous row's values as ``prev_*`` columns,
+    i.e. everything :func:`evaluate_sell_signal` reads for that index.
+    """
+    if daily_features.empty or "trade_date" not in daily_features.columns:
+        daily = pd.DataFrame(index=pd.Index([], dtype=object))
+    else:
+        daily = daily_features.drop_duplicates("trade_date", keep="last").set_index("trade_date")
+    aligned = daily.reindex(indicators["trade_date"].to_numpy())
+    has_daily = indicators["trade_date"].isin(daily.index).to_numpy()
+
+    def column(frame: pd.DataFrame, name: str) -> np.ndarray:
+        if name not in frame.columns:
+            return np.full(len(frame), np.nan)
+        return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float)
+
+    price = column(aligned, "close_front_adj")
+    price = np.where(np.isnan(price), column(aligned, "close"), price)
+    price = np.where(np.isnan(price), column(indicators, "close"), price)
+    path = {"has_daily": has_daily, "price": price}
+    for name in ("pct_chg", "vol", "vol_ma5", "atr", "atr_ma5"):
+        path[name] = column(aligned, name)
+    for name in INDICATOR_COLUMNS:
+        path[name] = column(indicators, name)
+    prev = {f"prev_{name}": _shift(values) for name, values in path.items() if name not in ("has_daily", "pct_chg")}
+    return pd.DataFrame({**path, **prev}, index=indicators.index)
+
+
+def evaluate_sell_path(path: pd.DataFrame, regime: str = "bull") -> SellSignalPath:
+    """:func:`evaluate_sell_signal` for every row of :func:`prepare_sell_path` at once.
+
+    Row ``i`` equals the scalar result for index ``i`` under ``regime`` given
+    that row has daily data (``has_daily``); row 0 has no previous row.
+    """
+    regime_key = (regime or "bull").lower()
+    evaluate, exit_score, reduce_score = _PATH_RULES.get(regime_key, _PATH_RULES["generic"])
+    values = {name: path[name].to_numpy() for name in path.columns}
+    core_hits, aux_hits = evaluate(values)
+    core_score = np.sum(list(core_hits.values()), axis=0)
+    score = core_score + 0.5 * np.sum(list(aux_hits.values()), axis=0)
+    action = np.select(
+        [(core_score >= 1) | (score >= exit_score), score >= reduce_score], ["exit", "reduce"], "hold"
+    ).astype(object)
+    return SellSignalPath(core_hits=core_hits, aux_hits=aux_hits, score=score, action=action)
+
+
+def _bull_sell_path(v: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    price, prev_price, pct_chg = v["price"], v["prev_price"], v["pct_chg"]
+    core_hits = {
+        "ma20_break": _valid(price, prev_price, v["ma20"], v["prev_ma20"])
+        & (price < v["ma20"])
+        & (prev_price < v["prev_ma20"]),
+        "macd_dead_below_zero": _valid(v["macd_dif"], v["macd_dea"], v["prev_macd_dif"], v["prev_macd_dea"])
+        & (v["prev_macd_dif"] >= v["prev_macd_dea"])
+        & (v["macd_dif"] < v["macd_dea"])
+        & (v["macd_dif"] < 0),
+        "volume_dump": _valid(pct_chg, v["vol"], v["vol_ma5"])
+        & (pct_chg <= -2.0)
+        & (v["vol_ma5"] > 0)
+        & (v["vol"] >= v["vol_ma5"] * 1.5),
+    }
+    aux_hits = {
+        "rsi_down": _valid(v["rsi6"], v["prev_rsi6"]) & (v["rsi6"] < v["prev_rsi6"]),
+        "kdj_hot": _valid(v["kdj_k"]) & (v["kdj_k"] >= 90),
+        "obv_exit": _valid(v["obv"], v["maobv"]) & (v["obv"] < v["maobv"]),
+        "boll_mid_break": _valid(price, v["boll_mid"]) & (price < v["boll_mid"]),
+        "atr_spike_up": _valid(v["atr"], v["atr_ma5"], pct_chg)
+        & (v["atr_ma5"] > 0)
+        & (v["atr"] > v["atr_ma5"] * 1.2)
+        & (pct_chg >= 0),
+    }
+    return core_hits, aux_hits
+
+
+def _sideways_sell_path(v: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    price, pct_chg, kdj_k = v["price"], v["pct_chg"], v["kdj_k"]
+    core_hits = {
+        "upper_touch": _valid(price, v["boll_upper"]) & (price >= v["boll_upper"] * 0.995),
+        "range_break": _valid(price, v["boll_lower"]) & (price <= v["boll_lower"] * 0.985),
+        "drop_spike": _valid(pct_chg, v["vol"], v["vol_ma5"])
+        & (pct_chg <= -1.5)
+        & (v["vol_ma5"] > 0)
+        & (v["vol"] >= v["vol_ma5"] * 1.2),
+    }
+    aux_hits = {
+        "rsi_high": _valid(v["rsi6"]) & (v["rsi6"] >= 65),
+        "kdj_rollover": _valid(kdj_k, v["prev_kdj_k"]) & (v["prev_kdj_k"] <= kdj_k) & (kdj_k >= 80),
+        "mid_break": _valid(price, v["boll_mid"]) & (price < v["boll_mid"]),
+        "obv_exit": _valid(v["obv"], v["maobv"]) & (v["obv"] < v["maobv"]),
+        "wr_overbought": (_valid(v["wr1"]) & (v["wr1"] <= 10)) | (_valid(v["wr2"]) & (v["wr2"] <= 10)),
+    }
+    return core_hits, aux_hits
+
+
+def _bear_sell_path(v: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    price, prev_price, kdj_k, rsi6 = v["price"], v["prev_price"], v["kdj_k"], v["rsi6"]
+    core_hits = {
+        "target_hit": _valid(price, v["ma10"]) & (price >= v["ma10"]),
+        "failure_drop": _valid(v["pct_chg"]) & (v["pct_chg"] <= -1.5),
+        "lower_low": _valid(price, prev_price) & (price < prev_price * 0.985),
+    }
+    aux_hits = {
+        "rsi_fade": _valid(rsi6, v["prev_rsi6"]) & (v["prev_rsi6"] <= rsi6) & (rsi6 >= 55),
+        "kdj_rollover": _valid(kdj_k, v["prev_kdj_k"]) & (v["prev_kdj_k"] <= kdj_k) & (kdj_k >= 70),
+        "below_ma5": _valid(price, v["ma5"]) & (price < v["ma5"]),
+        "obv_exit": _valid(v["obv"], v["maobv"]) & (v["obv"] < v["maobv"]),
+    }
+    return core_hits, aux_hits
+
+
+def _generic_sell_path(v: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    price, ma5, ma10, ma20 = v["price"], v["ma5"], v["ma10"], v["ma20"]
+    kdj_k, kdj_d, vol_ma5 = v["kdj_k"], v["kdj_d"], v["vol_ma5"]
+    core_hits = {
+        "trend_break": _valid(ma5, ma10, ma20) & ((ma5 < ma10) | (ma10 < ma20)),
+        "macd_dead": _valid(v["macd_dif"], v["macd_dea"], v["prev_macd_dif"], v["prev_macd_dea"])
+        & (v["prev_macd_dif"] >= v["prev_macd_dea"])
+        & (v["macd_dif"] < v["macd_dea"]),
+        "kdj_overheat": _valid(kdj_k, kdj_d) & (kdj_k > 90) & (kdj_k < kdj_d),
+        "boll_mid_break": _valid(price, v["boll_mid"]) & (price < v["boll_mid"]),
+        # the scalar check tests ``vol_ma5`` for truthiness: zero skips it, NaN does not
+        "volume_dump": (vol_ma5 != 0) & (v["pct_chg"] <= -1.0) & (v["vol"] > vol_ma5 * 1.3),
+    }
+    aux_hits = {
+        "rsi_reversal": _valid(v["rsi6"], v["prev_rsi6"]) & (v["prev_rsi6"] >= 70) & (v["rsi6"] < v["prev_rsi6"]),
+        "wr_weak": (_valid(v["wr1"]) & (v["wr1"] > 90)) | (_valid(v["wr2"]) & (v["wr2"] > 90)),
+        "obv_exit": _valid(v["obv"], v["maobv"]) & (v["obv"] < v["maobv"]),
+        "ma20_break": _valid(price, ma20) & (price < ma20),
+        "atr_spike": _valid(v["atr"], v["atr_ma5"]) & (v["atr_ma5"] > 0) & (v["atr"] > v["atr_ma5"] * 1.2),
+    }
+    return core_hits, aux_hits
+
+
+# regime -> (array evaluator, exit score, reduce score); a core hit always exits
+_PATH_RULES: Dict[str, Tuple[Callable, float, float]] = {
+    "bull": (_bull_sell_path, 3.0, 2.0),
+    "sideways": (_sideways_sell_path, 2.5, 1.5),
+    "bear": (_bear_sell_path, 2.0, 1.5),
+    "generic": (_generic_sell_path, 2.0, 1.0),
+}
+
+
+def _valid(*values: np.ndarray) -> np.ndarray:
+    return np.logical_and.reduce([~np.isnan(value) for value in values])
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    shifted = np.empty_like(values, dtype=float)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
 def _determine_reason(action: str, core_hits: Dict[str, bool], aux_hits: Dict[str, bool]) -> str:
     if action == "hold":
         return "time"
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from ..common import assign_tier, compute_risk_metrics, find_daily_row, has_values, round_value
+from .oversold_rebound_vectorized import evaluate_history
 
 HAS_IMPLEMENTATION = True
 
@@ -20,6 +22,12 @@ class OversoldConfig:
 
 DEFAULT_CONFIG = OversoldConfig()
 ACTIVE_CONFIG = DEFAULT_CONFIG
+INDICATOR_COLUMNS = ("ma5", "ma10", "ma20", "rsi6", "kdj_k", "wr1", "wr2")
+
+
+def required_columns() -> Tuple[str, ...]:
+    """Indicator columns read by this strategy."""
+    return INDICATOR_COLUMNS
 
 
 def generate_latest_signal(symbol: str, indicators: pd.DataFrame, daily_df: pd.DataFrame) -> Optional[Dict]:
@@ -34,7 +42,21 @@ def generate_historical_signals(
     indicators: pd.DataFrame,
     daily_df: pd.DataFrame,
     config: OversoldConfig = ACTIVE_CONFIG,
+    active: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    """Signals over the whole history; ``active`` masks the trade_date-sorted rows to evaluate."""
+    if len(indicators) < 2:
+        return pd.DataFrame()
+    return evaluate_history(symbol, indicators, daily_df, config, active)
+
+
+def generate_historical_signals_scalar(
+    symbol: str,
+    indicators: pd.DataFrame,
+    daily_df: pd.DataFrame,
+    config: OversoldConfig = ACTIVE_CONFIG,
 ) -> pd.DataFrame:
+    """Per-index reference loop; kept to cross-check :func:`evaluate_history`."""
     if len(indicators) < 2:
         return pd.DataFrame()
     ind_sorted = indicators.sort_values("trade_date").reset_index(drop=True)
@@ -0,0 +1,96 @@
+"""Whole-history (vectorized) evaluation of the bear oversold-rebound strategy.
+
+Mirrors the per-index gates of :func:`oversold_rebound._evaluate_at_index` as
+column operations; dicts are only built for the rows that pass.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..common import round_value
+from ..vectorized import (
+    align_daily,
+    assign_tier_array,
+    daily_close,
+    daily_value,
+    eligible_rows,
+    numeric_column,
+    risk_metric_arrays,
+    shift,
+    take,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .oversold_rebound import OversoldConfig
+
+
+def evaluate_history(
+    symbol: str,
+    indicators: pd.DataFrame,
+    daily_df: pd.DataFrame,
+    config: "OversoldConfig",
+    active: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    ind = indicators.sort_values("trade_date").reset_index(drop=True)
+    daily = daily_df.sort_values("trade_date").reset_index(drop=True)
+    positions = align_daily(ind, daily)
+    eligible = eligible_rows(positions, active)
+    if not eligible.any():
+        return pd.DataFrame()
+
+    ma5, ma10, ma20 = (numeric_column(ind, column) for column in ("ma5", "ma10", "ma20"))
+    rsi = numeric_column(ind, "rsi6")
+    wr1 = numeric_column(ind, "wr1")
+    wr2 = numeric_column(ind, "wr2")
+    kdj_k = numeric_column(ind, "kdj_k")
+    close = take(daily_close(daily), positions)
+    pct = daily_value(daily, positions, "pct_chg")
+    turnover = daily_value(daily, positions, "amount")
+    risk = {key: take(values, positions) for key, values in risk_metric_arrays(daily).items()}
+    avg_turnover = np.nan_to_num(risk["avg_turnover_5"], nan=0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        trend_down = (ma5 < ma10) & (ma10 < ma20)
+        oversold = rsi <= 35
+        wr_ok = ~np.isnan(wr1 + wr2) & ((wr1 >= 85) | (wr2 >= 85))
+        rebound_ok = pct >= config.min_rebound_pct
+        volume_spike = (turnover != 0) & (avg_turnover != 0) & (turnover >= avg_turnover * config.volume_multiplier)
+        price_vs_ma20 = np.where(ma20 != 0, (close - ma20) / ma20, np.nan)
+        kdj_prev = shift(kdj_k)
+        kdj_turn = (kdj_prev <= 25) & (kdj_k > kdj_prev)
+
+    mask = eligible & trend_down & (oversold | wr_ok) & rebound_ok & volume_spike
+    if not mask.any():
+        return pd.DataFrame()
+
+    score = np.sum((trend_down, oversold, wr_ok, volume_spike, kdj_turn), axis=0)
+    tier = assign_tier_array(score, avg_turnover, risk["atr_ratio"], risk["range_median_5"], price_vs_ma20)
+    records: List[Dict] = []
+    for idx in np.flatnonzero(mask):
+        latest = ind.iloc[idx]
+        records.append(
+            {
+                "ts_code": symbol,
+                "trade_date": latest["trade_date"],
+                "close": round_value(close[idx]),
+                "pct_chg": round_value(pct[idx]),
+                "score": int(score[idx]),
+                "ma5": round_value(latest.get("ma5")),
+                "ma10": round_value(latest.get("ma10")),
+                "ma20": round_value(latest.get("ma20")),
+                "kdj_k": round_value(latest.get("kdj_k")),
+                "rsi6": round_value(latest.get("rsi6")),
+                "wr1": round_value(latest.get("wr1")),
+                "wr2": round_value(latest.get("wr2")),
+                "turnover": round_value(turnover[idx]),
+                "avg_turnover_5": round_value(avg_turnover[idx]),
+                "atr_ratio": round_value(risk["atr_ratio"][idx]),
+                "price_vs_ma20": round_value(price_vs_ma20[idx]),
+                "tier": str(tier[idx]),
+            }
+        )
+    return pd.DataFrame(records)
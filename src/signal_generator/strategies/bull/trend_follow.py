@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, replace
 from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from ..common import (
@@ -15,6 +16,7 @@ from ..common import (
     has_values,
     round_value,
 )
+from .trend_follow_vectorized import evaluate_history
 
 HAS_IMPLEMENTATION = True
 
@@ -37,6 +39,14 @@ class TrendFollowConfig:
 
 DEFAULT_CONFIG = TrendFollowConfig()
 ACTIVE_CONFIG = DEFAULT_CONFIG
+INDICATOR_COLUMNS = ("ma10", "ma20", "macd_dif", "macd_dea", "rsi6", "boll_mid")
+
+
+def required_columns(config: Optional[TrendFollowConfig] = None) -> Tuple[str, ...]:
+    """Indicator columns read by this strategy, including the trend MAs of ``config`` (default: active)."""
+    config = config or ACTIVE_CONFIG
+    keys = INDICATOR_COLUMNS + (config.ma_trend_fast, config.ma_trend_slow)
+    return tuple(dict.fromkeys(keys))
 
 
 def generate_latest_signal(symbol: str, indicators: pd.DataFrame, daily_df: pd.DataFrame) -> Optional[Dict]:
@@ -51,7 +61,21 @@ def generate_historical_signals(
     indicators: pd.DataFrame,
     daily_df: pd.DataFrame,
     config: TrendFollowConfig = ACTIVE_CONFIG,
+    active: Optional[np.ndarray] = None,
 ) -> pd.DataFrame:
+    """Signals over the whole history; ``active`` masks the trade_date-sorted rows to evaluate."""
+    if len(indicators) < 2:
+        return pd.DataFrame()
+    return evaluate_history(symbol, indicators, daily_df, config, active)
+
+
+def generate_historical_signals_scalar(
+    symbol: str,
+    indicators: pd.DataFrame,
+    daily_df: pd.DataFrame,
+    config: TrendFollowConfig = ACTIVE_CONFIG,
+) -> pd.DataFrame:
+    """Per-index reference loop; kept to cross-check :func:`evaluate_history`."""
     if len(indicators) < 2:
         return pd.DataFrame()
     ind_sorted = indicators.sort_values("trade_date").reset_index(drop=True)
@@ -246,6 +270,12 @@ def _resolve_low(indicator_row: pd.Series, daily_row: pd.Series) -> Optional[flo
     return float(low) if low is not None and not pd.isna(low) else None
 
 
+def build_config(config: Dict) -> TrendFollowConfig:
+    """Config from runtime settings over the defaults, without activating it."""
+    updates = {field: config[field] for field in DEFAULT_CONFIG.__dataclass_fields__ if field in config}
+    return replace(DEFAULT_CONFIG, **updates)
+
+
 def set_config(config: Dict) -> None:
     """Update active config from runtime settings."""
     global ACTIVE_CONFIG
@@ -0,0 +1,120 @@
+"""Whole-history (vectorized) evaluation of the bull trend-following strategy.
+
+Produces exactly the rows of the per-index scalar loop in
+:mod:`trend_follow`, but computes every condition as a column operation and
+only materialises dicts for the rows that pass.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..common import round_value
+from ..vectorized import (
+    align_daily,
+    assign_tier_array,
+    daily_value,
+    eligible_rows,
+    numeric_column,
+    prior_close_max,
+    resolve_daily_price,
+    risk_metric_arrays,
+    shift,
+    take,
+    volume_ratio_array,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .trend_follow import TrendFollowConfig
+
+
+def evaluate_history(
+    symbol: str,
+    indicators: pd.DataFrame,
+    daily_df: pd.DataFrame,
+    config: "TrendFollowConfig",
+    active: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    ind = indicators.sort_values("trade_date").reset_index(drop=True)
+    daily = daily_df.sort_values("trade_date").reset_index(drop=True)
+    positions = align_daily(ind, daily)
+    eligible = eligible_rows(positions, active)
+    if not eligible.any():
+        return pd.DataFrame()
+
+    close = _resolve(daily, ind, positions, "close")
+    low = _resolve(daily, ind, positions, "low")
+    risk = {key: take(values, positions) for key, values in risk_metric_arrays(daily).items()}
+    avg_turnover = risk["avg_turnover_5"]
+    volume_ratio = take(
+        volume_ratio_array(daily, config.volume_recent_window, config.volume_base_window), positions
+    )
+
+    fast = numeric_column(ind, config.ma_trend_fast)
+    slow = numeric_column(ind, config.ma_trend_slow)
+    ma10 = numeric_column(ind, "ma10")
+    dif = numeric_column(ind, "macd_dif")
+    dea = numeric_column(ind, "macd_dea")
+    rsi = numeric_column(ind, "rsi6")
+    boll_mid = numeric_column(ind, "boll_mid")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        trend_ok = (fast > slow) & (slow > shift(slow)) & (close >= fast)
+        macd_ok = (dif > dea) | (dif > 0)
+        liquidity_ok = np.nan_to_num(avg_turnover, nan=0.0) >= config.min_turnover
+        volume_ok = volume_ratio >= config.volume_ratio_min
+        rsi_ok = rsi < config.rsi_max
+        boll_ok = close >= boll_mid
+        price_vs_ma20 = np.where(slow != 0, (close - slow) / slow, np.nan)
+        breakout_high = take(prior_close_max(daily, max(config.breakout_lookback, 5)), positions)
+        breakout_ok = close >= breakout_high * (1 + config.breakout_buffer)
+        retest_ok = (low <= ma10) & (close >= ma10) if config.allow_retest else np.zeros(len(ind), dtype=bool)
+
+    required = (trend_ok, macd_ok, liquidity_ok, volume_ok, rsi_ok, boll_ok, breakout_ok | retest_ok)
+    mask = eligible & np.logical_and.reduce(required)
+    if not mask.any():
+        return pd.DataFrame()
+
+    score_items = (trend_ok, macd_ok, liquidity_ok, volume_ok, rsi_ok, boll_ok, breakout_ok, retest_ok)
+    score = np.sum(score_items, axis=0)
+    tier = assign_tier_array(score, avg_turnover, risk["atr_ratio"], risk["range_median_5"], price_vs_ma20)
+
+    pct = daily_value(daily, positions, "pct_chg")
+    turnover = daily_value(daily, positions, "amount")
+    records: List[Dict] = []
+    for idx in np.flatnonzero(mask):
+        latest = ind.iloc[idx]
+        records.append(
+            {
+                "ts_code": symbol,
+                "trade_date": latest["trade_date"],
+                "close": round_value(close[idx]),
+                "pct_chg": round_value(pct[idx]),
+                "score": int(score[idx]),
+                "volume_ratio": round_value(volume_ratio[idx]),
+                "structure": "breakout" if breakout_ok[idx] else "retest",
+                "ma10": round_value(latest.get("ma10")),
+                "ma20": round_value(latest.get("ma20")),
+                "macd_dif": round_value(latest.get("macd_dif")),
+                "macd_dea": round_value(latest.get("macd_dea")),
+                "rsi6": round_value(latest.get("rsi6")),
+                "boll_mid": round_value(latest.get("boll_mid")),
+                "turnover": round_value(turnover[idx]),
+                "avg_turnover_5": round_value(avg_turnover[idx]),
+                "atr_ratio": round_value(risk["atr_ratio"][idx]),
+                "price_vs_ma20": round_value(price_vs_ma20[idx]),
+                "tier": str(tier[idx]),
+            }
+        )
+    return pd.DataFrame(records)
+
+
+def _resolve(daily: pd.DataFrame, ind: pd.DataFrame, positions: np.ndarray, column: str) -> np.ndarray:
+    """Daily front-adj -> raw -> indicator value, like ``_resolve_price``/``_resolve_low``."""
+    values = take(resolve_daily_price(daily, column), positions)
+    fallback = numeric_column(ind, column)
+    return np.where(np.isnan(values), fallback, values)
+
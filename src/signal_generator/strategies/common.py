@@ -69,6 +69,13 @@ def _compute_atr(df: pd.DataFrame, period: int = 14) -> Optional[float]:
     return float(atr)
 
 
+# (tier, min_score, min_avg_turnover_5, max_atr_ratio/range_median_5, max |price_vs_ma20|)
+TIER_RULES = (
+    ("A", 5, 400_000, 0.04, 0.02),
+    ("B", 4, 200_000, 0.06, 0.04),
+)
+
+
 def assign_tier(
     score: int,
     avg_turnover_5: Optional[float],
@@ -82,23 +89,15 @@ def assign_tier(
     def _check_abs(value: Optional[float], upper: float) -> bool:
         return value is not None and abs(value) <= upper
 
-    if (
-        score >= 5
-        and (avg_turnover_5 or 0) >= 400_000
-        and _check_range(atr_ratio, 0.04)
-        and _check_range(range_median_5, 0.04)
-        and _check_abs(price_vs_ma20, 0.02)
-    ):
-        return "A"
-
-    if (
-        score >= 4
-        and (avg_turnover_5 or 0) >= 200_000
-        and _check_range(atr_ratio, 0.06)
-        and _check_range(range_median_5, 0.06)
-        and _check_abs(price_vs_ma20, 0.04)
-    ):
-        return "B"
+    for tier, min_score, min_turnover, upper, price_band in TIER_RULES:
+        if (
+            score >= min_score
+            and (avg_turnover_5 or 0) >= min_turnover
+            and _check_range(atr_ratio, upper)
+            and _check_range(range_median_5, upper)
+            and _check_abs(price_vs_ma20, price_band)
+        ):
+            return tier
 
     return "C"
 
@@ -0,0 +1,118 @@
+"""Whole-history (vectorized) evaluation of the sideways range-trading strategy.
+
+Mirrors the per-index gates of :func:`range_trade._evaluate_at_index` as
+column operations; dicts are only built for the rows that pass.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..common import round_value
+from ..vectorized import (
+    align_daily,
+    assign_tier_array,
+    daily_close,
+    daily_value,
+    eligible_rows,
+    numeric_column,
+    recent_close_range,
+    risk_metric_arrays,
+    shift,
+    take,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .range_trade import RangeTradeConfig
+
+RECENT_WINDOW = 30
+RECENT_MIN_POINTS = 10
+
+
+def evaluate_history(
+    symbol: str,
+    indicators: pd.DataFrame,
+    daily_df: pd.DataFrame,
+    config: "RangeTradeConfig",
+    active: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    ind = indicators.sort_values("trade_date").reset_index(drop=True)
+    daily = daily_df.sort_values("trade_date").reset_index(drop=True)
+    positions = align_daily(ind, daily)
+    eligible = eligible_rows(positions, active)
+    if not eligible.any():
+        return pd.DataFrame()
+
+    ma5, ma10, ma20 = (numeric_column(ind, column) for column in ("ma5", "ma10", "ma20"))
+    rsi = numeric_column(ind, "rsi6")
+    close = take(daily_close(daily), positions)
+    risk = {key: take(values, positions) for key, values in risk_metric_arrays(daily).items()}
+    avg_turnover = risk["avg_turnover_5"]
+    recent = {key: take(values, positions) for key, values in recent_close_range(daily, RECENT_WINDOW).items()}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        flat_trend = (
+            (ma20 != 0)
+            & ~np.isnan(ma5 + ma10 + ma20)
+            & (np.abs(ma5 - ma20) / ma20 <= config.flat_threshold)
+            & (np.abs(ma10 - ma20) / ma20 <= config.flat_threshold * 1.5)
+        )
+        liquidity_ok = np.nan_to_num(avg_turnover, nan=0.0) >= config.min_turnover
+        price_vs_ma20 = (close - ma20) / ma20
+        distance_ok = np.abs(price_vs_ma20) <= config.max_distance_ma20
+        range_ok = (
+            (recent["count"] >= RECENT_MIN_POINTS)
+            & (recent["low"] * 1.02 <= close)
+            & (close <= recent["high"] * 0.99)
+        )
+
+        boll_ok = (
+            ~np.isnan(numeric_column(ind, "boll_upper"))
+            & (close <= numeric_column(ind, "boll_mid"))
+            & (close >= numeric_column(ind, "boll_lower"))
+        )
+        kdj_ok = ~np.isnan(numeric_column(ind, "kdj_d")) & (numeric_column(ind, "kdj_k") <= 45)
+        rsi_ok = (rsi >= 35) & (rsi <= 55)
+        wr1 = numeric_column(ind, "wr1")
+        wr_ok = ~np.isnan(numeric_column(ind, "wr2")) & (wr1 >= 55) & (wr1 <= 90)
+        rsi_prev = shift(rsi)
+        reversal_hint = (rsi_prev <= 40) & (rsi > rsi_prev)
+
+    score = np.sum((flat_trend, boll_ok, kdj_ok, rsi_ok, wr_ok, reversal_hint), axis=0)
+    mask = eligible & flat_trend & liquidity_ok & distance_ok & range_ok & (score >= 3)
+    if not mask.any():
+        return pd.DataFrame()
+
+    tier = assign_tier_array(score, avg_turnover, risk["atr_ratio"], risk["range_median_5"], price_vs_ma20)
+    pct = daily_value(daily, positions, "pct_chg")
+    turnover = daily_value(daily, positions, "amount")
+    records: List[Dict] = []
+    for idx in np.flatnonzero(mask):
+        latest = ind.iloc[idx]
+        records.append(
+            {
+                "ts_code": symbol,
+                "trade_date": latest["trade_date"],
+                "close": round_value(close[idx]),
+                "pct_chg": round_value(pct[idx]),
+                "score": int(score[idx]),
+                "ma5": round_value(latest.get("ma5")),
+                "ma10": round_value(latest.get("ma10")),
+                "ma20": round_value(latest.get("ma20")),
+                "kdj_k": round_value(latest.get("kdj_k")),
+                "kdj_d": round_value(latest.get("kdj_d")),
+                "rsi6": round_value(latest.get("rsi6")),
+                "wr1": round_value(latest.get("wr1")),
+                "wr2": round_value(latest.get("wr2")),
+                "turnover": round_value(turnover[idx]),
+                "avg_turnover_5": round_value(avg_turnover[idx]),
+                "atr_ratio": round_value(risk["atr_ratio"][idx]),
+                "price_vs_ma20": round_value(price_vs_ma20[idx]),
+                "tier": str(tier[idx]),
+            }
+        )
+    return pd.DataFrame(records)
+
@@ -0,0 +1,194 @@
+"""Array helpers for whole-history (vectorized) strategy evaluation.
+
+The scalar strategy paths evaluate one indicator row at a time against
+``history = daily_df[daily_df["trade_date"] <= trade_date]``. Every history
+statistic used there only depends on the number of daily rows in that prefix,
+so the helpers below compute it once per daily position and strategies index
+the result with :func:`align_daily`.
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .common import TIER_RULES, extract_close_series
+
+ATR_PERIOD = 14
+
+
+def align_daily(indicators: pd.DataFrame, daily_sorted: pd.DataFrame) -> np.ndarray:
+    """Position of the last daily row matching each indicator trade_date (-1 if none)."""
+    daily_dates = daily_sorted["trade_date"].to_numpy()
+    ind_dates = indicators["trade_date"].to_numpy()
+    left = np.searchsorted(daily_dates, ind_dates, side="left")
+    right = np.searchsorted(daily_dates, ind_dates, side="right")
+    return np.where(right > left, right - 1, -1)
+
+
+def eligible_rows(positions: np.ndarray, active: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows the scalar loop would evaluate (idx >= 1 with a daily bar), limited to ``active``."""
+    eligible = (positions >= 0) & (np.arange(len(positions)) >= 1)
+    if active is not None:
+        eligible &= np.asarray(active, dtype=bool)
+    return eligible
+
+
+def numeric_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+
+def take(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Gather ``values[positions]`` with NaN where ``positions`` is -1."""
+    out = np.full(len(positions), np.nan)
+    valid = positions >= 0
+    out[valid] = values[positions[valid]]
+    return out
+
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[: len(values) - periods]
+    return out
+
+
+def resolve_daily_price(daily_sorted: pd.DataFrame, column: str) -> np.ndarray:
+    """``{column}_front_adj`` falling back to the raw column, per daily row."""
+    adjusted = numeric_column(daily_sorted, f"{column}_front_adj")
+    raw = numeric_column(daily_sorted, column)
+    return np.where(np.isnan(adjusted), raw, adjusted)
+
+
+def daily_value(daily_sorted: pd.DataFrame, positions: np.ndarray, column: str) -> np.ndarray:
+    """``row.get(column, 0)`` of the aligned daily rows (NaN where unaligned)."""
+    if column not in daily_sorted.columns:
+        return np.zeros(len(positions))
+    return take(numeric_column(daily_sorted, column), positions)
+
+
+def daily_close(daily_sorted: pd.DataFrame) -> np.ndarray:
+    """``row.get("close_front_adj", row.get("close"))`` per daily row (no NaN fallback)."""
+    column = "close_front_adj" if "close_front_adj" in daily_sorted.columns else "close"
+    return numeric_column(daily_sorted, column)
+
+
+def trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """``out[i] == pd.Series(values[: i + 1]).tail(window).mean()``."""
+    return _trailing(values, window, np.mean)
+
+
+def trailing_median(values: np.ndarray, window: int) -> np.ndarray:
+    """``out[i] == pd.Series(values[: i + 1]).tail(window).median()``."""
+    return _trailing(values, window, np.nanmedian)
+
+
+def trailing_max(values: np.ndarray, window: int) -> np.ndarray:
+    return _trailing(values, window, np.max)
+
+
+def per_prefix(clean: np.ndarray, stats: np.ndarray, exclude_last: bool = False) -> np.ndarray:
+    """Map stats over the clean subsequence back onto daily-row prefixes.
+
+    ``stats[c - 1]`` describes the first ``c`` clean rows. For daily position
+    ``j`` the prefix is rows ``[0, j]`` (or ``[0, j)`` with ``exclude_last``).
+    """
+    counts = np.cumsum(clean)
+    if exclude_last:
+        counts = np.concatenate(([0], counts[:-1]))
+    return take(stats, counts - 1)
+
+
+def risk_metric_arrays(daily_sorted: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Vectorized :func:`compute_risk_metrics` for every history prefix."""
+    amount = numeric_column(daily_sorted, "amount")
+    high = numeric_column(daily_sorted, "high")
+    low = numeric_column(daily_sorted, "low")
+    close = numeric_column(daily_sorted, "close")
+    clean = ~(np.isnan(amount) | np.isnan(high) | np.isnan(low) | np.isnan(close))
+    amount, high, low, close = amount[clean], high[clean], low[clean], close[clean]
+
+    prev_close = shift(close)
+    true_range = np.fmax(np.abs(high - low), np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    atr = trailing_mean(true_range, ATR_PERIOD)
+    atr[:1] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranges = (high - low) / close
+        atr_ratio = np.where(close != 0, atr / close, np.nan)
+
+    return {
+        "avg_turnover_5": per_prefix(clean, trailing_mean(amount, 5)),
+        "range_median_5": per_prefix(clean, trailing_median(ranges, 5)),
+        "atr_ratio": per_prefix(clean, atr_ratio),
+    }
+
+
+def volume_ratio_array(daily_sorted: pd.DataFrame, recent_window: int, base_window: int) -> np.ndarray:
+    """Vectorized ``tail(recent).mean() / tail(base).mean()`` of amount per prefix."""
+    if "amount" not in daily_sorted.columns:
+        return np.full(len(daily_sorted), np.nan)
+    amount = numeric_column(daily_sorted, "amount")
+    clean = ~np.isnan(amount)
+    recent = trailing_mean(amount[clean], recent_window)
+    base = trailing_mean(amount[clean], base_window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(base != 0, recent / base, np.nan)
+    return per_prefix(clean, ratio)
+
+
+def prior_close_max(daily_sorted: pd.DataFrame, window: int) -> np.ndarray:
+    """Max of the last ``window`` valid closes strictly before each daily row."""
+    closes = extract_close_series(daily_sorted).to_numpy(dtype=float)
+    clean = ~np.isnan(closes)
+    return per_prefix(clean, trailing_max(closes[clean], window), exclude_last=True)
+
+
+def recent_close_range(daily_sorted: pd.DataFrame, window: int) -> Dict[str, np.ndarray]:
+    """Count/min/max of valid closes within the last ``window`` daily rows of each prefix."""
+    rolling = extract_close_series(daily_sorted).reset_index(drop=True).rolling(window, min_periods=1)
+    return {
+        "count": rolling.count().to_numpy(dtype=float),
+        "low": rolling.min().to_numpy(dtype=float),
+        "high": rolling.max().to_numpy(dtype=float),
+    }
+
+
+def assign_tier_array(
+    score: np.ndarray,
+    avg_turnover_5: np.ndarray,
+    atr_ratio: np.ndarray,
+    range_median_5: np.ndarray,
+    price_vs_ma20: np.ndarray,
+) -> np.ndarray:
+    """Vectorized :func:`assign_tier`; NaN stands in for ``None``."""
+    turnover = np.nan_to_num(avg_turnover_5, nan=0.0)
+    conditions = [
+        (score >= min_score)
+        & (turnover >= min_turnover)
+        & (atr_ratio <= upper)
+        & (range_median_5 <= upper)
+        & (np.abs(price_vs_ma20) <= price_band)
+        for _, min_score, min_turnover, upper, price_band in TIER_RULES
+    ]
+    return np.select(conditions, [rule[0] for rule in TIER_RULES], default="C")
+
+
+def _trailing(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    size = len(values)
+    out = np.full(size, np.nan)
+    if size == 0:
+        return out
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for idx in range(min(window - 1, size)):
+            out[idx] = reducer(values[: idx + 1])
+        if size >= window:
+            out[window - 1 :] = reducer(sliding_window_view(values, window), axis=1)
+    return out
+
@@ -35,14 +35,15 @@ def configure_strategies(settings: Dict) -> None:
     _CONFIGURED = True
 
 
-def _load_latest_regime() -> str:
-    if not REGIME_FILE.exists():
-        return "bull"
-    try:
-        df = pd.read_csv(REGIME_FILE)
-    except Exception:  # pragma: no cover
-        return "bull"
-    if df.empty:
+def _load_latest_regime(df: Optional[pd.DataFrame] = None) -> str:
+    if df is None:
+        if not REGIME_FILE.exists():
+            return "bull"
+        try:
+            df = pd.read_csv(REGIME_FILE)
+        except Exception:  # pragma: no cover
+            return "bull"
+    if df.empty or "regime" not in df.columns:
         return "bull"
     return str(df.iloc[-1]["regime"]).lower()
 
@@ -56,8 +57,9 @@ def select_strategy(regime: Optional[str] = None):
     return strategy
 
 
-def get_current_regime() -> str:
-    return _load_latest_regime()
+def get_current_regime(regime_df: Optional[pd.DataFrame] = None) -> str:
+    """Latest regime label; ``regime_df`` is an already loaded regime series (else REGIME_FILE is read)."""
+    return _load_latest_regime(regime_df)
 
 
 def generate_latest_signal(symbol: str, indicators: pd.DataFrame, daily_df: pd.DataFrame, regime: Optional[str] = None):
@@ -73,27 +75,22 @@ def generate_historical_signals(
     regime_map: Optional[Dict[str, str]] = None,
 ):
     if regime_map:
+        ind_sorted = indicators.sort_values("trade_date").reset_index(drop=True)
+        regimes = _normalize_dates(ind_sorted["trade_date"]).map(regime_map).fillna("").astype(str).str.lower()
         frames = []
         for regime_name, strategy in _STRATEGY_MAP.items():
-            hist = strategy.generate_historical_signals(symbol, indicators, daily_df)
+            active = (regimes == regime_name.lower()).to_numpy()
+            if not active.any():
+                continue
+            hist = strategy.generate_historical_signals(symbol, ind_sorted, daily_df, active=active)
             if hist.empty:
                 continue
             frame = hist.copy()
-            frame["_candidate_regime"] = regime_name.lower()
+            frame["regime"] = regime_name.lower()
             frames.append(frame)
         if not frames:
             return pd.DataFrame()
-        combined = pd.concat(frames, ignore_index=True)
-        combined["_normalized_date"] = combined["trade_date"].apply(_normalize_date)
-        combined["_regime_actual"] = combined["_normalized_date"].map(
-            lambda d: (regime_map.get(d) or "").lower()
-        )
-        filtered = combined[combined["_regime_actual"] == combined["_candidate_regime"]].copy()
-        if filtered.empty:
-            return pd.DataFrame()
-        filtered["regime"] = filtered["_regime_actual"]
-        filtered.drop(columns=["_candidate_regime", "_normalized_date", "_regime_actual"], inplace=True)
-        return filtered
+        return pd.concat(frames, ignore_index=True)
 
     strategy = select_strategy(regime)
     hist = strategy.generate_historical_signals(symbol, indicators, daily_df)
@@ -105,6 +102,15 @@ def generate_historical_signals(
     return hist
 
 
+def _normalize_dates(values: pd.Series) -> pd.Series:
+    """Vectorized :func:`_normalize_date` (numeric columns skip the per-row path)."""
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return values.map(_normalize_date)
+    missing = values.isna()
+    normalized = values.fillna(0).astype("int64").astype(str)
+    return normalized.mask(missing, "")
+
+
 def _normalize_date(value) -> str:
     if value is None or pd.isna(value):
         return ""
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
@@ -26,6 +26,12 @@ class BearFilterConfig:
 
 
 ACTIVE_CONFIG = BearFilterConfig()
+INDICATOR_COLUMNS = ("ma20", "ma60", "macd_dif", "macd_dea", "rsi6", "wr1", "wr2")
+
+
+def required_columns() -> Tuple[str, ...]:
+    """Indicator columns read by this filter."""
+    return INDICATOR_COLUMNS
 
 
 def configure(cfg: Dict) -> None:
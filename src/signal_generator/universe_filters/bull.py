@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
@@ -40,6 +40,18 @@ class BullFilterConfig:
 
 
 ACTIVE_CONFIG = BullFilterConfig()
+INDICATOR_COLUMNS = ("ma5", "ma10", "ma20", "ma60", "macd_dif", "macd_dea", "obv", "rsi6")
+
+
+def required_columns(config: Optional[BullFilterConfig] = None) -> Tuple[str, ...]:
+    """Indicator columns read by this filter, including the slope MA of ``config`` (default: active)."""
+    return tuple(dict.fromkeys(INDICATOR_COLUMNS + ((config or ACTIVE_CONFIG).ma_slope_key,)))
+
+
+def build_config(cfg: Dict) -> BullFilterConfig:
+    """Config from settings over the defaults, without activating it."""
+    defaults = BullFilterConfig()
+    return replace(defaults, **{field: cfg[field] for field in defaults.__dataclass_fields__ if field in cfg})
 
 
 def configure(cfg: Dict) -> None:
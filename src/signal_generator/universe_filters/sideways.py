@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
@@ -37,6 +37,12 @@ class SidewaysFilterConfig:
 
 
 ACTIVE_CONFIG = SidewaysFilterConfig()
+INDICATOR_COLUMNS = ("ma20", "ma60", "boll_upper", "boll_mid", "boll_lower", "rsi6", "wr1")
+
+
+def required_columns() -> Tuple[str, ...]:
+    """Indicator columns read by this filter."""
+    return INDICATOR_COLUMNS
 
 
 def configure(cfg: Dict) -> None:
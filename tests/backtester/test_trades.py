@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from src.backtester.watchlist.context import WatchlistBacktestContext
+from src.backtester.watchlist.trades import simulate_trades
+from src.indicator_engine.calculator import compute_indicators
+from src.signal_generator.sell_rules import evaluate_sell_signal, prepare_daily_features
+
+
+def _daily(days: int = 220) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2023-01-02", periods=days).strftime("%Y%m%d").astype(int)
+    close = 2 * np.exp(np.cumsum(rng.normal(0.001, 0.02, days)))
+    pre_close = np.r_[close[0], close[:-1]]
+    return pd.DataFrame(
+        {
+            "trade_date": dates,
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "pre_close": pre_close,
+            "pct_chg": (close / pre_close - 1) * 100,
+            "vol": rng.integers(1_000, 50_000, days).astype(float),
+            "amount": close * 1e6,
+        }
+    )
+
+
+def test_trades_follow_first_sell_trigger_without_overlap(tmp_path):
+    ctx = WatchlistBacktestContext(
+        tmp_path, None, None, tmp_path, tmp_path, tmp_path, tmp_path, [1], 8, None, {}, tmp_path / "cache.json"
+    )
+    daily = _daily()
+    indicators = compute_indicators(daily)
+    indicators["trade_date"] = indicators["trade_date"].astype(str)
+    daily = daily.drop(index=[40, 41, 120]).reset_index(drop=True)  # entries/exits without a bar are skipped
+    buys = pd.DataFrame({"trade_date": indicators["trade_date"].iloc[30:200:3].astype(int), "tier": "A"})
+    regime_map = {date: "bear" for date in indicators["trade_date"].iloc[100:]}
+
+    trades = simulate_trades(ctx, {"X.SH": (indicators, daily)}, {"X.SH": buys}, regime_map)
+
+    # day-by-day reference walk
+    features = prepare_daily_features(daily)
+    bars = {row["trade_date"]: row for _, row in features.iterrows()}
+    rows = {date: idx for idx, date in enumerate(indicators["trade_date"])}
+    expected, last_exit = [], -1
+    for entry_date in buys["trade_date"].astype(str):
+        start = rows[entry_date]
+        if start <= last_exit or entry_date not in bars:
+            continue
+        regime = regime_map.get(entry_date, "bull")
+        exit_idx = min(start + ctx.max_hold_days, len(indicators) - 1)
+        for idx in range(start + 1, exit_idx + 1):
+            date = indicators["trade_date"].iloc[idx]
+            prev_date = indicators["trade_date"].iloc[idx - 1]
+            if date in bars and evaluate_sell_signal(
+                indicators, idx, bars[date], indicators.iloc[idx - 1], bars.get(prev_date), regime_map.get(date, regime)
+            ).triggered:
+                exit_idx = idx
+                break
+        if indicators["trade_date"].iloc[exit_idx] not in bars:
+            continue
+        expected.append((entry_date, indicators["trade_date"].iloc[exit_idx]))
+        last_exit = exit_idx
+
+    assert [(t["entry_date"], t["exit_date"]) for t in trades] == expected
+    assert any(t["exit_reason"] != "time" for t in trades) and any(t["exit_reason"] == "time" for t in trades)
+    assert all(a["exit_date"] < b["entry_date"] for a, b in zip(trades, trades[1:]))
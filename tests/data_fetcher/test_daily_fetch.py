@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+
+import pandas as pd
+
+from src.data_fetcher.chinadata_client import ChinaDataClient
+from src.data_fetcher.daily import FetchOptions, fetch_daily_bars
+from src.data_fetcher.throttle import RetryPolicy, TokenBucket, call_api
+from src.data_fetcher.trade_date import fetch_daily_by_trade_date
+
+
+class FakePro:
+    """Stands in for ``cd.pro_api()``: fails the first ``failures`` fund_daily calls per symbol."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls: dict = {}
+        self._lock = threading.Lock()
+
+    def fund_daily(self, ts_code, **kwargs):
+        with self._lock:
+            self.calls[ts_code] = self.calls.get(ts_code, 0) + 1
+            if self.calls[ts_code] <= self.failures:
+                raise ConnectionError("rate limited")
+        base = float(len(ts_code))
+        return pd.DataFrame(
+            {
+                "ts_code": [ts_code] * 3,
+                "trade_date": ["20240104", "20240102", "20240103"],
+                "open": [base, base + 1, base + 2],
+                "high": [base + 1, base + 2, base + 3],
+                "low": [base - 1, base, base + 1],
+                "close": [base, base + 1, base + 2],
+                "pre_close": [base, base, base + 1],
+                "vol": [10.0, 20.0, 30.0],
+                "amount": [100.0, 200.0, 300.0],
+            }
+        )
+
+    def fund_adj(self, ts_code, **kwargs):
+        return pd.DataFrame({"trade_date": ["20240102", "20240103", "20240104"], "adj_factor": [1.0, 1.0, 2.0]})
+
+
+SYMBOLS = ["A.SH", "BB.SZ", "CCC.SH", "DDDD.SZ"]
+
+
+def test_concurrent_fetch_matches_sequential():
+    client = ChinaDataClient(token="x", _pro=FakePro())
+    sequential = fetch_daily_bars(SYMBOLS, "20240101", "20240105", client=client)
+    concurrent = fetch_daily_bars(SYMBOLS, "20240101", "20240105", client=client, options=FetchOptions(workers=3))
+
+    assert list(concurrent) == SYMBOLS
+    for symbol in SYMBOLS:
+        pd.testing.assert_frame_equal(concurrent[symbol], sequential[symbol])
+    assert concurrent["A.SH"]["close_front_adj"].tolist() == [2.5, 3.0, 4.0]
+
+
+def test_transient_failures_are_retried():
+    pro = FakePro(failures=2)
+    client = ChinaDataClient(token="x", _pro=pro)
+    options = FetchOptions(workers=2, retry=RetryPolicy(max_retries=2, backoff_seconds=0.0))
+
+    frames = fetch_daily_bars(SYMBOLS, "20240101", "20240105", client=client, options=options)
+
+    assert all(len(frame) == 3 for frame in frames.values())
+    assert all(count == 3 for count in pro.calls.values())
+
+    exhausted = fetch_daily_bars(["E.SH"], client=ChinaDataClient(token="x", _pro=FakePro(failures=5)))
+    assert exhausted["E.SH"].empty
+
+
+def test_token_bucket_spaces_calls_to_quota():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(calls_per_minute=120, clock=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        call_api(lambda: None, {}, limiter=bucket)
+
+    assert sleeps == [0.5, 0.5, 0.5, 0.5]
+    assert now[0] == 2.0
+
+
+class MarketPro:
+    """Whole-market ``trade_date=`` responses served in pages of ``limit`` rows."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def fund_daily(self, trade_date, limit, offset, **kwargs):
+        self.calls.append(("fund_daily", trade_date, offset))
+        rows = pd.DataFrame(
+            {
+                "ts_code": ["A.SH", "B.SZ", "C.SH"],
+                "trade_date": [trade_date] * 3,
+                "close": [1.0, 2.0, 3.0],
+            }
+        )
+        return rows.iloc[offset : offset + limit]
+
+    def fund_adj(self, trade_date, limit, offset, **kwargs):
+        self.calls.append(("fund_adj", trade_date, offset))
+        factor = 2.0 if trade_date == "20240103" else 1.0
+        rows = pd.DataFrame({"ts_code": ["A.SH", "B.SZ", "C.SH"], "trade_date": [trade_date] * 3, "adj_factor": factor})
+        return rows.iloc[offset : offset + limit]
+
+
+def test_fetch_by_trade_date_pages_and_splits_by_symbol(monkeypatch):
+    monkeypatch.setattr("src.data_fetcher.trade_date.PAGE_SIZE", 2)
+    pro = MarketPro()
+    frames = fetch_daily_by_trade_date(
+        ["20240102", "20240103"], symbols=["A.SH", "C.SH"], client=ChinaDataClient(token="x", _pro=pro)
+    )
+
+    assert sorted(frames) == ["A.SH", "C.SH"]
+    assert frames["C.SH"]["trade_date"].tolist() == ["20240102", "20240103"]
+    assert frames["C.SH"]["close_front_adj"].tolist() == [1.5, 3.0]
+    assert [call for call in pro.calls if call[0] == "fund_daily"] == [
+        ("fund_daily", "20240102", 0),
+        ("fund_daily", "20240102", 2),
+        ("fund_daily", "20240103", 0),
+        ("fund_daily", "20240103", 2),
+    ]
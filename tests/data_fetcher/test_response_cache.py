@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+
+import pandas as pd
+import pytest
+
+from src.data_fetcher.chinadata_client import build_chinadata_client
+from src.data_fetcher.response_cache import CacheMiss, ResponseCache, wrap_pro
+from src.data_fetcher.throttle import RetryPolicy, call_api
+from src.pipelines.full_pool import _fetch_etf_master
+
+
+class CountingPro:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def fund_daily(self, **params):
+        self.calls += 1
+        return pd.DataFrame({"ts_code": [params["ts_code"]], "close": [float(self.calls)]})
+
+
+def test_readwrite_serves_fresh_hits_and_refetches_after_ttl(tmp_path):
+    now = [1_000.0]
+    cache = ResponseCache(tmp_path, mode="readwrite", default_ttl=60, clock=lambda: now[0])
+    pro = CountingPro()
+    cached = wrap_pro(pro, cache, "chinadata")
+
+    first = cached.fund_daily(ts_code="A.SH")
+    again = cached.fund_daily(ts_code="A.SH")
+    other = cached.fund_daily(ts_code="B.SZ")
+    now[0] += 61
+    expired = cached.fund_daily(ts_code="A.SH")
+
+    pd.testing.assert_frame_equal(first, again)
+    assert pro.calls == 3
+    assert other["close"].iloc[0] == 2.0
+    assert expired["close"].iloc[0] == 3.0
+
+
+def test_replay_is_offline_and_ignores_age(tmp_path, monkeypatch):
+    now = [0.0]
+    writer = ResponseCache(tmp_path, mode="readwrite", clock=lambda: now[0])
+    wrap_pro(CountingPro(), writer, "chinadata").fund_daily(ts_code="A.SH")
+    now[0] = 10 * 86400.0
+
+    monkeypatch.setattr("src.data_fetcher.chinadata_client.load_tokens", lambda path=None: {})
+    client = build_chinadata_client(settings={"api_cache": {"mode": "replay", "dir": str(tmp_path)}})
+
+    assert client.pro.fund_daily(ts_code="A.SH")["close"].iloc[0] == 1.0
+    with pytest.raises(CacheMiss):
+        call_api(client.pro.fund_daily, {"ts_code": "B.SZ"}, retry=RetryPolicy(max_retries=3, backoff_seconds=60))
+
+
+def test_eviction_keeps_cache_under_max_size(tmp_path):
+    now = [0.0]
+    cache = ResponseCache(tmp_path, mode="readwrite", max_bytes=4000, clock=lambda: now[0])
+    cached = wrap_pro(CountingPro(), cache, "chinadata")
+    for idx in range(20):
+        now[0] += 1
+        cached.fund_daily(ts_code=f"S{idx}.SH")
+
+    files = list(tmp_path.rglob("*.pkl"))
+    assert sum(path.stat().st_size for path in files) <= 4000
+    assert cache.path_for("chinadata", "fund_daily", {"ts_code": "S19.SH"}).exists()
+    assert not cache.path_for("chinadata", "fund_daily", {"ts_code": "S0.SH"}).exists()
+
+
+def test_ranges_reaching_today_are_not_stored_and_misses_read_once(tmp_path, monkeypatch):
+    now = [time.mktime((2025, 1, 6, 10, 0, 0, 0, 0, -1))]  # local time, before the close
+    cache = ResponseCache(tmp_path, mode="readwrite", clock=lambda: now[0])
+    pro = CountingPro()
+    cached = wrap_pro(pro, cache, "chinadata")
+    reads = []
+    original_get = cache.get
+    monkeypatch.setattr(cache, "get", lambda *args: reads.append(args) or original_get(*args))
+
+    for _ in range(2):
+        call_api(cached.fund_daily, {"ts_code": "A.SH", "start_date": "20250101", "end_date": "20250106"})
+        call_api(cached.fund_daily, {"ts_code": "A.SH", "start_date": "20250101"})
+        call_api(cached.fund_daily, {"ts_code": "A.SH", "start_date": "20250101", "end_date": "20250103"})
+
+    assert pro.calls == 5  # only the closed range is served from the cache the second time
+    assert len(reads) == 6
+
+
+def test_endpoint_probes_reflect_the_wrapped_pro(tmp_path):
+    class FundOnlyPro:
+        def fund_basic(self, **params):
+            return pd.DataFrame({"ts_code": ["510300.SH", "159915.SZ"], "market": ["E", "E"]})
+
+    class Client:
+        pro = wrap_pro(FundOnlyPro(), ResponseCache(tmp_path, mode="readwrite"), "chinadata")
+
+    assert not hasattr(Client.pro, "etf_basic")
+    assert _fetch_etf_master(Client())["ts_code"].tolist() == ["510300.SH", "159915.SZ"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.data_fetcher.daily import apply_adjustments
+from src.data_store import (
+    AdjFactorStore,
+    DailyStore,
+    append_adjusted_daily,
+    load_adj_factors,
+    load_symbol_daily,
+    save_adj_factors,
+    write_daily,
+)
+
+
+def _bars(dates, closes, factors) -> pd.DataFrame:
+    frame = pd.DataFrame({"trade_date": dates, "close": closes})
+    adj = pd.DataFrame({"trade_date": dates, "adj_factor": factors})
+    return apply_adjustments(frame, adj)
+
+
+def _stores(tmp_path, history: pd.DataFrame):
+    daily_store, adj_store = DailyStore(tmp_path / "daily"), AdjFactorStore(tmp_path / "adj")
+    write_daily("AAA.SH", history, daily_store)
+    save_adj_factors("AAA.SH", history, adj_store)
+    return daily_store, adj_store
+
+
+def test_append_prices_new_rows_on_stored_base_without_touching_history(tmp_path):
+    history = _bars([20240102, 20240103], [10.0, 11.0], [2.0, 2.0])
+    daily_store, adj_store = _stores(tmp_path, history)
+    before = load_symbol_daily("AAA.SH", store=daily_store)
+
+    # a one-day fetch: its own first/latest factor would give back_adj == close
+    result = append_adjusted_daily("AAA.SH", _bars([20240104], [12.0], [2.0]), daily_store, adj_store)
+
+    after = load_symbol_daily("AAA.SH", store=daily_store)
+    assert (result.added, result.rebased) == (1, False)
+    pd.testing.assert_frame_equal(after.iloc[:2], before)
+    assert after["close_front_adj"].tolist() == [10.0, 11.0, 12.0]
+    assert after["close_back_adj"].tolist() == [10.0, 11.0, 12.0]
+
+
+def test_new_factor_rebases_stored_front_adjusted_prices(tmp_path):
+    history = _bars([20240102, 20240103], [10.0, 11.0], [1.0, 1.0])
+    daily_store, adj_store = _stores(tmp_path, history)
+
+    result = append_adjusted_daily("AAA.SH", _bars([20240104], [5.0], [2.0]), daily_store, adj_store)
+
+    after = load_symbol_daily("AAA.SH", store=daily_store)
+    assert (result.added, result.rebased) == (1, True)
+    assert after["close_front_adj"].tolist() == [5.0, 5.5, 5.0]
+    assert after["close_back_adj"].tolist() == [10.0, 11.0, 10.0]
+    assert load_adj_factors("AAA.SH", adj_store)["adj_factor"].tolist() == [1.0, 1.0, 2.0]
+
+
+def test_missing_fund_adj_rows_carry_the_stored_factor(tmp_path):
+    history = _bars([20240102, 20240103], [10.0, 11.0], [2.0, 2.0])
+    daily_store, adj_store = _stores(tmp_path, history)
+    before = load_symbol_daily("AAA.SH", store=daily_store)
+
+    # fund_adj failed for the new day: no factor rows at all
+    incoming = apply_adjustments(pd.DataFrame({"trade_date": [20240104], "close": [12.0]}), pd.DataFrame())
+    result = append_adjusted_daily("AAA.SH", incoming, daily_store, adj_store)
+
+    after = load_symbol_daily("AAA.SH", store=daily_store)
+    assert result.rebased is False
+    pd.testing.assert_frame_equal(after.iloc[:2], before)
+    assert after["close_front_adj"].tolist() == [10.0, 11.0, 12.0]
+    assert load_adj_factors("AAA.SH", adj_store)["adj_factor"].tolist() == [2.0, 2.0]
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from src.data_store import append_atomic
+
+
+def test_append_atomic_publishes_old_bytes_plus_payload(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+
+    append_atomic(path, b"3,4\n")
+
+    assert path.read_bytes() == b"a,b\n1,2\n3,4\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv"]
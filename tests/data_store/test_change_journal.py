@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from src.data_store import ChangeJournal, SymbolCache, acknowledge_changes, describe_pending
+
+
+def test_journal_tracks_pending_changes_per_consumer(tmp_path):
+    path = tmp_path / "journal.json"
+    journal = ChangeJournal.load(path)
+    journal.record("AAA.SH", 20240105)
+    journal.save()
+    assert journal.pending("indicators") is None  # never ran: everything is dirty
+
+    acknowledge_changes(path, "watchlist", 0)
+    acknowledge_changes(path, "indicators", journal.head)
+    journal = ChangeJournal.load(path)
+    journal.record("BBB.SH", 20240110)
+    journal.record("BBB.SH", 20240103)
+    journal.save()
+
+    assert journal.pending("indicators") == {"BBB.SH": 20240103}
+    assert journal.pending("watchlist") == {"AAA.SH": 20240105, "BBB.SH": 20240103}
+    assert "BBB.SH since 20240103" in describe_pending(journal, ["indicators"])
+
+    # entries every consumer has passed are pruned; the head keeps counting
+    acknowledge_changes(path, "watchlist", journal.head)
+    acknowledge_changes(path, "indicators", journal.head)
+    journal = ChangeJournal.load(path)
+    assert journal.changes == [] and journal.head == 3
+    assert journal.pending("watchlist") == {}
+
+
+def test_symbol_cache_is_keyed_by_fingerprint_and_stamp(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = SymbolCache.load(path, "v1")
+    cache.put("AAA.SH", [10, 1], row={"score": 1.5})
+    cache.put("BBB.SH", [20, 2], row=None)
+    cache.retain(["AAA.SH"])
+    cache.save()
+
+    reloaded = SymbolCache.load(path, "v1")
+    assert reloaded.get("AAA.SH", [10, 1])["row"] == {"score": 1.5}
+    assert reloaded.get("AAA.SH", [11, 1]) is None
+    assert reloaded.get("BBB.SH", [20, 2]) is None
+    assert SymbolCache.load(path, "v2").entries == {}
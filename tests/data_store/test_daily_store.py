@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.data_store import (
+    ChangeJournal,
+    DailyStore,
+    append_daily,
+    export_csv_dir,
+    load_daily,
+    load_symbol_daily,
+    migrate_csv_dir,
+    write_daily,
+)
+
+
+def _sample_frame(ts_code: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ts_code": [ts_code] * 3,
+            "trade_date": [20240103, 20240102, 20240104],
+            "close": [1.2, 1.1, 1.3],
+            "close_front_adj": [1.2, 1.1, 1.3],
+            "amount": [1000.0, 900.0, 1100.0],
+        }
+    )
+
+
+def test_migrate_then_load_daily_filters_dates_and_columns(tmp_path):
+    csv_dir = tmp_path / "daily"
+    csv_dir.mkdir()
+    _sample_frame("AAA.SH").to_csv(csv_dir / "AAA.SH.csv", index=False)
+    _sample_frame("BBB.SZ").to_csv(csv_dir / "BBB.SZ.csv", index=False)
+    store = DailyStore(tmp_path / "store")
+    journal = ChangeJournal(tmp_path / "journal.json", cursors={"indicators": 0})
+
+    migrated, failed = migrate_csv_dir(csv_dir, store, journal=journal)
+
+    assert (migrated, failed) == (2, [])
+    assert journal.pending("indicators") == {"AAA.SH": 0, "BBB.SZ": 0}
+    assert store.symbols() == ["AAA.SH", "BBB.SZ"]
+    frame = load_daily(["AAA.SH", "BBB.SZ"], start="20240103", end=20240104, columns=["close"], store=store)
+    assert list(frame.columns) == ["ts_code", "trade_date", "close"]
+    assert frame["trade_date"].tolist() == [20240103, 20240104, 20240103, 20240104]
+    single = load_symbol_daily("AAA.SH", store=store)
+    assert single["trade_date"].tolist() == [20240102, 20240103, 20240104]
+
+
+def test_export_round_trips_to_csv(tmp_path):
+    csv_dir = tmp_path / "daily"
+    csv_dir.mkdir()
+    _sample_frame("AAA.SH").to_csv(csv_dir / "AAA.SH.csv", index=False)
+    store = DailyStore(tmp_path / "store")
+    migrate_csv_dir(csv_dir, store)
+
+    out_dir = tmp_path / "export"
+    assert export_csv_dir(store, out_dir) == 1
+    exported = pd.read_csv(out_dir / "AAA.SH.csv")
+    assert exported["trade_date"].tolist() == [20240102, 20240103, 20240104]
+    assert exported["close"].tolist() == [1.1, 1.2, 1.3]
+
+
+def test_append_writes_segments_and_compacts(tmp_path):
+    store = DailyStore(tmp_path / "store", compact_segments=3)
+    write_daily("AAA.SH", _sample_frame("AAA.SH"), store)
+
+    added = append_daily("AAA.SH", pd.DataFrame({"trade_date": [20240104, 20240105], "close": [9.9, 1.4]}), store)
+    assert added == 1
+    assert len(store.segments("AAA.SH")) == 1
+    merged = load_symbol_daily("AAA.SH", store=store)
+    assert merged["trade_date"].tolist() == [20240102, 20240103, 20240104, 20240105]
+    assert merged["close"].tolist() == [1.1, 1.2, 9.9, 1.4]
+    assert load_symbol_daily("AAA.SH", start=20240105, columns=["close"], store=store)["close"].tolist() == [1.4]
+
+    append_daily("AAA.SH", pd.DataFrame({"trade_date": [20240108], "close": [1.5]}), store)
+    append_daily("AAA.SH", pd.DataFrame({"trade_date": [20240109], "close": [1.6]}), store)
+    assert store.segments("AAA.SH") == []
+    compacted = load_symbol_daily("AAA.SH", store=store)
+    assert compacted["close"].tolist() == [1.1, 1.2, 9.9, 1.4, 1.5, 1.6]
+    assert store.symbols() == ["AAA.SH"]
+
+    append_daily("AAA.SH", pd.DataFrame({"trade_date": [20240110], "close": [1.7]}), store)
+    write_daily("AAA.SH", _sample_frame("AAA.SH"), store)
+    assert store.segments("AAA.SH") == []
+    assert load_symbol_daily("AAA.SH", store=store)["trade_date"].tolist() == [20240102, 20240103, 20240104]
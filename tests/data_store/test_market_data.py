@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.data_store import DailyStore, MarketDataContext, append_daily, build_market_data_context, write_daily
+
+
+def _context(tmp_path, **kwargs) -> MarketDataContext:
+    return MarketDataContext(
+        daily_store=DailyStore(tmp_path / "store"),
+        indicators_dir=tmp_path / "indicators",
+        universe_path=tmp_path / "universe.csv",
+        regime_path=tmp_path / "regime.csv",
+        **kwargs,
+    )
+
+
+def test_frames_are_read_once_until_invalidated(tmp_path):
+    data = _context(tmp_path)
+    write_daily("AAA.SH", pd.DataFrame({"trade_date": [20240102, 20240103], "close": [1.0, 2.0]}), data.daily_store)
+    pd.DataFrame({"ts_code": ["AAA.SH"]}).to_csv(data.universe_path, index=False)
+
+    first = data.daily("AAA.SH")
+    first["close"] = 0.0  # callers get copies
+    assert data.daily("AAA.SH", columns=["close", "missing"]).columns.tolist() == ["close"]
+    assert data.daily("AAA.SH")["close"].tolist() == [1.0, 2.0]
+    assert data.universe()["ts_code"].tolist() == ["AAA.SH"]
+    assert data.universe()["ts_code"].tolist() == ["AAA.SH"]
+    assert data.indicators("AAA.SH") is None
+    assert data.regime().empty
+    assert dict(data.reads) == {"daily": 1, "universe": 1, "indicators": 1, "regime": 1}
+
+    append_daily("AAA.SH", pd.DataFrame({"trade_date": [20240104], "close": [3.0]}), data.daily_store)
+    assert len(data.daily("AAA.SH")) == 2  # still the cached copy
+    data.invalidate_daily(["AAA.SH"])
+    assert data.daily("AAA.SH")["close"].tolist() == [1.0, 2.0, 3.0]
+    assert data.reads["daily"] == 2
+
+
+def test_symbol_cache_is_bounded(tmp_path):
+    data = _context(tmp_path, max_symbols=2)
+    for symbol in ("AAA.SH", "BBB.SH", "CCC.SH"):
+        write_daily(symbol, pd.DataFrame({"trade_date": [20240102], "close": [1.0]}), data.daily_store)
+        data.daily(symbol)
+    data.daily("CCC.SH")
+    data.daily("AAA.SH")  # evicted as least recently used
+    assert data.reads["daily"] == 4
+
+
+def test_default_context_serves_chained_stages_over_a_large_universe(tmp_path):
+    settings = {
+        "data": {"daily_store_dir": str(tmp_path / "store"), "indicators_dir": str(tmp_path / "indicators")},
+        "active_pool": {"universe_path": str(tmp_path / "universe.csv")},
+        "market_guard": {"output_path": str(tmp_path / "regime.csv")},
+    }
+    data = build_market_data_context(settings)
+    data.indicators_dir.mkdir()
+    symbols = [f"{idx:06d}.SH" for idx in range(600)]  # more than the old fixed cap of 512
+    frame = pd.DataFrame({"trade_date": [20240102], "ma5": [1.0]})
+    for symbol in symbols:
+        frame.to_csv(data.indicators_dir / f"{symbol}.csv", index=False)
+
+    for _stage in ("signals", "watchlist"):
+        assert all(data.indicators(symbol) is not None for symbol in symbols)
+    assert data.reads["indicators"] == len(symbols)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import (
+    DailyStore,
+    append_daily,
+    latest_trade_date,
+    load_symbol_daily,
+    load_symbol_tail,
+    partition_meta,
+    tail_csv,
+    write_daily,
+)
+
+
+def _history(rows: int) -> pd.DataFrame:
+    dates = pd.bdate_range("2020-01-01", periods=rows).strftime("%Y%m%d").astype(int)
+    return pd.DataFrame({"trade_date": dates, "close": np.round(np.linspace(1, 2, rows), 6)})
+
+
+def test_meta_tracks_writes_and_tail_matches_full_read(tmp_path):
+    store = DailyStore(tmp_path / "store", compact_segments=10)
+    history = _history(300)
+    write_daily("AAA.SH", history, store)
+
+    meta = partition_meta("AAA.SH", store)
+    assert (meta.rows, meta.first_trade_date, meta.last_trade_date) == (300, 20200101, history["trade_date"].iloc[-1])
+    assert sum(meta.row_groups) == 300 and len(meta.row_groups) > 1
+
+    append_daily("AAA.SH", pd.DataFrame({"trade_date": [20300101, 20300102], "close": [5.0, 6.0]}), store)
+    append_daily("AAA.SH", pd.DataFrame({"trade_date": [20300102], "close": [7.0]}), store)
+    assert latest_trade_date("AAA.SH", store) == 20300102
+    assert partition_meta("AAA.SH", store).rows == 302
+
+    full = load_symbol_daily("AAA.SH", store=store)
+    for rows in (1, 60, 200, 1000):
+        pd.testing.assert_frame_equal(load_symbol_tail("AAA.SH", rows, store=store), full.tail(rows).reset_index(drop=True))
+    assert load_symbol_tail("AAA.SH", 2, columns=["close"], store=store)["close"].tolist() == [5.0, 7.0]
+
+
+def test_stale_meta_is_rebuilt(tmp_path):
+    store = DailyStore(tmp_path / "store")
+    write_daily("AAA.SH", _history(10), store)
+    _history(20).to_parquet(store.path_for("AAA.SH"), index=False)  # written behind the store's back
+
+    assert partition_meta("AAA.SH", store).rows == 20
+
+
+def test_tail_csv_reads_last_rows(tmp_path):
+    path = tmp_path / "ind.csv"
+    frame = pd.DataFrame({"trade_date": range(20240101, 20240101 + 500), "value": np.arange(500) / 3})
+    frame.to_csv(path, index=False)
+
+    pd.testing.assert_frame_equal(tail_csv(path, rows=3, block_size=64), frame.tail(3).reset_index(drop=True))
+    assert tail_csv(path, rows=0).columns.tolist() == ["trade_date", "value"]
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _random_walk_daily(days: int = 220, seed: int = 21, start: str = "2024-01-02", decimals: int = 6) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 3 * np.exp(np.cumsum(rng.normal(0, 0.012, days)))
+    open_ = close * (1 + rng.normal(0, 0.003, days))
+    return pd.DataFrame(
+        {
+            "trade_date": pd.bdate_range(start, periods=days).strftime("%Y%m%d").astype(int),
+            "open": open_.round(decimals),
+            "high": (np.maximum(open_, close) * 1.004).round(decimals),
+            "low": (np.minimum(open_, close) * 0.996).round(decimals),
+            "close": close.round(decimals),
+            "vol": rng.integers(1_000, 80_000, days).astype(float),
+        }
+    )
+
+
+@pytest.fixture
+def make_daily():
+    """Factory for a synthetic single-ETF OHLCV frame (random walk, business-day dates)."""
+    return _random_walk_daily
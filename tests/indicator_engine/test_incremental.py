@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from src.indicator_engine.calculator import compute_indicators
+from src.indicator_engine.incremental import IndicatorState, compute_with_state, update_indicators
+
+
+def test_incremental_updates_match_full_recompute(make_daily):
+    daily = make_daily()
+    parts, state = [], None
+    result, state = compute_with_state(daily.iloc[:150])
+    parts.append(result)
+    for end in (151, 152, 160, 220):
+        state = IndicatorState.from_json(state.to_json())
+        rows, state = update_indicators(daily.iloc[:end], state)
+        parts.append(rows)
+    incremental = pd.concat(parts, ignore_index=True)
+    full = compute_indicators(daily)
+
+    assert list(incremental.columns) == list(full.columns)
+    assert incremental["trade_date"].tolist() == full["trade_date"].tolist()
+    # window means over a tail vs the whole series can flip a rounding tie in the 6th decimal
+    np.testing.assert_allclose(incremental.to_numpy(float), full.to_numpy(float), rtol=0, atol=1.5e-6)
+
+
+def test_update_requires_matching_history(make_daily):
+    daily = make_daily(120)
+    _, state = compute_with_state(daily.iloc[:100])
+
+    rows, same_state = update_indicators(daily.iloc[:100], state)
+    assert rows.empty and same_state is state
+
+    rebased = daily.copy()
+    rebased[["open", "high", "low", "close"]] *= 0.95
+    assert update_indicators(rebased, state) is None
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from src.indicator_engine import bias, boll, dpo, ma
+from src.indicator_engine.calculator import indicator_columns
+from src.indicator_engine.memo import shared_primitives
+
+
+def _price(days: int = 120) -> pd.Series:
+    rng = np.random.default_rng(5)
+    return pd.Series(3 * np.exp(np.cumsum(rng.normal(0, 0.01, days))))
+
+
+def test_shared_primitives_reuse_without_changing_values():
+    price = _price()
+    standalone = {"ma20": ma(price, 20), "boll": boll(price), "dpo": dpo(price), "bias": bias(price)}
+
+    with shared_primitives() as memo:
+        assert ma(price, 20) is ma(price, 20)
+        shared = {"ma20": ma(price, 20), "boll": boll(price), "dpo": dpo(price), "bias": bias(price)}
+    assert memo.hits > 0
+
+    pd.testing.assert_series_equal(shared["ma20"], standalone["ma20"])
+    for name in ("boll", "dpo", "bias"):
+        pd.testing.assert_frame_equal(shared[name], standalone[name])
+    assert ma(price, 20) is not ma(price, 20)  # memo is gone after the block
+
+
+def test_indicator_columns_memo_is_per_call():
+    price = _price()
+    first = indicator_columns(price, price * 1.01, price * 0.99, price)
+    second = indicator_columns(price, price * 1.01, price * 0.99, price)
+    assert first["ma20"] is not second["ma20"]
+    assert first["ma20"] is first["boll_mid"]
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from src.indicator_engine.calculator import compute_indicators
+from src.indicator_engine.panel import compute_indicators_panel, panel_inputs
+
+
+def test_panel_matches_per_symbol_indicators(make_daily):
+    frames = {
+        "510001.SH": make_daily(200, 1, decimals=3),
+        "510002.SH": make_daily(140, 2, start="2024-03-01", decimals=3),  # listed later
+        "510003.SH": make_daily(200, 3, decimals=3).drop(index=[50, 51, 120]),  # suspended days
+    }
+    frames["510003.SH"].loc[90, "close"] = np.nan
+
+    panel = compute_indicators_panel(**panel_inputs(frames))
+
+    assert list(panel.symbols) == list(frames)
+    for symbol, daily in frames.items():
+        expected = compute_indicators(daily)
+        pd.testing.assert_frame_equal(panel.frame(symbol), expected)
+    assert panel["ma5"].shape == (len(panel.dates), 3)
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from src.indicator_engine.calculator import compute_indicators
+from src.indicator_engine.registry import resolve
+from src.signal_generator.requirements import required_indicator_columns
+from src.signal_generator.strategies.bull import trend_follow
+
+
+def test_selected_columns_match_full_output(make_daily):
+    daily = make_daily(150, 9)
+    columns = required_indicator_columns()
+    selected = compute_indicators(daily, columns=columns)
+    full = compute_indicators(daily)
+    assert list(selected.columns) == ["trade_date"] + columns
+    pd.testing.assert_frame_equal(selected, full[["trade_date"] + columns])
+
+
+def test_resolve_adds_dependencies_and_rejects_unknown():
+    names = [spec.name for spec in resolve(["dpo", "ddd"])]
+    assert names == ["ma10", "ma20", "dpo", "dma"]
+    with pytest.raises(ValueError, match="ema7"):
+        resolve(["ema7"])
+
+
+def test_required_columns_follow_configured_ma_keys():
+    columns = required_indicator_columns({"strategies": {"bull": {"ma_trend_slow": "ma30"}}})
+    assert "ma30" in columns
+    assert trend_follow.ACTIVE_CONFIG.ma_trend_slow == "ma20"  # settings are only read
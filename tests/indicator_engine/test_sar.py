@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicator_engine.volatility.sar import _sar_panel, sar, sar_array, sar_reference
+
+
+def _bars(days: int, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 3 * np.exp(np.cumsum(rng.normal(0, 0.015, days)))
+    high = pd.Series((close * (1 + rng.uniform(0, 0.01, days))).round(3))
+    low = pd.Series((close * (1 - rng.uniform(0, 0.01, days))).round(3))
+    return high, low
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_sar_kernel_matches_reference_loop(seed):
+    high, low = _bars(300, seed)
+    high.iloc[[40, 41, 120]] = np.nan  # gaps follow the same NaN semantics as the loop
+    low.iloc[[40, 200]] = np.nan
+    expected = sar_reference(high, low)
+    pd.testing.assert_series_equal(sar(high, low), expected)
+
+
+@pytest.mark.parametrize("kernel", [sar_array, lambda high, low: _sar_panel(high, low, 0.02, 0.2)])
+def test_sar_panel_matches_each_symbol(kernel):
+    columns = [_bars(250, seed) for seed in range(4)]
+    high = np.column_stack([h.to_numpy() for h, _ in columns])
+    low = np.column_stack([l.to_numpy() for _, l in columns])
+    high[:30, 1] = low[:30, 1] = np.nan  # symbol listed later than the panel start
+    high[:, 3] = low[:, 3] = np.nan
+
+    panel = kernel(high, low)  # narrow panels route per column; the panel kernel is checked directly
+
+    for col in range(3):
+        start = 30 if col == 1 else 0
+        expected = sar_reference(pd.Series(high[start:, col]), pd.Series(low[start:, col])).to_numpy()
+        np.testing.assert_array_equal(panel[start:, col], expected)
+        assert np.isnan(panel[:start, col]).all()
+    assert np.isnan(panel[:, 3]).all()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market import capped_weights, composite_index, normalized_closes
+
+
+def _panel() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"A": [10.0, 11.0, 12.0, 13.0], "B": [np.nan, 2.0, 1.0, 3.0], "C": [0.0, 1.0, 1.0, 1.0]},
+        index=["20240101", "20240102", "20240103", "20240104"],
+    )
+
+
+def test_equal_weight_composite_averages_symbols_present_each_day():
+    normalized = normalized_closes(_panel())
+    assert normalized.columns.tolist() == ["A", "B"]  # C has a zero base
+
+    level = composite_index(normalized)
+
+    assert level.tolist() == pytest.approx([1.0, (1.1 + 1.0) / 2, (1.2 + 0.5) / 2, (1.3 + 1.5) / 2])
+
+
+def test_weighted_composite_renormalises_over_present_symbols():
+    normalized = normalized_closes(_panel())
+    static = composite_index(normalized, pd.Series({"A": 3.0, "B": 1.0}))
+    assert static.tolist() == pytest.approx([1.0, (3 * 1.1 + 1.0) / 4, (3 * 1.2 + 0.5) / 4, (3 * 1.3 + 1.5) / 4])
+
+    amounts = pd.DataFrame({"A": [1.0, 1.0, 0.0, 1.0], "B": [5.0, 1.0, 1.0, np.nan]}, index=normalized.index)
+    daily = composite_index(normalized, amounts)
+    assert daily.tolist() == pytest.approx([1.0, (1.1 + 1.0) / 2, 0.5, 1.3])
+
+
+def test_capped_weights_redistribute_excess():
+    weights = capped_weights(pd.Series({"A": 10.0, "B": 1.0, "C": 1.0, "D": 2.0}), cap=0.4)
+    assert weights.sum() == pytest.approx(1.0)
+    assert weights["A"] == pytest.approx(0.4)
+    assert weights[["B", "C", "D"]].tolist() == pytest.approx([0.15, 0.15, 0.3])
+
+    assert capped_weights(pd.Series({"A": 5.0, "B": 1.0}), cap=0.3).tolist() == [0.5, 0.5]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import DailyStore, write_daily
+from src.pipelines.active_pool import _compute_metrics
+
+
+def test_compute_metrics_uses_last_60_clean_bars_per_symbol(tmp_path):
+    store = DailyStore(tmp_path / "store")
+    dates = pd.bdate_range("2024-01-01", periods=80).strftime("%Y%m%d").astype(int)
+    amount = np.arange(80, dtype=float) * 1e6
+    vol = np.where(np.arange(80) % 10 == 0, 0.0, 100.0)
+    close = np.round(np.linspace(1.0, 2.0, 80), 6)
+    frame = pd.DataFrame(
+        {"trade_date": dates, "amount": amount, "vol": vol, "open": close, "high": close * 1.02, "low": close, "close": close}
+    )
+    frame.loc[79, "amount"] = np.nan  # dropped before the metrics, after taking the tail
+    write_daily("AAA.SH", frame, store)
+    master = pd.DataFrame({"ts_code": ["AAA.SH", "MISSING.SH"], "name": ["a", "m"], "list_date": [20200101, 20200101]})
+
+    metrics = _compute_metrics(master, store)
+
+    window = frame.tail(60).dropna(subset=["amount"])
+    assert metrics["ts_code"].tolist() == ["AAA.SH"]
+    row = metrics.iloc[0]
+    assert row["mean_amount_60"] == window["amount"].mean()
+    assert row["median_amount_60"] == window["amount"].median()
+    assert row["floor_amount_60"] == window["amount"].quantile(0.1)
+    assert row["trade_days_ratio_60"] == (window["vol"] > 0).mean()
+    assert row["recent_close"] == window["close"].iloc[-1]
+    assert row["listed_days"] > 0
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from src.pipelines import auto
+from src.pipelines.stage_graph import Stage, StageManifest, run_stage_graph
+
+
+def test_regime_failure_fails_the_stage_and_blocks_the_watchlist(tmp_path, monkeypatch):
+    def broken(settings, data=None):
+        raise ValueError("no benchmark bars")
+
+    monkeypatch.setattr(auto, "run_market_regime_detection", broken)
+    path = tmp_path / "manifest.json"
+    manifest = StageManifest.load(path)
+    stages = [
+        Stage("regime", lambda plan: auto._run_regime({}, None), inputs=lambda: {"config": "x"}),
+        Stage("watchlist", lambda plan: None, after=("regime",), inputs=lambda: {"config": "x"}),
+    ]
+
+    assert run_stage_graph(stages, manifest) == {"regime": "failed", "watchlist": "blocked"}
+    assert StageManifest.load(path).stages == {}
@@ -2,22 +2,26 @@ from __future__ import annotations
 
 import pandas as pd
 
-from src.pipelines.backfill_daily import run_incremental_daily
+from src.data_store import DailyStore, load_symbol_daily, write_daily
+from src.pipelines.backfill_daily import run_backfill_daily, run_incremental_daily
 
 
 def test_run_incremental_daily_normalizes_trade_dates(tmp_path, monkeypatch):
     """Mixed trade_date dtypes should not crash incremental updates."""
     master_path = tmp_path / "master.csv"
-    daily_dir = tmp_path / "daily"
-    daily_dir.mkdir()
+    store = DailyStore(tmp_path / "store")
     pd.DataFrame({"ts_code": ["AAA.ETF"]}).to_csv(master_path, index=False)
-    # Existing file mixes string/int representations.
-    pd.DataFrame(
-        {
-            "trade_date": ["20250101", 20250102],
-            "close": [1.0, 2.0],
-        }
-    ).to_csv(daily_dir / "AAA.ETF.csv", index=False)
+    # Existing partition written from a frame mixing string/int representations.
+    write_daily(
+        "AAA.ETF",
+        pd.DataFrame(
+            {
+                "trade_date": ["20250101", 20250102],
+                "close": [1.0, 2.0],
+            }
+        ),
+        store,
+    )
 
     new_frame = pd.DataFrame(
         {
@@ -26,23 +30,147 @@ def test_run_incremental_daily_normalizes_trade_dates(tmp_path, monkeypatch):
         }
     )
 
-    def fake_fetch(symbols, start, end):
+    def fake_fetch(symbols, start, end, **kwargs):
         return {symbols[0]: new_frame}
 
     monkeypatch.setattr("src.pipelines.backfill_daily.fetch_daily_bars", fake_fetch)
     monkeypatch.setattr(
         "src.pipelines.indicator_batch.run_indicator_batch",
-        lambda settings, symbols=None: None,
+        lambda settings, symbols=None, **kwargs: None,
     )
 
     settings = {
         "full_pool": {"master_path": str(master_path)},
-        "data": {"daily_dir": str(daily_dir)},
+        "data": {"daily_store_dir": str(store.root), "change_journal_path": str(tmp_path / "journal.json")},
         "history_backfill": {"start_date": "20200101", "end_date": "20251231"},
     }
 
     run_incremental_daily(settings)
 
-    result = pd.read_csv(daily_dir / "AAA.ETF.csv", dtype={"trade_date": str})
-    # trade_date should be uniform strings sorted ascending.
-    assert result["trade_date"].tolist() == ["20250101", "20250102", "20250103", "20250104"]
+    result = load_symbol_daily("AAA.ETF", store=store)
+    # trade_date should be uniform ints sorted ascending.
+    assert result["trade_date"].tolist() == [20250101, 20250102, 20250103, 20250104]
+
+
+def test_trade_date_mode_fetches_market_days_and_falls_back_for_new_symbols(tmp_path, monkeypatch):
+    master_path = tmp_path / "master.csv"
+    store = DailyStore(tmp_path / "store")
+    pd.DataFrame({"ts_code": ["AAA.ETF", "NEW.ETF"]}).to_csv(master_path, index=False)
+    write_daily("AAA.ETF", pd.DataFrame({"trade_date": [20250102], "close": [1.0]}), store)
+
+    calls = {"days": None, "symbols": []}
+
+    def fake_by_date(trade_dates, symbols=None, **kwargs):
+        calls["days"] = list(trade_dates)
+        return {"AAA.ETF": pd.DataFrame({"trade_date": ["20250102", "20250103", "20250106"], "close": [1.0, 2.0, 3.0]})}
+
+    def fake_fetch(symbols, start, end, **kwargs):
+        calls["symbols"].extend(symbols)
+        return {symbols[0]: pd.DataFrame({"trade_date": [20250106], "close": [9.0]})}
+
+    monkeypatch.setattr(
+        "src.pipelines.backfill_daily.fetch_trade_calendar",
+        lambda start, end, **kwargs: ["20250102", "20250103", "20250106"],
+    )
+    monkeypatch.setattr("src.pipelines.backfill_daily.fetch_daily_by_trade_date", fake_by_date)
+    monkeypatch.setattr("src.pipelines.backfill_daily.fetch_daily_bars", fake_fetch)
+    monkeypatch.setattr(
+        "src.pipelines.indicator_batch.run_indicator_batch",
+        lambda settings, symbols=None, **kwargs: None,
+    )
+
+    settings = {
+        "full_pool": {"master_path": str(master_path)},
+        "data": {"daily_store_dir": str(store.root), "change_journal_path": str(tmp_path / "journal.json")},
+        "history_backfill": {"start_date": "20250101", "end_date": "20250106", "incremental_mode": "trade_date"},
+    }
+
+    run_incremental_daily(settings)
+
+    assert calls["days"] == ["20250103", "20250106"]
+    assert calls["symbols"] == ["NEW.ETF"]
+    assert load_symbol_daily("AAA.ETF", store=store)["close"].tolist() == [1.0, 2.0, 3.0]
+    assert load_symbol_daily("NEW.ETF", store=store)["close"].tolist() == [9.0]
+
+
+def test_backfill_resumes_from_manifest_and_fetches_only_gaps(tmp_path, monkeypatch):
+    master_path = tmp_path / "master.csv"
+    store = DailyStore(tmp_path / "store")
+    pd.DataFrame({"ts_code": ["AAA.ETF", "BBB.ETF"]}).to_csv(master_path, index=False)
+    requests = []
+
+    def fake_fetch(symbols, start, end, **kwargs):
+        requests.append((tuple(symbols), start, end))
+        dates = [day for day in (20250102, 20250103, 20250106, 20250107) if int(start) <= day <= int(end)]
+        return {
+            symbol: pd.DataFrame({"trade_date": dates, "close": [float(day % 100) for day in dates]})
+            for symbol in symbols
+        }
+
+    monkeypatch.setattr("src.pipelines.backfill_daily.fetch_daily_bars", fake_fetch)
+    settings = {
+        "full_pool": {"master_path": str(master_path)},
+        "data": {
+            "daily_store_dir": str(store.root),
+            "adj_store_dir": str(tmp_path / "adj"),
+            "change_journal_path": str(tmp_path / "journal.json"),
+        },
+        "history_backfill": {
+            "start_date": "20250101",
+            "end_date": "20250103",
+            "manifest_path": str(tmp_path / "manifest.json"),
+        },
+    }
+
+    run_backfill_daily(settings)
+    run_backfill_daily(settings)
+    assert requests == [(("AAA.ETF", "BBB.ETF"), "20250101", "20250103")]
+
+    settings["history_backfill"]["end_date"] = "20250107"
+    write_daily("BBB.ETF", pd.DataFrame({"trade_date": [20250102], "close": [99.0]}), store)  # damaged file
+    run_backfill_daily(settings)
+
+    assert requests[1:] == [(("AAA.ETF",), "20250104", "20250107"), (("BBB.ETF",), "20250101", "20250107")]
+    for symbol in ("AAA.ETF", "BBB.ETF"):
+        stored = load_symbol_daily(symbol, store=store)
+        assert stored["trade_date"].tolist() == [20250102, 20250103, 20250106, 20250107]
+
+
+def test_failed_gap_fetch_is_not_checkpointed(tmp_path, monkeypatch):
+    master_path = tmp_path / "master.csv"
+    store = DailyStore(tmp_path / "store")
+    pd.DataFrame({"ts_code": ["AAA.ETF"]}).to_csv(master_path, index=False)
+    requests = []
+    failing = {"on": False}
+
+    def fake_fetch(symbols, start, end, **kwargs):
+        requests.append((start, end))
+        if failing["on"]:  # fetch_daily_bars reports API failures as empty frames
+            return {symbol: pd.DataFrame() for symbol in symbols}
+        dates = [day for day in (20250102, 20250103, 20250106) if int(start) <= day <= int(end)]
+        return {symbol: pd.DataFrame({"trade_date": dates, "close": [1.0] * len(dates)}) for symbol in symbols}
+
+    monkeypatch.setattr("src.pipelines.backfill_daily.fetch_daily_bars", fake_fetch)
+    settings = {
+        "full_pool": {"master_path": str(master_path)},
+        "data": {
+            "daily_store_dir": str(store.root),
+            "adj_store_dir": str(tmp_path / "adj"),
+            "change_journal_path": str(tmp_path / "journal.json"),
+        },
+        "history_backfill": {
+            "start_date": "20250101",
+            "end_date": "20250103",
+            "manifest_path": str(tmp_path / "manifest.json"),
+        },
+    }
+    run_backfill_daily(settings)
+
+    settings["history_backfill"]["end_date"] = "20250106"
+    failing["on"] = True
+    run_backfill_daily(settings)
+    failing["on"] = False
+    run_backfill_daily(settings)
+
+    assert requests == [("20250101", "20250103"), ("20250104", "20250106"), ("20250104", "20250106")]
+    assert load_symbol_daily("AAA.ETF", store=store)["trade_date"].tolist() == [20250102, 20250103, 20250106]
@@ -1,4 +1,8 @@
+import pandas as pd
+
+from src.data_store import ChangeJournal, acknowledge_changes
 from src.pipelines import build_full_pool_context
+from src.pipelines.full_pool import _cache_daily_history
 
 
 def test_build_full_pool_context_defaults():
@@ -7,3 +11,21 @@ def test_build_full_pool_context_defaults():
     assert ctx.refresh_interval_days == 60
     assert str(ctx.master_path).endswith("data/master/etf_master.csv")
     assert ctx.chunk_size == 25
+
+
+def test_full_pool_rewrite_marks_symbols_dirty(tmp_path, monkeypatch):
+    journal_path = tmp_path / "journal.json"
+    acknowledge_changes(journal_path, "indicators", 0)
+    settings = {
+        "data": {
+            "daily_store_dir": str(tmp_path / "store"),
+            "adj_store_dir": str(tmp_path / "adj"),
+            "change_journal_path": str(journal_path),
+        }
+    }
+    frame = pd.DataFrame({"trade_date": [20250102, 20250103], "close": [1.0, 1.1], "adj_factor": [1.0, 1.0]})
+    monkeypatch.setattr("src.pipelines.full_pool.fetch_daily_bars", lambda symbols, **kwargs: {"AAA.SH": frame})
+
+    _cache_daily_history(["AAA.SH"], build_full_pool_context(settings), None, "20250101", "20250103")
+
+    assert ChangeJournal.load(journal_path).pending("indicators") == {"AAA.SH": 0}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import DailyStore, append_daily, build_change_journal, load_symbol_daily, write_daily
+from src.indicator_engine.incremental import compute_with_state
+from src.pipelines.indicator_batch import run_indicator_batch
+
+
+def _seed_store(store: DailyStore) -> None:
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2024-01-02", periods=80).strftime("%Y%m%d").astype(int)
+    for symbol in ("AAA.ETF", "BBB.ETF"):
+        close = 1 + np.cumsum(rng.normal(0, 0.01, len(dates)))
+        write_daily(
+            symbol,
+            pd.DataFrame(
+                {
+                    "trade_date": dates,
+                    "open": close,
+                    "high": close * 1.01,
+                    "low": close * 0.99,
+                    "close": close,
+                    "vol": rng.integers(1_000, 5_000, len(dates)).astype(float),
+                    "amount": rng.uniform(1e5, 1e6, len(dates)),
+                }
+            ),
+            store,
+        )
+    # unreadable partition: must be reported without stopping the batch
+    (store.root / "BAD.ETF.parquet").write_bytes(b"not parquet")
+
+
+def test_parallel_batch_matches_serial_and_isolates_failures(tmp_path):
+    store = DailyStore(tmp_path / "store")
+    _seed_store(store)
+    outputs = {}
+    for workers in (1, 2):
+        out_dir = tmp_path / f"indicators_{workers}"
+        settings = {
+            "data": {
+                "daily_store_dir": str(store.root),
+                "indicators_dir": str(out_dir),
+                "change_journal_path": str(tmp_path / "journal.json"),
+            },
+            "active_pool": {"universe_path": str(tmp_path / "missing.csv")},
+        }
+        run_indicator_batch(settings, workers=workers)
+        outputs[workers] = {path.name: path.read_bytes() for path in sorted(out_dir.glob("*.csv"))}
+
+    assert sorted(outputs[1]) == ["AAA.ETF.csv", "BBB.ETF.csv"]
+    assert outputs[1] == outputs[2]
+
+
+def test_incremental_batch_appends_only_new_dates(tmp_path):
+    store = DailyStore(tmp_path / "store")
+    _seed_store(store)
+    full = pd.read_parquet(store.path_for("AAA.ETF"))
+    write_daily("AAA.ETF", full.iloc[:-3], store)
+    settings = {
+        "data": {
+            "daily_store_dir": str(store.root),
+            "indicators_dir": str(tmp_path / "indicators"),
+            "change_journal_path": str(tmp_path / "journal.json"),
+        },
+        "active_pool": {"universe_path": str(tmp_path / "missing.csv")},
+    }
+    run_indicator_batch(settings)
+    write_daily("AAA.ETF", full, store)
+    run_indicator_batch(settings, incremental=True)
+
+    result = pd.read_csv(tmp_path / "indicators" / "AAA.ETF.csv")
+    assert result["trade_date"].tolist() == full["trade_date"].tolist()
+    assert (tmp_path / "indicators" / "_state" / "AAA.ETF.json").exists()
+
+
+def test_changed_only_batch_recomputes_journaled_corrections(tmp_path):
+    store = DailyStore(tmp_path / "store")
+    _seed_store(store)
+    settings = {
+        "data": {
+            "daily_store_dir": str(store.root),
+            "indicators_dir": str(tmp_path / "indicators"),
+            "change_journal_path": str(tmp_path / "journal.json"),
+        },
+        "active_pool": {"universe_path": str(tmp_path / "missing.csv")},
+    }
+    run_indicator_batch(settings, incremental=True)
+    untouched = (tmp_path / "indicators" / "BBB.ETF.csv").stat().st_mtime_ns
+
+    # a corrected bar in the middle of AAA's history: appending from the saved state cannot see it
+    bar = load_symbol_daily("AAA.ETF", store=store).iloc[[40]].copy()
+    bar["close"] *= 1.05
+    append_daily("AAA.ETF", bar, store)
+    journal = build_change_journal(settings)
+    journal.record("AAA.ETF", int(bar["trade_date"].iloc[0]))
+    journal.save()
+    run_indicator_batch(settings, incremental=True, changed_only=True)
+
+    assert (tmp_path / "indicators" / "BBB.ETF.csv").stat().st_mtime_ns == untouched
+    assert build_change_journal(settings).pending("indicators") == {"BAD.ETF": 0}  # failures stay pending
+    expected, _ = compute_with_state(load_symbol_daily("AAA.ETF", store=store))
+    result = pd.read_csv(tmp_path / "indicators" / "AAA.ETF.csv")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, atol=1e-6)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import append_daily, write_daily
+from src.pipelines import market_regime
+from src.pipelines.market_regime import build_market_regime_context, run_market_regime_detection
+
+
+def test_daily_run_extends_regime_from_saved_state(tmp_path, monkeypatch):
+    full_runs = []
+    full = market_regime.regime_with_state
+    monkeypatch.setattr(market_regime, "regime_with_state", lambda *args: full_runs.append(1) or full(*args))
+
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2022-01-03", periods=260).strftime("%Y%m%d").astype(int)
+    settings = {
+        "data": {"daily_store_dir": str(tmp_path / "store")},
+        "market_guard": {
+            "benchmarks": ["AAA.SH", "BBB.SH"],
+            "ma_fast": 10,
+            "ma_slow": 30,
+            "output_path": str(tmp_path / "regime.csv"),
+            "segments_path": str(tmp_path / "segments.csv"),
+            "state_path": str(tmp_path / "state.json"),
+        },
+    }
+    ctx = build_market_regime_context(settings)
+    bars = {}
+    for symbol in ("AAA.SH", "BBB.SH"):
+        close = np.round(10 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates)))), 6)
+        bars[symbol] = pd.DataFrame({"trade_date": dates, "close": close, "high": close, "low": close})
+        write_daily(symbol, bars[symbol].iloc[:200], ctx.daily_store)
+    run_market_regime_detection(settings)
+
+    append_daily("AAA.SH", bars["AAA.SH"].iloc[200:], ctx.daily_store)
+    append_daily("BBB.SH", bars["BBB.SH"].iloc[200:230], ctx.daily_store)  # lags behind AAA
+    run_market_regime_detection(settings)
+    append_daily("BBB.SH", bars["BBB.SH"].iloc[230:], ctx.daily_store)
+    run_market_regime_detection(settings)
+    assert len(full_runs) == 1
+    extended = (tmp_path / "regime.csv").read_text()
+    extended_segments = (tmp_path / "segments.csv").read_text()
+
+    with (tmp_path / "regime.csv").open("a") as handle:
+        handle.write("2023")  # torn append: the size no longer matches the saved state
+    run_market_regime_detection(settings)
+    assert len(full_runs) == 2
+    assert (tmp_path / "regime.csv").read_text() == extended
+
+    (tmp_path / "state.json").unlink()
+    run_market_regime_detection(settings)
+    assert (tmp_path / "regime.csv").read_text() == extended
+    assert (tmp_path / "segments.csv").read_text() == extended_segments
+    assert extended.rstrip().endswith(",".join([str(dates[-1]), pd.read_csv(tmp_path / "regime.csv")["regime"].iloc[-1]]))
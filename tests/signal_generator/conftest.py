@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _synthetic_daily(days: int = 260, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=days).strftime("%Y%m%d").astype(int)
+    close = 2 * np.exp(np.cumsum(rng.normal(0.001, 0.015, days)))
+    open_ = close * (1 + rng.normal(0, 0.004, days))
+    high = np.maximum(close, open_) * (1 + np.abs(rng.normal(0, 0.006, days)))
+    low = np.minimum(close, open_) * (1 - np.abs(rng.normal(0, 0.006, days)))
+    vol = rng.integers(1_000, 50_000, days).astype(float)
+    pre_close = np.r_[close[0], close[:-1]]
+    return pd.DataFrame(
+        {
+            "ts_code": "510000.SH",
+            "trade_date": dates,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "pre_close": pre_close,
+            "pct_chg": (close / pre_close - 1) * 100,
+            "vol": vol,
+            "amount": vol * close * rng.uniform(5, 50, days),
+        }
+    )
+
+
+@pytest.fixture
+def make_daily():
+    """Factory for a synthetic single-ETF daily frame (random walk with volume)."""
+    return _synthetic_daily
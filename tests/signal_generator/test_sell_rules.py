@@ -0,0 +1,34 @@
+from src.backtester.watchlist.utils import normalize_date
+from src.indicator_engine.calculator import compute_indicators
+from src.signal_generator.sell_rules import (
+    evaluate_sell_path,
+    evaluate_sell_signal,
+    prepare_daily_features,
+    prepare_sell_path,
+)
+
+
+def test_sell_path_matches_scalar_evaluation(make_daily):
+    daily = make_daily()
+    indicators = compute_indicators(daily)
+    indicators["trade_date"] = indicators["trade_date"].map(normalize_date)
+    # drop a few daily rows so some indicator dates have no matching bar
+    features = prepare_daily_features(daily.drop(index=[30, 95, 180]).reset_index(drop=True))
+    daily_map = {row["trade_date"]: row for _, row in features.iterrows()}
+    path = prepare_sell_path(indicators, features)
+
+    triggered = 0
+    for regime in ("bull", "sideways", "bear", "unknown"):
+        evaluation = evaluate_sell_path(path, regime)
+        for idx in range(1, len(indicators)):
+            daily_row = daily_map.get(indicators["trade_date"].iloc[idx])
+            assert path["has_daily"].iloc[idx] == (daily_row is not None)
+            if daily_row is None:
+                continue
+            prev_row = indicators.iloc[idx - 1]
+            expected = evaluate_sell_signal(
+                indicators, idx, daily_row, prev_row, daily_map.get(prev_row["trade_date"]), regime
+            )
+            assert evaluation.result(idx) == expected
+            triggered += expected.triggered
+    assert triggered > 0
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from src.indicator_engine.calculator import compute_indicators
+from src.signal_generator import strategy_router
+
+
+def test_normalize_dates_matches_scalar_helper():
+    values = pd.Series([20240102, 20240103.0, np.nan])
+    assert strategy_router._normalize_dates(values).tolist() == ["20240102", "20240103", ""]
+    mixed = pd.Series(["20240104", None, 20240105])
+    assert strategy_router._normalize_dates(mixed).tolist() == [
+        strategy_router._normalize_date(value) for value in mixed
+    ]
+
+
+def test_regime_map_routes_each_date_to_its_strategy(make_daily):
+    daily = make_daily(days=300, seed=11)
+    indicators = compute_indicators(daily)
+    names = list(strategy_router._STRATEGY_MAP)
+    regime_map = {str(date): names[(idx // 20) % len(names)] for idx, date in enumerate(daily["trade_date"])}
+
+    expected = []
+    for name, strategy in strategy_router._STRATEGY_MAP.items():
+        hist = strategy.generate_historical_signals("510000.SH", indicators, daily)
+        if hist.empty:
+            continue
+        hist = hist[hist["trade_date"].map(lambda value: regime_map[str(int(value))]) == name].copy()
+        hist["regime"] = name
+        expected.append(hist)
+    expected_df = pd.concat(expected, ignore_index=True)
+
+    actual = strategy_router.generate_historical_signals("510000.SH", indicators, daily, regime_map=regime_map)
+    assert not actual.empty
+    assert set(actual["regime"]) <= set(names)
+    pdt.assert_frame_equal(actual, expected_df)
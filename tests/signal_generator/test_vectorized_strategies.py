@@ -0,0 +1,45 @@
+from dataclasses import replace
+
+import pandas as pd
+import pandas.testing as pdt
+
+from src.indicator_engine.calculator import compute_indicators
+from src.signal_generator.strategies.bear import oversold_rebound
+from src.signal_generator.strategies.bull import trend_follow
+from src.signal_generator.strategies.sideways import range_trade
+
+
+def _assert_matches_scalar(daily: pd.DataFrame, strategy, configs) -> None:
+    indicators = compute_indicators(daily)
+    # drop a few daily rows so some indicator dates have no matching bar
+    daily = daily.drop(index=[30, 95, 180]).reset_index(drop=True)
+    matched = 0
+    for config in configs:
+        expected = strategy.generate_historical_signals_scalar("510000.SH", indicators, daily, config)
+        actual = strategy.generate_historical_signals("510000.SH", indicators, daily, config)
+        pdt.assert_frame_equal(actual, expected)
+        matched += len(expected)
+    assert matched > 0
+
+
+def test_trend_follow_vectorized_matches_scalar_loop(make_daily):
+    base = trend_follow.DEFAULT_CONFIG
+    _assert_matches_scalar(
+        make_daily(),
+        trend_follow,
+        [
+            base,
+            replace(base, min_turnover=0, volume_ratio_min=0.8, rsi_max=90),
+            replace(base, min_turnover=0, volume_ratio_min=0.5, rsi_max=100, allow_retest=False),
+        ],
+    )
+
+
+def test_range_trade_vectorized_matches_scalar_loop(make_daily):
+    base = range_trade.DEFAULT_CONFIG
+    _assert_matches_scalar(make_daily(), range_trade, [base, replace(base, flat_threshold=0.03, max_distance_ma20=0.05)])
+
+
+def test_oversold_rebound_vectorized_matches_scalar_loop(make_daily):
+    base = oversold_rebound.DEFAULT_CONFIG
+    _assert_matches_scalar(make_daily(), oversold_rebound, [base, replace(base, min_rebound_pct=0.0, volume_multiplier=0.5)])